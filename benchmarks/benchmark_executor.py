@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+
+Benchmark that measures how the per-concept parallel stages (Feature
+Generators candidates and their validation) scale with the backend and the
+number of workers of the Executor. The input file is truncated to its first
+N lines, as in benchmark_pipeline.py.
+
+Usage:
+    python benchmarks/benchmark_executor.py [input_file] [size] [workers ...]
+"""
+
+import os
+import sys
+import tempfile
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from triadic_miner.Executor import Executor  # noqa: E402
+from triadic_miner.TriadicConcept import TriadicConcept  # noqa: E402
+from benchmark_pipeline import truncate_input_file  # noqa: E402
+
+DEFAULT_INPUT = "input/groceries_dataset_3898objs_167att_12cond.data.out"
+DEFAULT_SIZE = 500
+DEFAULT_WORKERS = [1, 2, 4, 8]
+CHUNK_SIZE = 8
+
+
+def run_stages(file_path, executor):
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(file_path)
+    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+
+    start = default_timer()
+    triadic_concepts = TriadicConcept.compute_f_generators_candidates(
+        triadic_concepts, links, False, executor
+    )
+    f_generators_time = default_timer() - start
+
+    formal_context = TriadicConcept.compute_formal_context(triadic_concepts)
+
+    start = default_timer()
+    TriadicConcept.compute_feature_generator_validation(
+        triadic_concepts, formal_context, executor
+    )
+    validation_time = default_timer() - start
+
+    return f_generators_time, validation_time
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INPUT
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SIZE
+    workers = [int(x) for x in sys.argv[3:]] or DEFAULT_WORKERS
+
+    executors = [Executor("serial")]
+    for backend in ["threads", "processes"]:
+        executors += [Executor(backend, x, CHUNK_SIZE) for x in workers]
+
+    print("CPUs:", os.cpu_count())
+    print("\t".join(["backend", "workers", "f-generators", "validation"]))
+    with tempfile.TemporaryDirectory() as output_dir:
+        truncated_file_path = truncate_input_file(file_path, size, output_dir)
+        for executor in executors:
+            times = run_stages(truncated_file_path, executor)
+            number_workers = 1 if executor.backend == "serial" else executor.workers
+            values = [executor.backend, str(number_workers)]
+            values += ["{:.4f}".format(x) for x in times]
+            print("\t".join(values))
+
+
+if __name__ == "__main__":
+    main()
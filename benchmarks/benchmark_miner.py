@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+
+Benchmark that mines the Triadic Concepts of a raw '.data' file with the
+native miner and checks them against the concepts computed by Data Peeler
+(the '.data.out' file shipped next to it).
+
+Usage:
+    python benchmarks/benchmark_miner.py [input_file]
+"""
+
+import os
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from triadic_miner.ConceptMiner import ConceptMiner  # noqa: E402
+from triadic_miner.TriadicConcept import TriadicConcept  # noqa: E402
+
+DEFAULT_INPUT = "input/groceries_dataset_3898objs_167att_12cond.data"
+
+
+def get_triples(triadic_concepts):
+    triples = set()
+    for concept in triadic_concepts:
+        for intent, modus in zip(concept.intent, concept.modus):
+            triples.add(
+                (frozenset(concept.extent), frozenset(intent), frozenset(modus))
+            )
+    return triples
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INPUT
+
+    start = default_timer()
+    mined_triadic_concepts = ConceptMiner.get_triadic_concepts_from_data_file(file_path)
+    mining_time = default_timer() - start
+
+    start = default_timer()
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        f"{file_path}.out"
+    )
+    reading_time = default_timer() - start
+
+    assert get_triples(mined_triadic_concepts) == get_triples(triadic_concepts)
+
+    print("Number of Triadic Concepts:", len(mined_triadic_concepts))
+    print("Mining '.data': {:.4f} seconds".format(mining_time))
+    print("Reading '.data.out': {:.4f} seconds".format(reading_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+
+Benchmark that shows how each stage of the pipeline scales with the number
+of Triadic Concepts. The input file is truncated to its first N lines for
+each size, and the time of every stage is printed as a table.
+
+Usage:
+    python benchmarks/benchmark_pipeline.py [input_file] [size ...]
+"""
+
+import os
+import sys
+import tempfile
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from triadic_miner.TriadicConcept import TriadicConcept  # noqa: E402
+from triadic_miner.AssociationRules import AssociationRule  # noqa: E402
+
+DEFAULT_INPUT = "input/groceries_dataset_3898objs_167att_12cond.data.out"
+DEFAULT_SIZES = [250, 500, 1000]
+MINIMUM_SUPPORT = 0.0
+MINIMUM_CONFIDENCE = 0.0
+
+
+def truncate_input_file(file_path, size, output_dir):
+    truncated_file_path = os.path.join(output_dir, f"{size}.data.out")
+    with open(file_path, "r") as reader, open(truncated_file_path, "w") as writer:
+        for i, row in enumerate(reader):
+            if i == size:
+                break
+            writer.write(row)
+    return truncated_file_path
+
+
+def run_stages(file_path):
+    times = {}
+
+    def timed(stage, function, *args):
+        start = default_timer()
+        result = function(*args)
+        times[stage] = default_timer() - start
+        return result
+
+    triadic_concepts = timed(
+        "read", TriadicConcept.get_triadic_concepts_from_input_file, file_path
+    )
+    faces, all_extents = timed(
+        "faces", TriadicConcept.create_triadic_concepts_faces, triadic_concepts
+    )
+    links = timed(
+        "T-iPred", TriadicConcept.T_iPred, triadic_concepts, faces, all_extents
+    )
+    triadic_concepts = timed(
+        "f-generators",
+        TriadicConcept.compute_f_generators_candidates,
+        triadic_concepts,
+        links,
+        False,
+    )
+    formal_context = timed(
+        "context", TriadicConcept.compute_formal_context, triadic_concepts
+    )
+    triadic_concepts = timed(
+        "validation",
+        TriadicConcept.compute_feature_generator_validation,
+        triadic_concepts,
+        formal_context,
+    )
+    timed(
+        "rules",
+        AssociationRule.compute_rules,
+        triadic_concepts,
+        MINIMUM_SUPPORT,
+        MINIMUM_CONFIDENCE,
+        links,
+    )
+    triadic_concepts = timed(
+        "ext-generators",
+        TriadicConcept.compute_extensional_generators,
+        triadic_concepts,
+        links,
+    )
+    timed(
+        "separation",
+        TriadicConcept.separation_index_calculation,
+        triadic_concepts,
+    )
+
+    return len(triadic_concepts), len(links), times
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INPUT
+    sizes = [int(x) for x in sys.argv[2:]] or DEFAULT_SIZES
+
+    rows = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            truncated_file_path = truncate_input_file(file_path, size, output_dir)
+            rows.append((size, *run_stages(truncated_file_path)))
+
+    stages = list(rows[0][3].keys())
+    header = ["lines", "concepts", "links"] + stages
+    print("\t".join(header))
+    for size, number_concepts, number_links, times in rows:
+        values = [str(size), str(number_concepts), str(number_links)]
+        values += ["{:.4f}".format(times[stage]) for stage in stages]
+        print("\t".join(values))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+
+Benchmark that compares the one-pass grouping reader of Data Peeler files
+with the previous reader, which deduplicated the extents over a list and
+then scanned all the rows again for each unique extent.
+
+Usage:
+    python benchmarks/benchmark_reader.py [input_file]
+"""
+
+import os
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from triadic_miner.TriadicConcept import TriadicConcept  # noqa: E402
+
+DEFAULT_INPUT = "input/groceries_dataset_3898objs_167att_12cond.data.out"
+EMPTY_SET = set([])
+
+
+def previous_reader(file_path):
+    triadic_concepts = []
+    with open(file_path, "r") as reader:
+        for row in reader:
+            line = row.rstrip("\n").split(" ")
+            if line[0] == "ø":
+                extent = frozenset(EMPTY_SET)
+            else:
+                extent = set(line[0].split(","))
+            triadic_concepts.append(
+                (extent, set(line[1].split(",")), set(line[2].split(",")))
+            )
+
+    unique_triadic_concepts_extents = []
+    for extent, _, _ in triadic_concepts:
+        if extent not in unique_triadic_concepts_extents:
+            unique_triadic_concepts_extents.append(extent)
+
+    unique_triadic_concepts = []
+    for unique_extent in unique_triadic_concepts_extents:
+        list_intent = []
+        list_modus = []
+        for extent, intent, modus in triadic_concepts:
+            if extent == unique_extent:
+                list_intent.append(intent)
+                list_modus.append(modus)
+        unique_triadic_concepts.append((unique_extent, list_intent, list_modus))
+    return sorted(unique_triadic_concepts, key=lambda x: len(x[0]))
+
+
+def main():
+    file_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INPUT
+
+    start = default_timer()
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(file_path)
+    one_pass_time = default_timer() - start
+
+    start = default_timer()
+    previous_triadic_concepts = previous_reader(file_path)
+    previous_time = default_timer() - start
+
+    assert [set(x[0]) for x in previous_triadic_concepts] == [
+        set(x.extent) for x in triadic_concepts
+    ]
+    assert [x[1] for x in previous_triadic_concepts] == [
+        x.intent for x in triadic_concepts
+    ]
+
+    print("Number of Triadic Concepts:", len(triadic_concepts))
+    print("Previous reader: {:.4f} seconds".format(previous_time))
+    print("One-pass reader: {:.4f} seconds".format(one_pass_time))
+    print("Speedup: {:.1f}x".format(previous_time / one_pass_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,40 @@ import json
 import os
 from triadic_miner.Timer import Timer
 from triadic_miner.TriadicConcept import TriadicConcept
+from triadic_miner.ConceptMiner import ConceptMiner
+from triadic_miner.Executor import Executor
+from triadic_miner.DerivationCache import DerivationCache
+from triadic_miner.StageCache import StageCache
 from triadic_miner.AssociationRules import AssociationRule
+from triadic_miner.TopKRules import RANK_METRICS
 from triadic_miner.Report import Report
+from triadic_miner.RuleSink import RuleSink, ColumnarRuleSink, RULE_OUTPUTS
+from triadic_miner.ColumnarStore import ColumnarStore
+from triadic_miner.LatticeStore import LatticeStore
 
 
 def triadic_miner(
     file_path,
     file_name,
+    triadic_concepts_miner,
+    executor,
+    derivation_cache_size,
+    stage_cache_dir,
     minimum_support_rules,
     minimum_confidence_rules,
+    top_k_rules,
+    rank_metric_rules,
+    rule_output,
+    columnar_output,
+    normalized_output,
+    save_lattice_store,
     compute_feature_generators_for_infimum,
     compute_extensional_implications,
     compute_concept_stability,
+    concept_stability_method,
+    stability_samples,
+    stability_seed,
+    stability_target_error,
     compute_separation_index,
     save_hasse_diagram,
     report_file_path,
@@ -35,74 +57,165 @@ def triadic_miner(
     separation_index_file_path,
     hasse_diagram_file_path,
     hasse_diagram_html_file_path,
+    columnar_file_path,
+    lattice_file_path,
 ):
 
-    report = Report(report_file_path, file_name)
+    report = Report(report_file_path, file_name, normalized_output)
     report.check_output_folder()
 
-    Timer.start("Reading Triadic Concepts")
-    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(file_path)
-    print("Number of Triadic Concepts:", len(triadic_concepts))
-    time = Timer.stop()
-    report.add_module_time("Reading Triadic Concepts", time)
-
-    Timer.start("Creating Triadic Concepts Faces")
-    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    # The concepts, links and minimal generators do not depend on the
+    # thresholds of the rules, so they are loaded from the stage cache when
+    # a previous run computed them on the same input
+    stage_cache = StageCache(
+        stage_cache_dir, file_path, {"triadic_concepts_miner": triadic_concepts_miner}
+    )
+    links_key = stage_cache.chain("Running T-iPred")
+    generators_key = stage_cache.chain(
+        "Validating Feature Generators",
+        {
+            "compute_feature_generators_for_infimum": compute_feature_generators_for_infimum
+        },
+    )
+    Timer.start("Loading Stage Cache")
+    generators_stage = stage_cache.load("Validating Feature Generators", generators_key)
+    links_stage = None
+    if generators_stage is None:
+        links_stage = stage_cache.load("Running T-iPred", links_key)
     time = Timer.stop()
-    report.add_module_time("Creating Triadic Concepts Faces", time)
+    if stage_cache.hits:
+        report.add_module_time("Loading Stage Cache", time)
 
-    Timer.start("Running T-iPred")
-    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
-    print("Number of links:", len(links))
-    time = Timer.stop()
-    report.add_module_time("Running T-iPred", time)
+    if generators_stage is not None:
+        triadic_concepts, links = generators_stage
+        print("Number of Triadic Concepts:", len(triadic_concepts))
+        print("Number of links:", len(links))
+    elif links_stage is not None:
+        triadic_concepts, links = links_stage
+        print("Number of Triadic Concepts:", len(triadic_concepts))
+        print("Number of links:", len(links))
+    else:
+        if triadic_concepts_miner == "native":
+            Timer.start("Mining Triadic Concepts")
+            triadic_concepts = ConceptMiner.get_triadic_concepts_from_data_file(
+                file_path
+            )
+            print("Number of Triadic Concepts:", len(triadic_concepts))
+            time = Timer.stop()
+            report.add_module_time("Mining Triadic Concepts", time)
+        else:
+            Timer.start("Reading Triadic Concepts")
+            triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+                file_path
+            )
+            print("Number of Triadic Concepts:", len(triadic_concepts))
+            time = Timer.stop()
+            report.add_module_time("Reading Triadic Concepts", time)
 
-    Timer.start("Computing F-Generators")
-    triadic_concepts = TriadicConcept.compute_f_generators_candidates(
-        triadic_concepts, links, compute_feature_generators_for_infimum
-    )
-    time = Timer.stop()
-    report.add_module_time("Computing F-Generators", time)
+        Timer.start("Creating Triadic Concepts Faces")
+        faces, all_extents = TriadicConcept.create_triadic_concepts_faces(
+            triadic_concepts
+        )
+        time = Timer.stop()
+        report.add_module_time("Creating Triadic Concepts Faces", time)
 
-    Timer.start("Computing Formal Context")
-    formal_context = TriadicConcept.compute_formal_context(triadic_concepts)
-    time = Timer.stop()
-    report.add_module_time("Computing Formal Context", time)
+        Timer.start("Running T-iPred")
+        links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+        print("Number of links:", len(links))
+        time = Timer.stop()
+        report.add_module_time("Running T-iPred", time)
+        stage_cache.save(links_key, triadic_concepts, links)
 
-    Timer.start("Validating Feature Generators")
-    triadic_concepts = TriadicConcept.compute_feature_generator_validation(
-        triadic_concepts, formal_context
-    )
-    time = Timer.stop()
-    report.add_module_time("Validating Feature Generators", time)
+    if generators_stage is None:
+        Timer.start("Computing F-Generators")
+        triadic_concepts = TriadicConcept.compute_f_generators_candidates(
+            triadic_concepts, links, compute_feature_generators_for_infimum, executor
+        )
+        time = Timer.stop()
+        report.add_module_time("Computing F-Generators", time)
 
-    Timer.start("Computing BCAI Implications")
-    BCAI_implications = AssociationRule.compute_BCAI_implications(
-        triadic_concepts, minimum_support_rules
+    # The formal context is not cached, it is built again from the concepts
+    Timer.start("Computing Formal Context")
+    formal_context = DerivationCache(
+        TriadicConcept.compute_formal_context(triadic_concepts),
+        derivation_cache_size,
     )
     time = Timer.stop()
-    report.add_module_time("Computing BCAI Implications", time)
+    report.add_module_time("Computing Formal Context", time)
 
-    Timer.start("Computing BACI Implications")
-    BACI_implications = AssociationRule.compute_BACI_implications(
-        triadic_concepts, minimum_support_rules
-    )
-    time = Timer.stop()
-    report.add_module_time("Computing BACI Implications", time)
+    if generators_stage is None:
+        Timer.start("Validating Feature Generators")
+        triadic_concepts = TriadicConcept.compute_feature_generator_validation(
+            triadic_concepts, formal_context, executor
+        )
+        time = Timer.stop()
+        report.add_module_time("Validating Feature Generators", time)
+        stage_cache.save(generators_key, triadic_concepts, links)
 
-    Timer.start("Computing BCAAR Association Rules")
-    BCAAR_rules = AssociationRule.compute_BCAAR_association_rules(
-        triadic_concepts, minimum_support_rules, minimum_confidence_rules, links
-    )
-    time = Timer.stop()
-    report.add_module_time("Computing BCAAR Association Rules", time)
+    # A list of thresholds in the configs.json turns on the sweep mode: the
+    # rules are mined once and selected for every (support, confidence) pair
+    rules_file_paths = {
+        "BCAI": BCAI_implications_file_path,
+        "BACI": BACI_implications_file_path,
+        "BCAAR": BCAAR_rules_file_path,
+        "BACAR": BACAR_rules_file_path,
+    }
+    sweep = None
+    if isinstance(minimum_support_rules, list) or isinstance(
+        minimum_confidence_rules, list
+    ):
+        supports = minimum_support_rules
+        if not isinstance(supports, list):
+            supports = [supports]
+        confidences = minimum_confidence_rules
+        if not isinstance(confidences, list):
+            confidences = [confidences]
+        minimum_confidence_rules = min(confidences)
 
-    Timer.start("Computing BACAR Association Rules")
-    BACAR_rules = AssociationRule.compute_BACAR_association_rules(
-        triadic_concepts, minimum_support_rules, minimum_confidence_rules, links
-    )
-    time = Timer.stop()
-    report.add_module_time("Computing BACAR Association Rules", time)
+        Timer.start("Computing Association Rules Sweep")
+        sweep = AssociationRule.sweep_rules(
+            triadic_concepts,
+            links,
+            supports,
+            confidences,
+            top_k_rules,
+            rank_metric_rules,
+        )
+        time = Timer.stop()
+        report.add_module_time("Computing Association Rules Sweep", time)
+    else:
+        # The rules are written as they are computed, never kept in memory,
+        # unless they are saved as columns
+        Timer.start("Computing Association Rules")
+        if columnar_output:
+            columnar_store = ColumnarStore(triadic_concepts=triadic_concepts)
+            rule_sinks = {
+                family: ColumnarRuleSink(family, columnar_store)
+                for family in rules_file_paths
+            }
+        else:
+            rule_sinks = {
+                family: RuleSink.create(
+                    rule_output, family, triadic_concepts.symbols, rules_file_path
+                )
+                for family, rules_file_path in rules_file_paths.items()
+            }
+        AssociationRule.stream_rules(
+            triadic_concepts,
+            minimum_support_rules,
+            minimum_confidence_rules,
+            links,
+            rule_sinks,
+            top_k_rules,
+            rank_metric_rules,
+        )
+        for rule_sink in rule_sinks.values():
+            rule_sink.close()
+        report.add_rule_counts(
+            {family: rule_sink.count for family, rule_sink in rule_sinks.items()}
+        )
+        time = Timer.stop()
+        report.add_module_time("Computing Association Rules", time)
 
     if compute_extensional_implications:
         Timer.start("Computing Extensional Generators")
@@ -122,7 +235,13 @@ def triadic_miner(
     if compute_concept_stability:
         Timer.start("Computing Concept Stability")
         triadic_concepts = TriadicConcept.compute_concept_stability(
-            triadic_concepts, formal_context
+            triadic_concepts,
+            formal_context,
+            executor,
+            concept_stability_method,
+            stability_samples,
+            stability_seed,
+            stability_target_error,
         )
         time = Timer.stop()
         report.add_module_time("Computing Concept Stability", time)
@@ -144,25 +263,71 @@ def triadic_miner(
         time = Timer.stop()
         report.add_module_time("Creating the Hasse Diagram", time)
 
+    # The worker processes have their own copies of the cache, whose
+    # counters are not sent back, so they are only reported for the other
+    # backends
+    if executor.backend == "processes":
+        report.add_cache_statistics("Derivation cache", None)
+    else:
+        report.add_cache_statistics("Derivation cache", formal_context.get_statistics())
+    report.add_stage_cache_statistics(stage_cache.get_statistics())
+    report.add_links_statistics(links.get_statistics())
     report.save_report()
-    report.save_triadic_concepts(triadic_concepts, triadic_concepts_file_path)
-    report.save_links(links, links_concepts_file_path)
-    report.save_feature_generators(triadic_concepts, feature_generators_file_path)
-    report.save_BCAI_implications(BCAI_implications, BCAI_implications_file_path)
-    report.save_BACI_implications(BACI_implications, BACI_implications_file_path)
-    report.save_BCAAR_rules(BCAAR_rules, BCAAR_rules_file_path)
-    report.save_BACAR_rules(BACAR_rules, BACAR_rules_file_path)
-    if compute_concept_stability:
-        report.save_concept_stability(triadic_concepts, concept_stability_file_path)
-    if compute_separation_index:
-        report.save_separation_index(triadic_concepts, separation_index_file_path)
-    if compute_extensional_implications:
-        report.save_extensional_generators(
-            triadic_concepts, extensional_generators_file_path
-        )
-        report.save_extensional_implications(
-            extensional_implications, extensional_implications_file_path
+    symbols = triadic_concepts.symbols
+    if columnar_output:
+        # The concepts, links, generators, scores and rules are saved as
+        # columns of IDs in a single .npz file instead of the text files
+        if sweep is not None:
+            columnar_store = ColumnarStore(triadic_concepts=triadic_concepts)
+        columnar_store.add_triadic_concepts(triadic_concepts)
+        columnar_store.add_links(links)
+        if compute_extensional_implications:
+            columnar_store.add_rules("extensional", extensional_implications)
+        columnar_store.save(columnar_file_path)
+    else:
+        report.save_triadic_concepts(triadic_concepts, triadic_concepts_file_path)
+        report.save_links(links, links_concepts_file_path)
+        report.save_feature_generators(triadic_concepts, feature_generators_file_path)
+        if compute_concept_stability:
+            report.save_concept_stability(triadic_concepts, concept_stability_file_path)
+        if compute_separation_index:
+            report.save_separation_index(triadic_concepts, separation_index_file_path)
+        if compute_extensional_implications:
+            report.save_extensional_generators(
+                triadic_concepts, extensional_generators_file_path
+            )
+            report.save_extensional_implications(
+                extensional_implications, symbols, extensional_implications_file_path
+            )
+    if save_lattice_store:
+        LatticeStore.save(lattice_file_path, triadic_concepts, links)
+    if sweep is not None:
+        output_dir = os.path.dirname(report_file_path)
+        report.save_sweep_summary(
+            sweep, os.path.join(output_dir, f"{file_name}.sweep_summary")
         )
+        for (support, confidence), rules in sweep.items():
+            point_dir = os.path.join(
+                output_dir, "sweep", f"support_{support}_confidence_{confidence}"
+            )
+            os.makedirs(point_dir, exist_ok=True)
+            if columnar_output:
+                ColumnarStore.save_rules(
+                    os.path.join(point_dir, os.path.basename(columnar_file_path)),
+                    triadic_concepts,
+                    rules,
+                )
+                continue
+            for family, rules_file_path in rules_file_paths.items():
+                rule_sink = RuleSink.create(
+                    rule_output,
+                    family,
+                    symbols,
+                    os.path.join(point_dir, os.path.basename(rules_file_path)),
+                )
+                for rule in rules[family]:
+                    rule_sink.add(rule)
+                rule_sink.close()
 
 
 def main():
@@ -170,9 +335,33 @@ def main():
     with open("configs.json") as json_file:
         data = json.load(json_file)
 
+    triadic_concepts_miner = data["triadic_concepts_miner"]
+    if triadic_concepts_miner not in ("data_peeler", "native"):
+        raise ValueError(
+            f"Unknown triadic_concepts_miner '{triadic_concepts_miner}', "
+            "expected 'data_peeler' or 'native'"
+        )
+    rank_metric_rules = data["rank_metric_rules"]
+    if rank_metric_rules not in RANK_METRICS:
+        raise ValueError(
+            f"Unknown rank_metric_rules '{rank_metric_rules}', "
+            "expected 'support', 'confidence' or 'lift'"
+        )
+    if data["rule_output"] not in RULE_OUTPUTS:
+        raise ValueError(
+            f"Unknown rule_output '{data['rule_output']}', "
+            "expected 'text', 'jsonl' or 'count'"
+        )
+    executor = Executor(
+        data["parallel_backend"], data["parallel_workers"], data["parallel_chunk_size"]
+    )
+
     for input_file_path in data["input_files"]:
         _, file_name = os.path.split(input_file_path)
-        file_name = file_name.split(".data.out")[0]
+        if triadic_concepts_miner == "native":
+            file_name = file_name.split(".data")[0]
+        else:
+            file_name = file_name.split(".data.out")[0]
         output_dir = os.path.join(data["output_dir"], file_name)
         os.makedirs(output_dir, exist_ok=True)
         print(f"Running Triadic Miner on {input_file_path} file...\n")
@@ -182,6 +371,10 @@ def main():
             "compute_feature_generators_for_infimum"
         ]
         compute_concept_stability = data["compute_concept_stability"]
+        concept_stability_method = data["concept_stability_method"]
+        stability_samples = data["stability_samples"]
+        stability_seed = data["stability_seed"]
+        stability_target_error = data["stability_target_error"]
         compute_separation_index = data["compute_separation_index"]
         save_hasse_diagram = data["save_hasse_diagram"]
         compute_extensional_implications = data["compute_extensional_implications"]
@@ -219,15 +412,31 @@ def main():
         extensional_implications_file_path = os.path.join(
             output_dir, f"{file_name}.ext_implications"
         )
+        columnar_file_path = os.path.join(output_dir, f"{file_name}.npz")
+        lattice_file_path = os.path.join(output_dir, f"{file_name}.lattice")
 
         triadic_miner(
             input_file_path,
             file_name,
+            triadic_concepts_miner,
+            executor,
+            data["derivation_cache_size"],
+            data["stage_cache_dir"],
             minimum_support_rules,
             minimum_confidence_rules,
+            data["top_k_rules"],
+            rank_metric_rules,
+            data["rule_output"],
+            data["columnar_output"],
+            data["normalized_output"],
+            data["save_lattice_store"],
             compute_feature_generators_for_infimum,
             compute_extensional_implications,
             compute_concept_stability,
+            concept_stability_method,
+            stability_samples,
+            stability_seed,
+            stability_target_error,
             compute_separation_index,
             save_hasse_diagram,
             report_file_path,
@@ -244,6 +453,8 @@ def main():
             separation_index_file_path,
             hasse_diagram_file_path,
             hasse_diagram_html_file_path,
+            columnar_file_path,
+            lattice_file_path,
         )
 
 
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+def run_pipeline(executor=None):
+    """Runs the pipeline on the example input up to the validation of the
+    Feature Generators.
+
+    Args:
+        executor (Executor): backend of the parallel stages, serial when None
+
+    Returns:
+        tuple: the triadic_concepts, the links and the formal context
+    """
+
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+    triadic_concepts = TriadicConcept.compute_f_generators_candidates(
+        triadic_concepts, links, False, executor
+    )
+    formal_context = TriadicConcept.compute_formal_context(triadic_concepts)
+    triadic_concepts = TriadicConcept.compute_feature_generator_validation(
+        triadic_concepts, formal_context, executor
+    )
+    return triadic_concepts, links, formal_context
+
+
+# The pipeline fixtures are shared by the whole session, so the tests that
+# use them must not modify the concepts or the links
+@pytest.fixture(scope="session")
+def fixture_pipeline() -> tuple:
+    return run_pipeline()
+
+
+@pytest.fixture(scope="session")
+def fixture_pipeline_separation_index() -> tuple:
+    triadic_concepts, links, formal_context = run_pipeline()
+    triadic_concepts = TriadicConcept.separation_index_calculation(triadic_concepts)
+    return triadic_concepts, links, formal_context
@@ -3,6 +3,7 @@
 @author: pedroruas
 """
 
+import random
 import pytest
 from triadic_miner.AssociationRules import AssociationRule
 from triadic_miner.TriadicConcept import TriadicConcept
@@ -115,3 +116,94 @@ def test_BACAR_association_rules(
     fixture_BACAR_association_rules: AssociationRule,
 ) -> None:
     assert len(fixture_BACAR_association_rules) == 8
+
+
+def test_association_rules_are_canonical(
+    fixture_BCAAR_association_rules: AssociationRule,
+) -> None:
+    rules = fixture_BCAAR_association_rules
+    assert len(set(rules)) == len(rules)
+    assert rules == sorted(rules)
+    for rule in rules:
+        assert rule.antecedent == tuple(sorted(rule.antecedent))
+        assert rule.consequent == tuple(sorted(rule.consequent))
+        assert rule.condition == tuple(sorted(rule.condition))
+
+
+def test_maximal_rules_matches_pairwise() -> None:
+    generator = random.Random(0)
+    for _ in range(200):
+        rules = set()
+        for _ in range(generator.randint(0, 40)):
+            antecedent = generator.sample(range(6), generator.randint(1, 3))
+            consequent = generator.sample(range(6), generator.randint(1, 3))
+            rules.add(
+                AssociationRule(
+                    antecedent=tuple(sorted(antecedent)),
+                    consequent=tuple(sorted(consequent)),
+                )
+            )
+
+        rules_to_remove = set()
+        for rule1 in rules:
+            for rule2 in rules:
+                if rule1 != rule2:
+                    if set(rule2.antecedent).issubset(rule1.antecedent) and set(
+                        rule2.consequent
+                    ).issubset(rule1.consequent):
+                        rules_to_remove.add(rule2)
+
+        assert sorted(AssociationRule.get_maximal_rules(rules)) == sorted(
+            rules - rules_to_remove
+        )
+
+
+def test_compute_rules(fixture_pipeline) -> None:
+    triadic_concepts, links, _ = fixture_pipeline
+    rules = AssociationRule.compute_rules(triadic_concepts, 0.1, 0.1, links)
+    assert {family: len(rules[family]) for family in rules} == {
+        "BCAI": 18,
+        "BACI": 16,
+        "BCAAR": 16,
+        "BACAR": 8,
+    }
+    assert rules["BACI"] == AssociationRule.compute_BACI_implications(
+        triadic_concepts, 0.1
+    )
+
+
+def test_sweep_rules(fixture_pipeline) -> None:
+    triadic_concepts, links, _ = fixture_pipeline
+    supports = [0.0, 0.1, 0.3, 0.5]
+    confidences = [0.1, 0.5, 0.9]
+    sweep = AssociationRule.sweep_rules(triadic_concepts, links, supports, confidences)
+    assert list(sweep) == [
+        (support, confidence) for support in supports for confidence in confidences
+    ]
+    for (support, confidence), rules in sweep.items():
+        assert rules == AssociationRule.compute_rules(
+            triadic_concepts, support, confidence, links
+        )
+
+
+def test_compute_top_k_rules(fixture_pipeline) -> None:
+    triadic_concepts, links, _ = fixture_pipeline
+    rules = AssociationRule.compute_rules(triadic_concepts, 0.0, 0.0, links)
+    for rank_metric in ("support", "confidence", "lift"):
+        for top_k in (1, 5, 1000):
+            top_rules = AssociationRule.compute_rules(
+                triadic_concepts,
+                0.0,
+                0.0,
+                links,
+                top_k=top_k,
+                rank_metric=rank_metric,
+            )
+            assert top_rules["BCAI"] == rules["BCAI"]
+            for family in ("BCAAR", "BACAR"):
+                expected = sorted(
+                    rules[family],
+                    key=lambda rule: (getattr(rule, rank_metric), rule),
+                    reverse=True,
+                )[:top_k]
+                assert top_rules[family] == sorted(expected)
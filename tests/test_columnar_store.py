@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.AssociationRules import AssociationRule, RULE_FAMILIES
+from triadic_miner.ColumnarStore import ColumnarStore
+
+
+def test_columnar_store(fixture_pipeline_separation_index, tmp_path) -> None:
+    triadic_concepts, links, _ = fixture_pipeline_separation_index
+    rules = AssociationRule.compute_rules(triadic_concepts, 0.1, 0.1, links)
+
+    columnar_store = ColumnarStore(triadic_concepts=triadic_concepts)
+    for family in RULE_FAMILIES:
+        columnar_store.add_rules(family, rules[family])
+    columnar_store.add_triadic_concepts(triadic_concepts)
+    columnar_store.add_links(links)
+    columnar_store.save(str(tmp_path / "example_PNKRS.npz"))
+
+    loaded_store = ColumnarStore.load(str(tmp_path / "example_PNKRS.npz"))
+    for family in RULE_FAMILIES:
+        assert loaded_store.get_rules(family) == rules[family]
+    assert [
+        (
+            set(
+                loaded_store.decode(
+                    loaded_store.get_row("concept", "extent", target), "objects"
+                )
+            ),
+            set(
+                loaded_store.decode(
+                    loaded_store.get_row("concept", "extent", source), "objects"
+                )
+            ),
+        )
+        for target, source in loaded_store.get_links()
+    ] == [(set(target), set(source)) for target, source in links]
+
+    offsets = loaded_store["separation_concept_offsets"]
+    for concept_id, concept in enumerate(triadic_concepts):
+        assert set(
+            loaded_store.decode(
+                loaded_store.get_row("concept", "extent", concept_id), "objects"
+            )
+        ) == set(concept.extent)
+        rows = range(offsets[concept_id], offsets[concept_id + 1])
+        assert [
+            (
+                set(
+                    loaded_store.decode(
+                        loaded_store.get_row("separation", "intent", row), "attributes"
+                    )
+                ),
+                set(
+                    loaded_store.decode(
+                        loaded_store.get_row("separation", "modus", row), "conditions"
+                    )
+                ),
+                loaded_store["separation_value"][row],
+            )
+            for row in rows
+        ] == [
+            (set(score[0]), set(score[1]), score[2])
+            for score in concept.separation_index
+        ]
+
+
+def test_columnar_store_sweep_point(fixture_pipeline, tmp_path) -> None:
+    triadic_concepts, links, _ = fixture_pipeline
+    sweep = AssociationRule.sweep_rules(triadic_concepts, links, [0.1, 0.3], [0.5])
+
+    for (support, confidence), rules in sweep.items():
+        file_path = str(tmp_path / f"support_{support}_confidence_{confidence}.npz")
+        ColumnarStore.save_rules(file_path, triadic_concepts, rules)
+        loaded_store = ColumnarStore.load(file_path)
+        for family in RULE_FAMILIES:
+            assert loaded_store.get_rules(family) == rules[family]
+        assert set(loaded_store["objects"]) == set(
+            triadic_concepts.symbols.objects.names
+        )
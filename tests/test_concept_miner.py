@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from triadic_miner.ConceptMiner import ConceptMiner
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+def get_triples(triadic_concepts):
+    triples = set()
+    for concept in triadic_concepts:
+        for intent, modus in zip(concept.intent, concept.modus):
+            triples.add(
+                (frozenset(concept.extent), frozenset(intent), frozenset(modus))
+            )
+    return triples
+
+
+@pytest.fixture
+def fixture_mined_concepts() -> TriadicConcept:
+    return ConceptMiner.get_triadic_concepts_from_data_file("input/example_PNKRS.data")
+
+
+def test_mined_concepts_match_data_peeler(fixture_mined_concepts) -> None:
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    assert len(fixture_mined_concepts) == len(triadic_concepts)
+    assert get_triples(fixture_mined_concepts) == get_triples(triadic_concepts)
+
+
+def test_mined_concepts_bitmasks(fixture_mined_concepts) -> None:
+    symbols = fixture_mined_concepts.symbols
+    for concept in fixture_mined_concepts:
+        assert symbols.objects.decode(concept.extent_bits) == set(concept.extent)
+        for intent, intent_bits in zip(concept.intent, concept.intent_bits):
+            assert symbols.attributes.decode(intent_bits) == intent
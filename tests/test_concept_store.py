@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+@pytest.fixture
+def fixture_concept_store() -> TriadicConcept:
+    return TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+
+
+def test_concept_store_lookup_by_extent(fixture_concept_store) -> None:
+    concept = fixture_concept_store.get({"1", "4"})
+    assert concept.extent == {"1", "4"}
+    assert fixture_concept_store.index(frozenset({"4", "1"})) == concept.concept_id
+    assert fixture_concept_store.get(set()).extent == frozenset()
+    assert {"2", "5"} in fixture_concept_store
+    assert {"3"} not in fixture_concept_store
+    with pytest.raises(ValueError):
+        fixture_concept_store.index({"3"})
+
+
+def test_concept_store_ids(fixture_concept_store) -> None:
+    for concept_id, concept in enumerate(fixture_concept_store):
+        assert concept.concept_id == concept_id
+        assert fixture_concept_store.get_by_id(concept_id) is concept
+        assert fixture_concept_store.index(concept.extent) == concept_id
+    assert len(fixture_concept_store.extents()) == len(fixture_concept_store)
+
+
+def test_concept_store_index_range(fixture_concept_store) -> None:
+    concept_id = fixture_concept_store.index({"1", "4"})
+    assert fixture_concept_store.index({"1", "4"}, concept_id) == concept_id
+    assert fixture_concept_store.index({"1", "4"}, 0, concept_id + 1) == concept_id
+    with pytest.raises(ValueError):
+        fixture_concept_store.index({"1", "4"}, concept_id + 1)
+    with pytest.raises(ValueError):
+        fixture_concept_store.index({"1", "4"}, 0, concept_id)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pickle
+from triadic_miner.DerivationCache import DerivationCache
+from triadic_miner.FormalContext import FormalContext
+from triadic_miner.Report import Report
+
+
+def get_formal_context() -> FormalContext:
+    return FormalContext.from_incidences(
+        [("1", "N a"), ("1", "P a"), ("2", "N a"), ("3", "P b")]
+    )
+
+
+def test_derivation_cache_hits() -> None:
+    formal_context = get_formal_context()
+    cache = DerivationCache(formal_context)
+    assert cache.extension(["N a", "P a"]) == formal_context.extension(["N a", "P a"])
+    assert cache.extension(["P a", "N a"]) == ["1"]
+    assert sorted(cache.intension(["1", "2"])) == ["N a"]
+    assert cache.properties == formal_context.properties
+    assert "N a" in cache.property_index
+    statistics = cache.get_statistics()
+    assert (statistics["hits"], statistics["misses"], statistics["size"]) == (1, 2, 2)
+
+
+def test_derivation_cache_eviction() -> None:
+    cache = DerivationCache(get_formal_context(), 2)
+    cache.extension(["N a"])
+    cache.extension(["P a"])
+    cache.extension(["N a"])
+    cache.extension(["P b"])
+    assert list(cache.derivations) == [
+        ("extension", frozenset(["N a"])),
+        ("extension", frozenset(["P b"])),
+    ]
+    assert cache.get_statistics()["evictions"] == 1
+
+    cache = DerivationCache(get_formal_context(), 0)
+    assert cache.extension(["N a"]) == ["1", "2"]
+    assert cache.get_statistics()["size"] == 0
+
+
+def test_derivation_cache_eviction_interleaved() -> None:
+    # The least recently used derivation is evicted, whether it is an
+    # extension or an intension
+    cache = DerivationCache(get_formal_context(), 2)
+    cache.extension(["N a"])
+    cache.extension(["P a"])
+    cache.intension(["1"])
+    cache.intension(["1"])
+    cache.extension(["P a"])
+    cache.intension(["2"])
+    assert list(cache.derivations) == [
+        ("extension", frozenset(["P a"])),
+        ("intension", frozenset(["2"])),
+    ]
+    assert cache.intension(["2"]) == ["N a"]
+    statistics = cache.get_statistics()
+    assert (statistics["hits"], statistics["misses"], statistics["evictions"]) == (
+        3,
+        4,
+        2,
+    )
+
+
+def test_derivation_cache_pickle() -> None:
+    cache = DerivationCache(get_formal_context())
+    cache.extension(["N a"])
+    cache_copy = pickle.loads(pickle.dumps(cache))
+    assert cache_copy.extension(["N a"]) == ["1", "2"]
+    assert cache_copy.hits == 1
+
+
+def test_derivation_cache_statistics_not_available(tmp_path) -> None:
+    report = Report(str(tmp_path / "example.report"), "example")
+    report.add_module_time("Validating Feature Generators", 0.0)
+    report.add_cache_statistics("Derivation cache", None)
+    report.save_report()
+    with open(tmp_path / "example.report", encoding="utf-8") as reader:
+        text = reader.read()
+    assert (
+        "Derivation cache: statistics not available with the processes backend" in text
+    )
+    assert "hits" not in text
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.DyadicContext import DyadicContext
+
+
+def test_dyadic_context_incidences() -> None:
+    context = DyadicContext([{"N", "P"}, {"K"}], [{"a"}, {"a", "b"}])
+    assert context.incidences.shape == (3, 2)
+    assert sorted(context.get_incidences()) == [
+        ["K", "a"],
+        ["K", "b"],
+        ["N", "a"],
+        ["P", "a"],
+    ]
+
+
+def test_dyadic_context_remove_face() -> None:
+    context = DyadicContext([{"N", "P"}, {"K"}], [{"a"}, {"a", "b"}])
+    context.remove_face([{"N", "K"}, {"R"}], [{"a"}, {"a"}])
+    assert sorted(context.get_incidences()) == [["K", "b"], ["P", "a"]]
+    row_incidences = dict(context.get_row_incidences())
+    assert row_incidences == {"N": [], "P": ["a"], "K": ["b"]}
+
+
+def test_dyadic_context_single_intent() -> None:
+    context = DyadicContext([{"N", "P"}], [{"a"}])
+    assert context.incidences.all()
+    context.remove_face([{"P"}], [{"a"}])
+    assert context.get_incidences() == [["N", "a"]]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from tests.conftest import run_pipeline
+from triadic_miner.Executor import Executor
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+def get_feature_generators(triadic_concepts):
+    return {
+        frozenset(concept.extent): (
+            concept.feature_generator_candidates,
+            concept.feature_generator_minimal,
+        )
+        for concept in triadic_concepts
+    }
+
+
+@pytest.mark.parametrize(
+    "executor",
+    [Executor("serial"), Executor("threads", 2, 3), Executor("processes", 2, 3)],
+)
+def test_executor_backends(executor, fixture_pipeline) -> None:
+    triadic_concepts, _, _ = run_pipeline(executor)
+    assert get_feature_generators(triadic_concepts) == get_feature_generators(
+        fixture_pipeline[0]
+    )
+
+
+def test_executor_parameters() -> None:
+    assert Executor("serial").map(pow, [1, 2, 3], 2) == [1, 4, 9]
+    with pytest.raises(ValueError):
+        Executor("gpu")
+    with pytest.raises(ValueError):
+        Executor("threads", 0)
+
+
+def test_concept_store_snapshot() -> None:
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    triadic_concepts[-1].feature_generator = [["N", "R"]]
+    snapshot = triadic_concepts.snapshot(["feature_generator"])
+    assert len(snapshot) == len(triadic_concepts)
+    for concept, concept_copy in zip(triadic_concepts, snapshot):
+        assert concept_copy.concept_id == concept.concept_id
+        assert concept_copy.intent == concept.intent
+        assert concept_copy.feature_generator == concept.feature_generator
+        assert concept_copy.intent_bits == []
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from triadic_miner.FormalContext import FormalContext
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+@pytest.fixture
+def fixture_formal_context() -> FormalContext:
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    return TriadicConcept.compute_formal_context(triadic_concepts)
+
+
+def test_formal_context_derivations(fixture_formal_context) -> None:
+    assert sorted(fixture_formal_context.objects) == ["1", "2", "3", "4", "5"]
+    for _property in fixture_formal_context.properties:
+        extension = fixture_formal_context.extension([_property])
+        for _object in fixture_formal_context.objects:
+            assert (_object in extension) == (
+                _property in fixture_formal_context.intension([_object])
+            )
+    assert set(fixture_formal_context.extension([])) == set(
+        fixture_formal_context.objects
+    )
+    with pytest.raises(KeyError):
+        fixture_formal_context.extension(["ø ø"])
+
+
+def test_formal_context_is_concept() -> None:
+    formal_context = FormalContext.from_incidences([("N", "a"), ("N", "b"), ("P", "a")])
+    assert formal_context.intension(["N", "P"]) == ["a"]
+    assert formal_context.extension(["b"]) == ["N"]
+    assert formal_context.is_concept(["N", "P"], ["a"])
+    assert formal_context.is_concept(["N"], ["a", "b"])
+    assert not formal_context.is_concept(["P"], ["a"])
+    assert not formal_context.is_concept(["K"], ["a"])
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.LatticeStore import LatticeStore
+
+
+def test_lattice_store(fixture_pipeline_separation_index, tmp_path) -> None:
+    triadic_concepts, links, _ = fixture_pipeline_separation_index
+    LatticeStore.save(str(tmp_path / "example.lattice"), triadic_concepts, links)
+
+    lattice = LatticeStore.load(str(tmp_path / "example.lattice"))
+    assert len(lattice) == len(triadic_concepts)
+    for concept in triadic_concepts:
+        view = lattice[concept.concept_id]
+        assert view.extent == set(concept.extent)
+        assert view.extent_size == concept.extent_size
+        assert view.extent_bits == concept.extent_bits
+        assert list(zip(view.intent, view.modus)) == [
+            (set(intent), set(modus))
+            for intent, modus in zip(concept.intent, concept.modus)
+        ]
+        assert view.separation_index == [
+            [set(score[0]), set(score[1]), score[2]]
+            for score in concept.separation_index
+        ]
+        assert lattice.get(concept.extent).concept_id == concept.concept_id
+
+    upper_covers = {concept_id: [] for concept_id in range(len(triadic_concepts))}
+    lower_covers = {concept_id: [] for concept_id in range(len(triadic_concepts))}
+    for target, source in links:
+        upper_covers[triadic_concepts.index(source)].append(
+            triadic_concepts.index(target)
+        )
+        lower_covers[triadic_concepts.index(target)].append(
+            triadic_concepts.index(source)
+        )
+    for concept_id in range(len(triadic_concepts)):
+        assert lattice.get_upper_covers(concept_id).tolist() == upper_covers[concept_id]
+        assert lattice.get_lower_covers(concept_id).tolist() == lower_covers[concept_id]
+
+    LatticeStore.save(
+        str(tmp_path / "bare.lattice"), triadic_concepts, links, sections=()
+    )
+    bare_lattice = LatticeStore.load(str(tmp_path / "bare.lattice"))
+    assert bare_lattice[0].feature_generator_minimal == []
+    assert bare_lattice[0].extent == lattice[0].extent
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.Report import Report
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+def test_links() -> None:
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+    edges = list(links.iter_edges())
+    assert len(links) == len(edges) == 29
+
+    for target, source in edges:
+        target_extent = triadic_concepts[target].extent
+        source_extent = triadic_concepts[source].extent
+        assert set(source_extent) < set(target_extent)
+        assert (set(target_extent), frozenset(source_extent)) in links
+
+    links_dict = TriadicConcept.list_of_links_to_dict(links)
+    for concept in triadic_concepts:
+        successors = [
+            set(triadic_concepts[x].extent)
+            for x in links.get_successors(concept.concept_id)
+        ]
+        predecessors = [
+            source for target, source in edges if target == concept.concept_id
+        ]
+        assert successors == links_dict.get(frozenset(concept.extent), [])
+        assert links.get_predecessors(concept.concept_id).tolist() == predecessors
+    assert links.get_sources() == sorted({source for _, source in edges})
+    assert list(reversed(links)) == list(links)[::-1]
+
+
+def test_links_statistics(tmp_path) -> None:
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+    statistics = links.get_statistics()
+    assert statistics == {
+        "links": 29,
+        "border_max": 5,
+        "border_total": 58,
+        "intersected": 40,
+        "candidates": 35,
+        "discarded": 2,
+    }
+
+    report = Report(str(tmp_path / "example.report"), "example")
+    report.add_module_time("Running T-iPred", 0.0)
+    report.add_links_statistics(statistics)
+    report.save_report()
+    with open(tmp_path / "example.report", encoding="utf-8") as reader:
+        assert (
+            "T-iPred: 29 links, border of at most 5 extents, 40 of 58 border "
+            "extents intersected (68.97%), 35 candidates, 2 discarded "
+            "intersections\n"
+        ) in reader.read()
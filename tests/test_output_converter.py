@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.OutputConverter import OutputConverter
+from triadic_miner.Report import Report
+
+
+def test_convert_normalized_output(fixture_pipeline_separation_index, tmp_path) -> None:
+    triadic_concepts, links, _ = fixture_pipeline_separation_index
+
+    for normalized, folder in ((False, "verbose"), (True, "normalized")):
+        output_dir = tmp_path / folder
+        output_dir.mkdir()
+        report = Report(str(output_dir / "example.report"), "example", normalized)
+        report.save_triadic_concepts(
+            triadic_concepts, str(output_dir / "example.concepts")
+        )
+        report.save_links(links, str(output_dir / "example.links"))
+        report.save_feature_generators(
+            triadic_concepts, str(output_dir / "example.generators")
+        )
+        report.save_separation_index(
+            triadic_concepts, str(output_dir / "example.separation_index")
+        )
+
+    normalized_links = (tmp_path / "normalized" / "example.links").read_text(
+        encoding="utf-8"
+    )
+    assert "0 --> " in normalized_links
+
+    OutputConverter.convert_output(
+        str(tmp_path / "normalized"), "example", str(tmp_path / "converted")
+    )
+    for suffix in ("concepts", "links", "generators", "separation_index"):
+        converted = (tmp_path / "converted" / f"example.{suffix}").read_text(
+            encoding="utf-8"
+        )
+        verbose = (tmp_path / "verbose" / f"example.{suffix}").read_text(
+            encoding="utf-8"
+        )
+        assert converted == verbose
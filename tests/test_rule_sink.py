@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+from triadic_miner.AssociationRules import AssociationRule, RULE_FAMILIES
+from triadic_miner.Report import Report
+from triadic_miner.RuleSink import RuleSink
+
+
+def test_stream_rules(fixture_pipeline, tmp_path) -> None:
+    triadic_concepts, links, _ = fixture_pipeline
+    symbols = triadic_concepts.symbols
+    rules = AssociationRule.compute_rules(triadic_concepts, 0.1, 0.1, links, sort=False)
+
+    for rule_output in ("text", "jsonl", "count"):
+        rule_sinks = {
+            family: RuleSink.create(
+                rule_output, family, symbols, str(tmp_path / f"{family}.rules")
+            )
+            for family in RULE_FAMILIES
+        }
+        AssociationRule.stream_rules(triadic_concepts, 0.1, 0.1, links, rule_sinks)
+        for rule_sink in rule_sinks.values():
+            rule_sink.close()
+        assert {family: rule_sinks[family].count for family in RULE_FAMILIES} == {
+            family: len(rules[family]) for family in RULE_FAMILIES
+        }
+
+    for family in RULE_FAMILIES:
+        expected_path = tmp_path / f"{family}.expected"
+        Report.save_rules(rules[family], family, symbols, str(expected_path))
+        assert (tmp_path / f"{family}.rules").read_bytes() == expected_path.read_bytes()
+
+        with open(tmp_path / f"{family}.rules.jsonl", encoding="utf-8") as reader:
+            records = [json.loads(line) for line in reader]
+        assert len(records) == len(rules[family])
+        assert ("lift" in records[0]) == (family in ("BCAAR", "BACAR"))
+
+    with pytest.raises(ValueError):
+        RuleSink.create("csv", "BCAI", symbols, str(tmp_path / "BCAI.csv"))
+
+
+def test_stream_rules_hash_seed(tmp_path) -> None:
+    # The rule and generator files must not depend on the hash seed of the
+    # run
+    script = (
+        "import sys\n"
+        "from triadic_miner.AssociationRules import AssociationRule, RULE_FAMILIES\n"
+        "from triadic_miner.Report import Report\n"
+        "from triadic_miner.RuleSink import RuleSink\n"
+        "from triadic_miner.TriadicConcept import TriadicConcept\n"
+        "from tests.conftest import run_pipeline\n"
+        "tc, links, _ = run_pipeline()\n"
+        "sinks = {f: RuleSink.create('text', f, tc.symbols, sys.argv[1] + f)\n"
+        "         for f in RULE_FAMILIES}\n"
+        "AssociationRule.stream_rules(tc, 0.1, 0.1, links, sinks)\n"
+        "for sink in sinks.values():\n"
+        "    sink.close()\n"
+        "tc = TriadicConcept.compute_extensional_generators(tc, links)\n"
+        "rules = AssociationRule.compute_extensional_implications(tc, 0.1)\n"
+        "report = Report(sys.argv[1] + 'report', 'example')\n"
+        "report.save_extensional_implications(\n"
+        "    rules, tc.symbols, sys.argv[1] + 'extensional')\n"
+        "report.save_extensional_generators(tc, sys.argv[1] + 'ext_generators')\n"
+        "report.save_feature_generators(tc, sys.argv[1] + 'generators')\n"
+    )
+    for seed in ("1", "2"):
+        subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path / f"{seed}.")],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            check=True,
+            capture_output=True,
+        )
+    for suffix in RULE_FAMILIES + ("extensional", "ext_generators", "generators"):
+        assert (tmp_path / f"1.{suffix}").read_bytes() == (
+            tmp_path / f"2.{suffix}"
+        ).read_bytes()
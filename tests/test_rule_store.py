@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.RuleStore import RuleStore
+
+
+def test_rule_store_redundancy() -> None:
+    rule_store = RuleStore()
+    assert rule_store.add("a -> bc", 0b1, 0b1, 0b110)
+    assert rule_store.add("a -> d", 0b1, 0b1, 0b1000)
+    assert not rule_store.add("a -> b", 0b1, 0b1, 0b10)
+    assert not rule_store.add("a -> bc", 0b1, 0b1, 0b110)
+    assert rule_store.add("a -> bd", 0b1, 0b1, 0b1010)
+    assert rule_store.add("a -> b (other condition)", 0b1, 0b10, 0b10)
+    assert rule_store.add("e -> b", 0b10000, 0b1, 0b10)
+    assert list(rule_store) == [
+        "a -> bc",
+        "a -> d",
+        "a -> bd",
+        "a -> b (other condition)",
+        "e -> b",
+    ]
+    assert len(rule_store) == 5
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import numpy as np
+
+from triadic_miner.AssociationRules import AssociationRule
+from triadic_miner.StageCache import StageCache
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+def test_stage_cache(tmp_path) -> None:
+    input_file_path = tmp_path / "input.data.out"
+    input_file_path.write_text("1 P a\n")
+    cache_dir = str(tmp_path / "cache")
+    triadic_concepts = TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+    faces, all_extents = TriadicConcept.create_triadic_concepts_faces(triadic_concepts)
+    links = TriadicConcept.T_iPred(triadic_concepts, faces, all_extents)
+
+    stage_cache = StageCache(cache_dir, input_file_path, {"miner": "data_peeler"})
+    key = stage_cache.chain("Running T-iPred")
+    assert stage_cache.load("Running T-iPred", key) is None
+    stage_cache.save(key, triadic_concepts, links)
+
+    stage_cache = StageCache(cache_dir, input_file_path, {"miner": "data_peeler"})
+    assert stage_cache.chain("Running T-iPred") == key
+    loaded_concepts, loaded_links = stage_cache.load("Running T-iPred", key)
+    assert list(loaded_links.iter_edges()) == list(links.iter_edges())
+    assert loaded_links.get_statistics() == links.get_statistics()
+    assert (
+        loaded_concepts.symbols.objects.names == triadic_concepts.symbols.objects.names
+    )
+    for loaded_concept, concept in zip(loaded_concepts, triadic_concepts, strict=True):
+        assert loaded_concept.extent == concept.extent
+        assert loaded_concept.intent == concept.intent
+        assert loaded_concept.modus == concept.modus
+        assert loaded_concept.extent_bits == concept.extent_bits
+        assert loaded_concept.intent_bits == concept.intent_bits
+        assert loaded_concept.modus_bits == concept.modus_bits
+    other_key = stage_cache.chain("Validating Feature Generators", {"infimum": True})
+    assert stage_cache.load("Validating Feature Generators", other_key) is None
+    assert stage_cache.get_statistics() == {
+        "hits": ["Running T-iPred"],
+        "misses": ["Validating Feature Generators"],
+    }
+
+    other_stage_cache = StageCache(cache_dir, input_file_path, {"miner": "native"})
+    assert other_stage_cache.chain("Running T-iPred") != key
+    input_file_path.write_text("1 P b\n")
+    other_stage_cache = StageCache(cache_dir, input_file_path, {"miner": "data_peeler"})
+    assert other_stage_cache.chain("Running T-iPred") != key
+
+
+def test_stage_cache_disabled(tmp_path) -> None:
+    input_file_path = tmp_path / "input.data.out"
+    input_file_path.write_text("1 P a\n")
+
+    stage_cache = StageCache("", input_file_path)
+    key = stage_cache.chain("Running T-iPred")
+    assert key is None
+    stage_cache.save(key, None, None)
+    assert stage_cache.load("Running T-iPred", key) is None
+    assert stage_cache.get_statistics() == {"hits": [], "misses": []}
+
+
+def test_stage_cache_generators(fixture_pipeline, tmp_path) -> None:
+    triadic_concepts, links, formal_context = fixture_pipeline
+    input_file_path = tmp_path / "input.data.out"
+    input_file_path.write_text("1 P a\n")
+
+    stage_cache = StageCache(str(tmp_path / "cache"), input_file_path)
+    key = stage_cache.chain("Validating Feature Generators")
+    stage_cache.save(key, triadic_concepts, links)
+    # The file holds arrays only, it is read without pickle
+    with np.load(stage_cache.get_path(key), allow_pickle=False) as arrays:
+        assert all(arrays[name].dtype != object for name in arrays.files)
+
+    loaded_concepts, loaded_links = stage_cache.load(
+        "Validating Feature Generators", key
+    )
+    for loaded_concept, concept in zip(loaded_concepts, triadic_concepts, strict=True):
+        assert sorted(
+            (sorted(generator[0]), sorted(generator[1]))
+            for generator in loaded_concept.feature_generator_minimal
+        ) == sorted(
+            (
+                sorted(
+                    [generator[0]] if isinstance(generator[0], str) else generator[0]
+                ),
+                sorted(
+                    [generator[1]] if isinstance(generator[1], str) else generator[1]
+                ),
+            )
+            for generator in concept.feature_generator_minimal
+        )
+    assert AssociationRule.compute_rules(
+        loaded_concepts, 0.1, 0.1, loaded_links
+    ) == AssociationRule.compute_rules(triadic_concepts, 0.1, 0.1, links)
+    assert TriadicConcept.compute_formal_context(loaded_concepts).objects == (
+        formal_context.objects
+    )
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import pytest
+from triadic_miner.SymbolTable import SymbolTable
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+@pytest.fixture
+def fixture_triadic_concepts() -> TriadicConcept:
+    return TriadicConcept.get_triadic_concepts_from_input_file(
+        "input/example_PNKRS.data.out"
+    )
+
+
+def test_symbol_table_encode_decode() -> None:
+    symbols = SymbolTable()
+    bits = symbols.attributes.intern_all(sorted({"N", "P", "K"}))
+    assert bits.bit_count() == 3
+    assert symbols.attributes.decode(bits) == {"N", "P", "K"}
+    assert symbols.attributes.encode({"K", "N", "P"}) == bits
+    assert symbols.attributes.encode("P") == 1 << symbols.attributes.ids["P"]
+    with pytest.raises(ValueError):
+        symbols.attributes.encode({"P", "S"})
+    assert len(symbols.attributes) == 3
+    assert list(SymbolTable.iter_bits(0b10110)) == [1, 2, 4]
+    assert SymbolTable.is_subset(0b0110, 0b1110)
+    assert not SymbolTable.is_subset(0b0111, 0b1110)
+
+
+def test_concepts_bitmasks(fixture_triadic_concepts: TriadicConcept) -> None:
+    symbols = fixture_triadic_concepts.symbols
+    assert len(symbols.objects) == 5
+    for concept in fixture_triadic_concepts:
+        assert symbols.objects.decode(concept.extent_bits) == set(concept.extent)
+        for intent, intent_bits in zip(concept.intent, concept.intent_bits):
+            assert symbols.attributes.decode(intent_bits) == intent
+        for modus, modus_bits in zip(concept.modus, concept.modus_bits):
+            assert symbols.conditions.decode(modus_bits) == modus
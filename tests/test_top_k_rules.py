@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import random
+import pytest
+from triadic_miner.AssociationRules import AssociationRule
+from triadic_miner.TopKRules import TopKRules
+
+
+def test_top_k_rules() -> None:
+    rng = random.Random(0)
+    rules = [
+        AssociationRule(
+            antecedent=(index,), lift=rng.choice([0.5, 1.0, 2.0]), confidence=0.5
+        )
+        for index in range(50)
+    ]
+    for metric in ("lift", "confidence"):
+        top_rules = TopKRules(7, metric)
+        assert top_rules.get_floor() is None
+        for rule in rules + rules[:10]:
+            top_rules.add(rule)
+        assert len(top_rules) == 7
+        expected = sorted(
+            rules, key=lambda rule: (getattr(rule, metric), rule), reverse=True
+        )[:7]
+        assert sorted(top_rules) == sorted(expected)
+        assert top_rules.get_floor() == getattr(expected[-1], metric)
+
+    with pytest.raises(ValueError):
+        TopKRules(7, "leverage")
@@ -4,6 +4,9 @@
 """
 
 import pytest
+from itertools import chain, combinations
+from triadic_miner.DerivationCache import DerivationCache
+from triadic_miner.FormalContext import FormalContext
 from triadic_miner.TriadicConcept import TriadicConcept
 
 
@@ -86,6 +89,17 @@ def test_reading_triadic_concepts_file(
     )
 
 
+def test_sorted_feature_views(fixture_triadic_concepts: TriadicConcept) -> None:
+    for concept in fixture_triadic_concepts:
+        pairs = sorted(zip(concept.intent_bits, concept.modus_bits))
+        assert sorted(concept.pairs_by_intent) == pairs
+        assert sorted(concept.pairs_by_modus) == pairs
+        intent_sizes = [x[0].bit_count() for x in concept.pairs_by_intent]
+        modus_sizes = [x[1].bit_count() for x in concept.pairs_by_modus]
+        assert intent_sizes == sorted(intent_sizes, reverse=True)
+        assert modus_sizes == sorted(modus_sizes, reverse=True)
+
+
 def test_T_iPred(fixture_links: list) -> None:
     assert len(fixture_links) == 29
     assert ({"5"}, frozenset()) in fixture_links
@@ -167,6 +181,91 @@ def test_concept_stability(fixture_concept_stability: TriadicConcept) -> None:
     )
 
 
+def test_concept_stability_matches_powerset(
+    fixture_concept_stability: TriadicConcept,
+) -> None:
+    formal_context = TriadicConcept.compute_formal_context(fixture_concept_stability)
+    for concept in fixture_concept_stability:
+        extent = list(concept.extent)
+        if len(extent) < 2:
+            continue
+        for intent, modus, stability in concept.concept_stability:
+            count = 0
+            for subset in chain.from_iterable(
+                combinations(extent, r) for r in range(1, len(extent) + 1)
+            ):
+                pairs = [x.split() for x in formal_context.intension(subset)]
+                if FormalContext.from_incidences(pairs).is_concept(intent, modus):
+                    count += 1
+            assert stability == round(count / 2 ** len(extent), 3)
+
+
+def test_concept_stability_monte_carlo(
+    fixture_concept_stability: TriadicConcept,
+) -> None:
+    exact = {
+        concept.concept_id: [x[2] for x in concept.concept_stability]
+        for concept in fixture_concept_stability
+    }
+    formal_context = TriadicConcept.compute_formal_context(fixture_concept_stability)
+    triadic_concepts = TriadicConcept.compute_concept_stability(
+        fixture_concept_stability, formal_context, None, "monte_carlo", 5000, 7
+    )
+    for concept in triadic_concepts:
+        for stability, estimate in zip(
+            exact[concept.concept_id], concept.concept_stability
+        ):
+            _, _, value, lower, upper = estimate
+            assert lower <= value <= upper
+            assert abs(stability - value) <= 0.05
+    assert TriadicConcept.get_stability_samples(0.05) == 738
+    assert TriadicConcept.get_stability_error(738) <= 0.05
+
+
+def test_concept_stability_fallback(
+    fixture_concept_stability: TriadicConcept,
+) -> None:
+    exact = {
+        concept.concept_id: [x[2] for x in concept.concept_stability]
+        for concept in fixture_concept_stability
+    }
+    formal_context = TriadicConcept.compute_formal_context(fixture_concept_stability)
+    # No family of covers is small enough, so every pair with covers is
+    # estimated and gets the bounds of its confidence interval
+    triadic_concepts = TriadicConcept.compute_concept_stability(
+        fixture_concept_stability, formal_context, None, "exact", 5000, 7, 0, 0
+    )
+    estimated = 0
+    for concept in triadic_concepts:
+        for stability, score in zip(
+            exact[concept.concept_id], concept.concept_stability
+        ):
+            if len(score) == 5:
+                estimated += 1
+                _, _, value, lower, upper = score
+                assert lower <= value <= upper
+                assert abs(stability - value) <= 0.05
+            else:
+                assert score[2] == stability
+    assert estimated > 0
+
+
+def test_concept_stability_derivation_cache(
+    fixture_concept_stability: TriadicConcept,
+) -> None:
+    exact = [concept.concept_stability for concept in fixture_concept_stability]
+    formal_context = DerivationCache(
+        TriadicConcept.compute_formal_context(fixture_concept_stability)
+    )
+    triadic_concepts = TriadicConcept.compute_concept_stability(
+        fixture_concept_stability, formal_context
+    )
+    assert [concept.concept_stability for concept in triadic_concepts] == exact
+    statistics = formal_context.get_statistics()
+    assert statistics["misses"] > 0
+    assert statistics["hits"] > 0
+
+
 def test_separation_index(fixture_separation_index: TriadicConcept) -> None:
     assert (
         len(
@@ -3,13 +3,29 @@
 @author: pedroruas
 """
 
+import numpy as np
 from tqdm import tqdm
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
-EMPTY_SET = set([])
+from triadic_miner.RuleStore import RuleStore
+from triadic_miner.SymbolTable import SymbolTable
+from triadic_miner.TopKRules import TopKRules, RANK_METRICS
 
+RULE_FAMILIES = ("BCAI", "BACI", "BCAAR", "BACAR")
+IMPLICATION_FAMILIES = ("BCAI", "BACI")
 
-@dataclass(slots=True, order=True)
+
+class RuleList(list):
+    """List of the association rules in the order they are emitted. A link
+    never gives the same rule twice (see mine_rules), and the rules of two
+    links differ by their extents, so no rule is repeated.
+    """
+
+    def add(self, rule):
+        self.append(rule)
+
+
+@dataclass(frozen=True, slots=True, order=True)
 class AssociationRule:
     """Class that represents a association rule (including implications).
     The following rules are being computed:
@@ -17,124 +33,586 @@ class AssociationRule:
         - Biedermann Attributional Condition Association Rule (BACAR)
         - Biedermann Conditional Attribute Implication (BCAI)
         - Biedermann Attributional Condition Implication (BACI)
+
+    The antecedent, consequent, condition and extents are sorted tuples with
+    the IDs of their elements in the SymbolTable, so a rule is immutable and
+    hashable: the rules are deduplicated with sets and sorted in the same
+    order on every run. The names are decoded when the rules are saved.
     """
 
-    antecedent: list[list] = field(default_factory=list)
-    consequent: list[list] = field(default_factory=list)
-    condition: list[list] = field(default_factory=list)
-    support: float = field(default_factory=float)
-    confidence: float = field(default_factory=float)
-    lift: float = field(default_factory=float)
-    current_concept_extent: set = field(default_factory=set)
-    successor_concept_extent: set = field(default_factory=set)
+    antecedent: tuple = ()
+    consequent: tuple = ()
+    condition: tuple = ()
+    support: float = 0.0
+    confidence: float = 0.0
+    lift: float = 0.0
+    current_concept_extent: tuple = ()
+    successor_concept_extent: tuple = None
 
     def __str__(self):
-        antecedent = str(", ".join([", ".join(x for x in sorted(self.antecedent))]))
-        consequent = str(", ".join([", ".join(x for x in sorted(self.consequent))]))
-        condition = str(", ".join([", ".join(x for x in sorted(self.condition))]))
-        current_concept_extent = str(
-            ", ".join([", ".join(x for x in sorted(self.current_concept_extent))])
-        )
-        successor_concept_extent = self.successor_concept_extent
-        if successor_concept_extent is not None:
-            successor_concept_extent = str(
-                ", ".join([", ".join(x for x in sorted(self.successor_concept_extent))])
-            )
+        return f"({self.antecedent} -> {self.consequent}) {self.condition}\
+                \t(sup: {self.support}, conf: {self.confidence}, lift: {self.lift})\
+                \nConcept extent: {self.current_concept_extent}\
+                \nSuccessor concept: {self.successor_concept_extent}\n"
 
-        return f"({antecedent} -> {consequent}) {condition}\
-                \t(sup: {self.support}, conf: {self.confidence}, conliftf: {self.lift})\
-                \nConcept extent: {current_concept_extent}\
-                \nSuccessor concept: {successor_concept_extent}\n"
+    def get_ids(bits):
+        """Takes a bitmask and returns the sorted tuple with the IDs of its
+        elements, which is the canonical form used by the rules.
+
+        Args:
+            bits (int): bitmask of the elements
 
-    def is_redundant(new_rule, existing_rules):
+        Returns:
+            tuple: sorted IDs of the elements
         """
-        Checks whether a new association rule is redundant given the existing rules.
 
-        A rule is considered redundant if there is already an existing rule with the same
-        antecedent and condition, and whose consequent contains all elements of the new rule's consequent.
-        This ensures that more general rules (with larger consequents) are kept, while more specific
-        or nested rules (with smaller consequents but same support and condition) are discarded.
+        return tuple(SymbolTable.iter_bits(bits))
+
+    def decode(ids, dimension):
+        """Takes a tuple of IDs and the Dimension they belong to, and returns
+        the sorted names of the elements.
 
         Args:
-            new_rule (AssociationRule): The candidate rule to check for redundancy.
-            existing_rules (list): The list of already generated AssociationRule objects.
+            ids (tuple): IDs of the elements
+            dimension (Dimension): Dimension of the SymbolTable
 
         Returns:
-            bool: True if the new_rule is redundant and should not be added;
-                  False if it is a novel and non-redundant rule.
+            list: sorted names of the elements
         """
-        for existing_rule in existing_rules:
-            if (
-                existing_rule.antecedent == new_rule.antecedent
-                and existing_rule.condition == new_rule.condition
-                and set(new_rule.consequent).issubset(set(existing_rule.consequent))
-            ):
-                return True
-        return False
 
-    def compute_BCAI_implications(triadic_concepts, minimum_support_rules):
-        """Takes the triadic_concepts and the minimum_support_rules value to
-        compute the BCAI Implications that meets the minimum support value
-        set up by the user.
+        return sorted(dimension.names[x] for x in ids)
+
+    def compute_rules(
+        triadic_concepts,
+        minimum_support_rules,
+        minimum_confidence_rules=0.0,
+        links=None,
+        families=RULE_FAMILIES,
+        top_k=0,
+        rank_metric="lift",
+        sort=True,
+    ):
+        """Takes the triadic_concepts, minimum_support_rules,
+        minimum_confidence_rules and the links to compute the rule families
+        in a single engine (see mine_rules). The implications are kept in
+        a RuleStore, which discards the redundant ones, and the association
+        rules in a list, or in a TopKRules bounded heap when top_k is set.
 
         Args:
             triadic_concepts (list): list of TriadicConcept objects
             minimum_support_rules (float): minimum value set up by the user
             in the configs.json
+            minimum_confidence_rules (float): minimum value set up by the user
+            in the configs.json
+            links (Links): the links between Triadic Concepts
+            families (tuple): names of the rule families to be computed
+            top_k (int): amount of BCAAR and BACAR rules kept, the best ones
+            by rank_metric; 0 keeps all of them
+            rank_metric (str): 'support', 'confidence' or 'lift'
+            sort (bool): False keeps the rules in the order they are found,
+            which is the order of the rule files written by stream_rules
+            (the top-k rules are always sorted)
 
         Returns:
-            BCAI_implications (list): list of AssociationRule objects
-            representing the BCAI implications
+            dict: list of AssociationRule objects of each family
         """
 
-        BCAI_implications = []
-        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
+        sinks = {}
+        for family in families:
+            if family in IMPLICATION_FAMILIES:
+                sinks[family] = RuleStore()
+            elif top_k > 0:
+                sinks[family] = TopKRules(top_k, rank_metric)
+            else:
+                sinks[family] = RuleList()
+        AssociationRule.mine_rules(
+            triadic_concepts,
+            minimum_support_rules,
+            minimum_confidence_rules,
+            links,
+            sinks,
+            rank_metric if top_k > 0 else None,
+        )
+        return {
+            family: (
+                sorted(sinks[family])
+                if sort or isinstance(sinks[family], TopKRules)
+                else list(sinks[family])
+            )
+            for family in families
+        }
+
+    def stream_rules(
+        triadic_concepts,
+        minimum_support_rules,
+        minimum_confidence_rules,
+        links,
+        rule_sinks,
+        top_k=0,
+        rank_metric="lift",
+    ):
+        """Takes the triadic_concepts, minimum_support_rules,
+        minimum_confidence_rules and the links, and passes every rule on to
+        the sink of its family as soon as it is computed (see RuleSink), so
+        the rules are not kept in memory.
+
+        Only the state needed to discard repeated rules is kept: the index
+        of the bitmasks of the implications (RuleStore), and the rules of the
+        current link for the association rules. When top_k is set, the best
+        association rules are kept in a TopKRules heap and passed on at the
+        end.
+
+        Args:
+            triadic_concepts (list): list of TriadicConcept objects
+            minimum_support_rules (float): minimum value set up by the user
+            in the configs.json
+            minimum_confidence_rules (float): minimum value set up by the user
+            in the configs.json
+            links (Links): the links between Triadic Concepts
+            rule_sinks (dict): sink of each rule family to be computed
+            top_k (int): amount of BCAAR and BACAR rules kept, the best ones
+            by rank_metric; 0 keeps all of them
+            rank_metric (str): 'support', 'confidence' or 'lift'
+        """
+
+        sinks = {}
+        for family, rule_sink in rule_sinks.items():
+            if family in IMPLICATION_FAMILIES:
+                sinks[family] = RuleStore(rule_sink)
+            elif top_k > 0:
+                sinks[family] = TopKRules(top_k, rank_metric)
+            else:
+                sinks[family] = rule_sink
+        AssociationRule.mine_rules(
+            triadic_concepts,
+            minimum_support_rules,
+            minimum_confidence_rules,
+            links,
+            sinks,
+            rank_metric if top_k > 0 else None,
+        )
+        for family, sink in sinks.items():
+            if isinstance(sink, TopKRules):
+                for rule in sorted(sink):
+                    rule_sinks[family].add(rule)
+
+    def mine_rules(
+        triadic_concepts,
+        minimum_support_rules,
+        minimum_confidence_rules,
+        links,
+        sinks,
+        rank_metric=None,
+    ):
+        """Takes the triadic_concepts, minimum_support_rules,
+        minimum_confidence_rules and the links, and emits the rules of each
+        family in its sink: the implications (BCAI and BACI) are computed in
+        one pass over the Feature Generators of the concepts, and the
+        association rules (BCAAR and BACAR) in one pass over the links.
 
-        def cast_to_list(item):
-            if isinstance(item, str):
-                return [item]
-            return item
-
-        for concept in tqdm(triadic_concepts):
-            extent, intent, modus = concept.extent, concept.intent, concept.modus
-            intent = cast_to_list(intent)
-            modus = cast_to_list(modus)
-            for generator in concept.feature_generator_minimal:
-                intent_generator, modus_generator = generator[0], generator[1]
-                intent_generator = cast_to_list(intent_generator)
-                modus_generator = cast_to_list(modus_generator)
-
-                concept_intent_modus = zip(intent, modus)
-                concept_intent_modus = sorted(
-                    concept_intent_modus, key=lambda x: (len(x[0])), reverse=True
+        The families share every intermediate result: the support and
+        confidence thresholds are checked once per concept or link, the
+        generators are encoded once per concept, and the subset tests of a
+        generator against the (intent, modus) pairs of a concept are made
+        once for all families.
+
+        Args:
+            triadic_concepts (list): list of TriadicConcept objects
+            minimum_support_rules (float): minimum value set up by the user
+            in the configs.json
+            minimum_confidence_rules (float): minimum value set up by the user
+            in the configs.json
+            links (Links): the links between Triadic Concepts
+            sinks (dict): sink of each rule family to be computed. The
+            implications are emitted as add(rule, antecedent_bits,
+            condition_bits, consequent_bits), and the association rules as
+            add(rule)
+            rank_metric (str): metric of the TopKRules sinks of the
+            association rules, or None when they keep all the rules. The
+            links whose rules score below the floors of these sinks are
+            skipped
+        """
+
+        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
+        symbols = triadic_concepts.symbols
+        is_subset = SymbolTable.is_subset
+        faces = {}
+        ids = {}
+
+        def get_ids(bits):
+            """Takes a bitmask and returns the IDs of its elements, which are
+            shared by all the rules that have this antecedent, consequent,
+            condition or extent.
+            """
+
+            bits_ids = ids.get(bits)
+            if bits_ids is None:
+                bits_ids = ids[bits] = AssociationRule.get_ids(bits)
+            return bits_ids
+
+        def get_face(concept):
+            """Takes a concept and returns the IDs of its extent and the
+            bitmasks of its generators. The generators are sorted by their
+            bitmasks, so the rules are emitted in the same order whatever
+            the order of the generators found by the validation (which
+            depends on the hash seed of the run).
+            """
+
+            face = faces.get(concept.extent_bits)
+            if face is None:
+                generators = sorted(
+                    (
+                        symbols.attributes.encode(generator[0]),
+                        symbols.conditions.encode(generator[1]),
+                    )
+                    for generator in concept.feature_generator_minimal
+                )
+                face = faces[concept.extent_bits] = (
+                    get_ids(concept.extent_bits),
+                    generators,
                 )
-                for item in concept_intent_modus:
-                    _intent, _modus = item
-                    if set(intent_generator).issubset(set(_intent)) and set(
-                        modus_generator
-                    ).issubset(set(_modus)):
-                        implication = set(_intent) - set(intent_generator)
-                        if implication != EMPTY_SET:
-                            implication = list(implication)
-                            support = concept.extent_size / _max_cardinality
-
-                            if support >= minimum_support_rules:
+            return face
+
+        def get_matches(pairs, intent_bits, modus_bits):
+            """Takes (intent, modus) pairs and returns the ones that contain
+            the generator (intent_bits, modus_bits), in the same order.
+            """
+
+            return [
+                pair
+                for pair in pairs
+                if is_subset(intent_bits, pair[0]) and is_subset(modus_bits, pair[1])
+            ]
+
+        def get_largest_matches(pairs, dimension, intent_bits, modus_bits):
+            """Takes (intent, modus) pairs sorted from the largest intent
+            (dimension 0) or modus (dimension 1) to the smallest one, and
+            returns the pairs of the largest size that contain the generator.
+            The scan stops at the first smaller pair after a match.
+            """
+
+            matches = []
+            for pair in pairs:
+                size = pair[dimension].bit_count()
+                if matches and size < largest:
+                    break
+                if is_subset(intent_bits, pair[0]) and is_subset(modus_bits, pair[1]):
+                    if not matches:
+                        largest = size
+                    matches.append(pair)
+            return matches
+
+        if "BCAI" in sinks or "BACI" in sinks:
+            for concept in tqdm(triadic_concepts):
+                support = concept.extent_size / _max_cardinality
+                if support < minimum_support_rules:
+                    continue
+                support = round(support, 3)
+                extent, generators = get_face(concept)
+
+                for intent_generator_bits, modus_generator_bits in generators:
+                    matches = get_matches(
+                        concept.pairs_by_intent,
+                        intent_generator_bits,
+                        modus_generator_bits,
+                    )
+                    if not matches:
+                        continue
+                    antecedent = get_ids(intent_generator_bits)
+                    condition = get_ids(modus_generator_bits)
+
+                    if "BCAI" in sinks:
+                        for _intent, _modus in matches:
+                            implication_bits = _intent & ~intent_generator_bits
+                            if implication_bits != 0:
+                                rule = AssociationRule(
+                                    antecedent=antecedent,
+                                    consequent=get_ids(implication_bits),
+                                    condition=condition,
+                                    support=support,
+                                    confidence=1.0,
+                                    current_concept_extent=extent,
+                                    successor_concept_extent=None,
+                                )
+                                sinks["BCAI"].add(
+                                    rule,
+                                    intent_generator_bits,
+                                    modus_generator_bits,
+                                    implication_bits,
+                                )
+
+                    if "BACI" in sinks:
+                        for _intent, _modus in get_matches(
+                            concept.pairs_by_modus,
+                            intent_generator_bits,
+                            modus_generator_bits,
+                        ):
+                            implication_bits = _modus & ~modus_generator_bits
+                            if implication_bits != 0:
                                 rule = AssociationRule(
-                                    antecedent=intent_generator,
-                                    consequent=implication,
-                                    condition=modus_generator,
-                                    support=round(support, 3),
+                                    antecedent=condition,
+                                    consequent=get_ids(implication_bits),
+                                    condition=antecedent,
+                                    support=support,
                                     confidence=1.0,
                                     current_concept_extent=extent,
                                     successor_concept_extent=None,
                                 )
-                                if not AssociationRule.is_redundant(
-                                    rule, BCAI_implications
-                                ):
-                                    if rule not in BCAI_implications:
-                                        BCAI_implications.append(rule)
+                                sinks["BACI"].add(
+                                    rule,
+                                    modus_generator_bits,
+                                    intent_generator_bits,
+                                    implication_bits,
+                                )
+
+        def get_link_metrics(target_A1, source_B1):
+            """Takes the concept IDs of a link and returns the rounded
+            support, confidence and lift of its rules, or None if it does not
+            meet the thresholds.
+            """
+
+            target_size = triadic_concepts[target_A1].extent_size
+            source_size = triadic_concepts[source_B1].extent_size
+            if not target_size:
+                return None
+            support = source_size / _max_cardinality
+            confidence = source_size / target_size
+            if support < minimum_support_rules or confidence < minimum_confidence_rules:
+                return None
+            try:
+                lift = support / (
+                    (source_size / _max_cardinality) * (target_size / _max_cardinality)
+                )
+            except ZeroDivisionError:
+                lift = 0
+            return round(support, 3), round(confidence, 3), round(lift, 3)
 
-        return BCAI_implications
+        def is_open(family, score):
+            """Takes a rule family and the score of a link, and checks whether
+            the top-k sink of the family can still keep a rule of this link.
+            """
+
+            if rank_metric is None:
+                return True
+            floor = sinks[family].get_floor()
+            return floor is None or score >= floor
+
+        link_rules = set()
+
+        def emit(family, rule):
+            """Takes a rule of the current link and passes it on to the sink
+            of its family, unless the link already gave it. The rules hold
+            the extents of their link, so two links never give the same rule
+            and only the rules of the current link are tracked.
+            """
+
+            if (family, rule) not in link_rules:
+                link_rules.add((family, rule))
+                sinks[family].add(rule)
+
+        if links is not None and ("BCAAR" in sinks or "BACAR" in sinks):
+            link_metrics = (
+                (link, get_link_metrics(*link)) for link in links.iter_edges()
+            )
+            score = None
+            if rank_metric is not None:
+                # The links are visited from the best score to the worst, so
+                # the floors of the top-k sinks rise as fast as possible and
+                # the pass stops at the first link below all of them
+                position = RANK_METRICS.index(rank_metric)
+                link_metrics = sorted(
+                    (
+                        (link, metrics)
+                        for link, metrics in link_metrics
+                        if metrics is not None
+                    ),
+                    key=lambda item: item[1][position],
+                    reverse=True,
+                )
+
+            for (target_A1, source_B1), metrics in tqdm(link_metrics, total=len(links)):
+                if metrics is None:
+                    continue
+                support, confidence, lift = metrics
+                if rank_metric is not None:
+                    score = metrics[position]
+                    if not any(
+                        is_open(family, score)
+                        for family in ("BCAAR", "BACAR")
+                        if family in sinks
+                    ):
+                        break
+
+                link_rules.clear()
+                target_A1_concept = triadic_concepts.get_by_id(target_A1)
+                source_B1_concept = triadic_concepts.get_by_id(source_B1)
+                target_concept, generators = get_face(target_A1_concept)
+                source_concept, _ = get_face(source_B1_concept)
+
+                for U2_bits, U3_bits in generators:
+                    if "BCAAR" in sinks and is_open("BCAAR", score):
+                        target_matches = get_largest_matches(
+                            target_A1_concept.pairs_by_intent, 0, U2_bits, U3_bits
+                        )
+                        source_matches = target_matches and get_largest_matches(
+                            source_B1_concept.pairs_by_intent, 0, U2_bits, U3_bits
+                        )
+                        for target_intent_A2, target_modus_A3 in target_matches:
+                            for source_intent_B2, source_modus_B3 in source_matches:
+                                if is_subset(
+                                    target_intent_A2, source_intent_B2
+                                ) and is_subset(source_modus_B3, target_modus_A3):
+                                    consequent = source_intent_B2 & ~target_intent_A2
+                                    if consequent != 0:
+                                        emit(
+                                            "BCAAR",
+                                            AssociationRule(
+                                                antecedent=get_ids(U2_bits),
+                                                consequent=get_ids(consequent),
+                                                condition=get_ids(U3_bits),
+                                                support=support,
+                                                confidence=confidence,
+                                                lift=lift,
+                                                current_concept_extent=source_concept,
+                                                successor_concept_extent=target_concept,
+                                            ),
+                                        )
+
+                    if "BACAR" in sinks and is_open("BACAR", score):
+                        target_matches = get_largest_matches(
+                            target_A1_concept.pairs_by_modus, 1, U2_bits, U3_bits
+                        )
+                        source_matches = target_matches and get_largest_matches(
+                            source_B1_concept.pairs_by_modus, 1, U2_bits, U3_bits
+                        )
+                        for target_intent_A2, target_modus_A3 in target_matches:
+                            for source_intent_B2, source_modus_B3 in source_matches:
+                                if is_subset(
+                                    target_modus_A3, source_modus_B3
+                                ) and is_subset(source_intent_B2, target_intent_A2):
+                                    consequent = source_modus_B3 & ~target_modus_A3
+                                    if consequent != 0:
+                                        emit(
+                                            "BACAR",
+                                            AssociationRule(
+                                                antecedent=get_ids(U3_bits),
+                                                consequent=get_ids(consequent),
+                                                condition=get_ids(U2_bits),
+                                                support=support,
+                                                confidence=confidence,
+                                                lift=lift,
+                                                current_concept_extent=source_concept,
+                                                successor_concept_extent=target_concept,
+                                            ),
+                                        )
+
+    def sweep_rules(
+        triadic_concepts, links, supports, confidences, top_k=0, rank_metric="lift"
+    ):
+        """Takes the triadic_concepts, the links and lists of support and
+        confidence thresholds, and computes the rule families for every
+        (support, confidence) pair of the grid while mining the rules only
+        once.
+
+        The candidates are mined at the lowest thresholds of the grid, with
+        the implications kept in emission order and without the redundancy
+        filter. The support and confidence of each candidate are recovered
+        from its extents, and the candidates of every grid point are selected
+        at once with a numpy mask. The redundancy filter of the implications
+        is then applied to the selected candidates in emission order, which
+        gives the same implications as mining that grid point on its own.
+
+        Args:
+            triadic_concepts (list): list of TriadicConcept objects
+            links (Links): the links between Triadic Concepts
+            supports (list): minimum support values of the grid
+            confidences (list): minimum confidence values of the grid
+            top_k (int): amount of BCAAR and BACAR rules kept per grid point,
+            the best ones by rank_metric; 0 keeps all of them
+            rank_metric (str): 'support', 'confidence' or 'lift'
+
+        Returns:
+            dict: for each (support, confidence) pair, the sorted list of
+            AssociationRule objects of each family
+        """
+
+        class CandidateLog(list):
+            """List of the implications emitted with their bitmasks."""
+
+            def add(self, rule, antecedent, condition, consequent):
+                self.append((rule, antecedent, condition, consequent))
+
+        sinks = {
+            family: CandidateLog() if family in IMPLICATION_FAMILIES else set()
+            for family in RULE_FAMILIES
+        }
+        AssociationRule.mine_rules(
+            triadic_concepts, min(supports), min(confidences), links, sinks
+        )
+
+        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
+        grid = [
+            (support, confidence) for support in supports for confidence in confidences
+        ]
+        grid_supports = np.array([support for support, _ in grid], dtype=float)
+        grid_confidences = np.array([confidence for _, confidence in grid], dtype=float)
+        masks = {}
+        for family in RULE_FAMILIES:
+            if family in IMPLICATION_FAMILIES:
+                rules = [candidate[0] for candidate in sinks[family]]
+            else:
+                rules = sinks[family] = sorted(sinks[family])
+            support = np.array(
+                [len(rule.current_concept_extent) for rule in rules], dtype=float
+            )
+            mask = support[None, :] / _max_cardinality >= grid_supports[:, None]
+            if family not in IMPLICATION_FAMILIES:
+                confidence = support / np.array(
+                    [len(rule.successor_concept_extent) for rule in rules],
+                    dtype=float,
+                )
+                mask &= confidence[None, :] >= grid_confidences[:, None]
+            masks[family] = mask
+
+        sweep = {}
+        for index, point in enumerate(grid):
+            sweep[point] = {}
+            for family in RULE_FAMILIES:
+                selected = np.flatnonzero(masks[family][index])
+                if family in IMPLICATION_FAMILIES:
+                    rule_store = RuleStore()
+                    for position in selected:
+                        rule_store.add(*sinks[family][position])
+                    sweep[point][family] = sorted(rule_store)
+                elif top_k > 0:
+                    top_rules = TopKRules(top_k, rank_metric)
+                    for position in selected:
+                        top_rules.add(sinks[family][position])
+                    sweep[point][family] = sorted(top_rules)
+                else:
+                    sweep[point][family] = [
+                        sinks[family][position] for position in selected
+                    ]
+        return sweep
+
+    def compute_BCAI_implications(triadic_concepts, minimum_support_rules):
+        """Takes the triadic_concepts and the minimum_support_rules value to
+        compute the BCAI Implications that meets the minimum support value
+        set up by the user.
+
+        Args:
+            triadic_concepts (list): list of TriadicConcept objects
+            minimum_support_rules (float): minimum value set up by the user
+            in the configs.json
+
+        Returns:
+            BCAI_implications (list): list of AssociationRule objects
+            representing the BCAI implications
+        """
+
+        return AssociationRule.compute_rules(
+            triadic_concepts, minimum_support_rules, families=("BCAI",)
+        )["BCAI"]
 
     def compute_BACI_implications(triadic_concepts, minimum_support_rules):
         """Takes the triadic_concepts and the minimum_support_rules value to
@@ -151,54 +629,9 @@ class AssociationRule:
             representing the BACI implications
         """
 
-        BACI_implications = []
-        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
-
-        def cast_to_list(item):
-            if isinstance(item, str):
-                return [item]
-            return item
-
-        for concept in tqdm(triadic_concepts):
-            extent, intent, modus = concept.extent, concept.intent, concept.modus
-            intent = cast_to_list(intent)
-            modus = cast_to_list(modus)
-            for generator in concept.feature_generator_minimal:
-                intent_generator, modus_generator = generator[0], generator[1]
-                intent_generator = cast_to_list(intent_generator)
-                modus_generator = cast_to_list(modus_generator)
-
-                concept_intent_modus = zip(intent, modus)
-                concept_intent_modus = sorted(
-                    concept_intent_modus, key=lambda x: (len(x[1])), reverse=True
-                )
-                for item in concept_intent_modus:
-                    _intent, _modus = item
-                    if set(intent_generator).issubset(set(_intent)) and set(
-                        modus_generator
-                    ).issubset(set(_modus)):
-                        implication = set(_modus) - set(modus_generator)
-                        if implication != EMPTY_SET:
-                            implication = list(implication)
-                            support = concept.extent_size / _max_cardinality
-
-                            if support >= minimum_support_rules:
-                                rule = AssociationRule(
-                                    antecedent=modus_generator,
-                                    consequent=implication,
-                                    condition=intent_generator,
-                                    support=round(support, 3),
-                                    confidence=1.0,
-                                    current_concept_extent=extent,
-                                    successor_concept_extent=None,
-                                )
-                                if not AssociationRule.is_redundant(
-                                    rule, BACI_implications
-                                ):
-                                    if rule not in BACI_implications:
-                                        BACI_implications.append(rule)
-
-        return BACI_implications
+        return AssociationRule.compute_rules(
+            triadic_concepts, minimum_support_rules, families=("BACI",)
+        )["BACI"]
 
     def compute_BCAAR_association_rules(
         triadic_concepts, minimum_support_rules, minimum_confidence_rules, links
@@ -214,159 +647,20 @@ class AssociationRule:
             in the configs.json
             minimum_confidence_rules (float): minimum value set up by the user
             in the configs.json
-            links (list): list with the links between Triadic Concepts
+            links (Links): the links between Triadic Concepts
 
         Returns:
             rules_BCAAR (list): list of AssociationRule objects representing
             the BCAAR association rules
         """
 
-        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
-        rules_BCAAR = []
-
-        def cast_to_list(item):
-            if isinstance(item, str):
-                return [item]
-            return item
-
-        for link in tqdm(links):
-            target_A1, source_B1 = link
-            generators_A1 = triadic_concepts[
-                triadic_concepts.index(set(target_A1))
-            ].feature_generator_minimal
-            for generator in generators_A1:
-                U2 = generator[0]
-                U3 = generator[1]
-                U2 = cast_to_list(U2)
-                U3 = cast_to_list(U3)
-
-                list_pair_Intent_Modus_A2_A3 = []
-                list_pair_Intent_Modus_B2_B3 = []
-
-                source_concept = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].extent
-                source_intent_B2 = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].intent
-                source_modus_B3 = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].modus
-
-                target_concept = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].extent
-                target_intent_A2 = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].intent
-                target_modus_A3 = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].modus
-                pair_Intent_Modus_B2_B3 = zip(source_intent_B2, source_modus_B3)
-                pair_Intent_Modus_A2_A3 = zip(target_intent_A2, target_modus_A3)
-                pair_Intent_Modus_B2_B3 = sorted(
-                    pair_Intent_Modus_B2_B3, key=lambda x: (len(x[0])), reverse=True
-                )
-                pair_Intent_Modus_A2_A3 = sorted(
-                    pair_Intent_Modus_A2_A3, key=lambda x: (len(x[0])), reverse=True
-                )
-
-                if list_pair_Intent_Modus_A2_A3 == []:
-                    for item in pair_Intent_Modus_A2_A3:
-                        if (
-                            list_pair_Intent_Modus_A2_A3 == []
-                            and set(U2).issubset(set(item[0]))
-                            and set(U3).issubset(set(item[1]))
-                        ):
-                            list_pair_Intent_Modus_A2_A3.append(item)
-                        else:
-                            if list_pair_Intent_Modus_A2_A3 != []:
-                                size_item_A = len(list_pair_Intent_Modus_A2_A3[0][0])
-                                if (
-                                    size_item_A == len(item[0])
-                                    and set(U2).issubset(set(item[0]))
-                                    and set(U3).issubset(set(item[1]))
-                                ):
-                                    list_pair_Intent_Modus_A2_A3.append(item)
-                                elif size_item_A > len(item[0]):
-                                    break
-                if list_pair_Intent_Modus_B2_B3 == []:
-                    for item in pair_Intent_Modus_B2_B3:
-                        if (
-                            list_pair_Intent_Modus_B2_B3 == []
-                            and set(U2).issubset(set(item[0]))
-                            and set(U3).issubset(set(item[1]))
-                        ):
-                            list_pair_Intent_Modus_B2_B3.append(item)
-                        else:
-                            if list_pair_Intent_Modus_B2_B3 != []:
-                                size_item_B = len(list_pair_Intent_Modus_B2_B3[0][0])
-                                if (
-                                    size_item_B == len(item[0])
-                                    and set(U2).issubset(set(item[0]))
-                                    and set(U3).issubset(set(item[1]))
-                                ):
-                                    list_pair_Intent_Modus_B2_B3.append(item)
-                                elif size_item_B > len(item[0]):
-                                    break
-
-                for pair_Intent_Modus_A2_A3 in list_pair_Intent_Modus_A2_A3:
-
-                    target_intent_A2, target_modus_A3 = pair_Intent_Modus_A2_A3
-                    target_intent_A2 = cast_to_list(target_intent_A2)
-                    target_modus_A3 = cast_to_list(target_modus_A3)
-
-                    for pair_Intent_Modus_B2_B3 in list_pair_Intent_Modus_B2_B3:
-                        source_intent_B2, source_modus_B3 = pair_Intent_Modus_B2_B3
-
-                        source_intent_B2 = cast_to_list(source_intent_B2)
-                        source_modus_B3 = cast_to_list(source_modus_B3)
-
-                        if (
-                            set(target_intent_A2).issubset(set(source_intent_B2))
-                            and set(source_modus_B3).issubset(set(target_modus_A3))
-                        ) and (
-                            set(U2).issubset(set(source_intent_B2))
-                            and set(U3).issubset(set(source_modus_B3))
-                        ):
-
-                            support = len(source_B1) / _max_cardinality
-                            confidence = len(source_B1) / len(target_A1)
-                            try:
-                                lift = support / (
-                                    (len(source_B1) / _max_cardinality)
-                                    * (len(target_A1) / _max_cardinality)
-                                )
-                            except ZeroDivisionError:
-                                lift = 0
-
-                            if (
-                                support >= minimum_support_rules
-                                and confidence >= minimum_confidence_rules
-                            ):
-                                if (
-                                    set(source_intent_B2) - set(target_intent_A2)
-                                    != EMPTY_SET
-                                ):
-                                    rule = AssociationRule(
-                                        antecedent=list(U2),
-                                        consequent=list(
-                                            set(
-                                                set(source_intent_B2)
-                                                - set(target_intent_A2)
-                                            )
-                                        ),
-                                        condition=list(U3),
-                                        support=round(support, 3),
-                                        confidence=round(confidence, 3),
-                                        lift=round(lift, 3),
-                                        current_concept_extent=source_concept,
-                                        successor_concept_extent=target_concept,
-                                    )
-                                    if rule not in rules_BCAAR:
-                                        rules_BCAAR.append(rule)
-
-        return rules_BCAAR
+        return AssociationRule.compute_rules(
+            triadic_concepts,
+            minimum_support_rules,
+            minimum_confidence_rules,
+            links,
+            families=("BCAAR",),
+        )["BCAAR"]
 
     def compute_BACAR_association_rules(
         triadic_concepts, minimum_support_rules, minimum_confidence_rules, links
@@ -382,162 +676,20 @@ class AssociationRule:
             in the configs.json
             minimum_confidence_rules (float): minimum value set up by the user
             in the configs.json
-            links (list): list with the links between Triadic Concepts
+            links (Links): the links between Triadic Concepts
 
         Returns:
             rules_BACAR (list): list of AssociationRule objects representing
             the BACAR association rules
         """
 
-        _max_cardinality = max(concept.extent_size for concept in triadic_concepts)
-        rules_BACAR = []
-
-        def cast_to_list(item):
-            if isinstance(item, str):
-                return [item]
-            return item
-
-        for link in tqdm(links):
-
-            target_A1, source_B1 = link
-            generators_A1 = triadic_concepts[
-                triadic_concepts.index(set(target_A1))
-            ].feature_generator_minimal
-            for generator in generators_A1:
-                U2 = generator[0]
-                U3 = generator[1]
-                U2 = cast_to_list(U2)
-                U3 = cast_to_list(U3)
-
-                list_pair_Intent_Modus_A2_A3 = []
-                list_pair_Intent_Modus_B2_B3 = []
-
-                source_concept = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].extent
-                source_intent_B2 = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].intent
-                source_modus_B3 = triadic_concepts[
-                    triadic_concepts.index(set(source_B1))
-                ].modus
-                target_concept = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].extent
-                target_intent_A2 = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].intent
-                target_modus_A3 = triadic_concepts[
-                    triadic_concepts.index(set(target_A1))
-                ].modus
-
-                pair_Intent_Modus_B2_B3 = zip(source_intent_B2, source_modus_B3)
-                pair_Intent_Modus_A2_A3 = zip(target_intent_A2, target_modus_A3)
-
-                pair_Intent_Modus_B2_B3 = sorted(
-                    pair_Intent_Modus_B2_B3, key=lambda x: (len(x[1])), reverse=True
-                )
-                pair_Intent_Modus_A2_A3 = sorted(
-                    pair_Intent_Modus_A2_A3, key=lambda x: (len(x[1])), reverse=True
-                )
-
-                if list_pair_Intent_Modus_A2_A3 == []:
-                    for item in pair_Intent_Modus_A2_A3:
-                        if (
-                            list_pair_Intent_Modus_A2_A3 == []
-                            and set(U2).issubset(set(item[0]))
-                            and set(U3).issubset(set(item[1]))
-                        ):
-                            list_pair_Intent_Modus_A2_A3.append(item)
-                        else:
-                            if list_pair_Intent_Modus_A2_A3 != []:
-                                size_item_A = len(list_pair_Intent_Modus_A2_A3[0][1])
-                                if (
-                                    size_item_A == len(item[1])
-                                    and set(U2).issubset(set(item[0]))
-                                    and set(U3).issubset(set(item[1]))
-                                ):
-                                    list_pair_Intent_Modus_A2_A3.append(item)
-                                elif size_item_A > len(item[1]):
-                                    break
-                if list_pair_Intent_Modus_B2_B3 == []:
-                    for item in pair_Intent_Modus_B2_B3:
-                        if (
-                            list_pair_Intent_Modus_B2_B3 == []
-                            and set(U2).issubset(set(item[0]))
-                            and set(U3).issubset(set(item[1]))
-                        ):
-                            list_pair_Intent_Modus_B2_B3.append(item)
-                        else:
-                            if list_pair_Intent_Modus_B2_B3 != []:
-                                size_item_B = len(list_pair_Intent_Modus_B2_B3[0][1])
-                                if (
-                                    size_item_B == len(item[1])
-                                    and set(U2).issubset(set(item[0]))
-                                    and set(U3).issubset(set(item[1]))
-                                ):
-                                    list_pair_Intent_Modus_B2_B3.append(item)
-                                elif size_item_B > len(item[1]):
-                                    break
-
-                for pair_Intent_Modus_A2_A3 in list_pair_Intent_Modus_A2_A3:
-
-                    target_intent_A2, target_modus_A3 = pair_Intent_Modus_A2_A3
-                    target_intent_A2 = cast_to_list(target_intent_A2)
-                    target_modus_A3 = cast_to_list(target_modus_A3)
-
-                    for pair_Intent_Modus_B2_B3 in list_pair_Intent_Modus_B2_B3:
-                        source_intent_B2, source_modus_B3 = pair_Intent_Modus_B2_B3
-
-                        source_intent_B2 = cast_to_list(source_intent_B2)
-                        source_modus_B3 = cast_to_list(source_modus_B3)
-
-                        if (
-                            set(target_modus_A3).issubset(set(source_modus_B3))
-                            and set(source_intent_B2).issubset(set(target_intent_A2))
-                        ) and (
-                            set(U3).issubset(set(source_modus_B3))
-                            and set(U2).issubset(set(source_intent_B2))
-                        ):
-
-                            support = len(source_B1) / _max_cardinality
-                            confidence = len(source_B1) / len(target_A1)
-                            try:
-                                lift = support / (
-                                    (len(source_B1) / _max_cardinality)
-                                    * (len(target_A1) / _max_cardinality)
-                                )
-                            except ZeroDivisionError:
-                                lift = 0
-
-                            if (
-                                support >= minimum_support_rules
-                                and confidence >= minimum_confidence_rules
-                            ):
-                                if (
-                                    set(source_modus_B3) - set(target_modus_A3)
-                                    != EMPTY_SET
-                                ):
-
-                                    rule = AssociationRule(
-                                        antecedent=list(U3),
-                                        consequent=list(
-                                            set(
-                                                set(source_modus_B3)
-                                                - set(target_modus_A3)
-                                            )
-                                        ),
-                                        condition=list(U2),
-                                        support=round(support, 3),
-                                        confidence=round(confidence, 3),
-                                        lift=round(lift, 3),
-                                        current_concept_extent=source_concept,
-                                        successor_concept_extent=target_concept,
-                                    )
-                                    if rule not in rules_BACAR:
-                                        rules_BACAR.append(rule)
-
-        return rules_BACAR
+        return AssociationRule.compute_rules(
+            triadic_concepts,
+            minimum_support_rules,
+            minimum_confidence_rules,
+            links,
+            families=("BACAR",),
+        )["BACAR"]
 
     def compute_extensional_implications(triadic_concepts, minimum_confidence_rules):
         """Takes the triadic_concepts and minimum_confidence_rules
@@ -555,54 +707,66 @@ class AssociationRule:
             extensional_implications (list): list of AssociationRule objects
             representing the Extensional Implications
         """
-        extensional_implications = []
+        extensional_implications = set()
+        objects = triadic_concepts.symbols.objects
 
         for concept in triadic_concepts:
-            generators = triadic_concepts[
-                triadic_concepts.index(concept.extent)
-            ].extensional_generator_minimal
+            # A generator is a set of objects or a single object (a name),
+            # and every generator gives its rule, so the rules do not
+            # depend on the iteration order of the set of generators
+            generators = concept.extensional_generator_minimal
             if generators != []:
-                gen = next(iter(generators))
-
-                if isinstance(gen, str):
+                extent = AssociationRule.get_ids(concept.extent_bits)
+                for gen in generators:
+                    gen_bits = objects.encode(gen)
                     rule = AssociationRule(
-                        antecedent=set(gen),
-                        consequent=set(concept.extent) - set(gen),
-                        current_concept_extent=concept.extent,
+                        antecedent=AssociationRule.get_ids(gen_bits),
+                        consequent=AssociationRule.get_ids(
+                            concept.extent_bits & ~gen_bits
+                        ),
+                        current_concept_extent=extent,
                         confidence=1.0,
                     )
-                    if (
-                        (rule not in extensional_implications)
-                        and (rule.consequent != EMPTY_SET)
-                        and (rule.confidence >= minimum_confidence_rules)
+                    if (rule.consequent != ()) and (
+                        rule.confidence >= minimum_confidence_rules
                     ):
-                        extensional_implications.append(rule)
-                else:
-                    for gen in generators:
-                        rule = AssociationRule(
-                            antecedent=set(gen),
-                            consequent=set(concept.extent) - set(gen),
-                            current_concept_extent=concept.extent,
-                            confidence=1.0,
-                        )
-                        if (
-                            (rule not in extensional_implications)
-                            and (rule.consequent != EMPTY_SET)
-                            and (rule.confidence >= minimum_confidence_rules)
-                        ):
-                            extensional_implications.append(rule)
-
-        temp_extensional_implications = extensional_implications.copy()
-        rules_to_remove = []
-        for rule1 in extensional_implications:
-            for rule2 in reversed(temp_extensional_implications):
-                if rule1 != rule2:
-                    if set(rule2.antecedent).issubset(set(rule1.antecedent)) and set(
-                        rule2.consequent
-                    ).issubset(set(rule1.consequent)):
-                        rules_to_remove.append(rule2)
-        for rule in rules_to_remove:
-            if rule in extensional_implications:
-                extensional_implications.remove(rule)
-
-        return extensional_implications
+                        extensional_implications.add(rule)
+
+        return sorted(AssociationRule.get_maximal_rules(extensional_implications))
+
+    def get_maximal_rules(rules):
+        """Takes rules and keeps only the ones that are not dominated, i.e.
+        that no other rule has both a superset of their antecedent and a
+        superset of their consequent.
+
+        The antecedent and consequent of each rule are packed in a single
+        bitmask, so a rule is dominated when its bitmask is a subset of the
+        bitmask of another rule. The rules are visited from the largest to
+        the smallest bitmask and a rule is kept when none of the kept ones
+        (which are the only candidates to dominate it) is a superset, which
+        is checked with the superset index of a RuleStore.
+
+        Args:
+            rules (iterable): AssociationRule objects
+
+        Returns:
+            list: AssociationRule objects that are not dominated
+        """
+
+        rules = set(rules)
+        shift = 1 + max((x for rule in rules for x in rule.antecedent), default=-1)
+        rule_bits = {}
+        for rule in rules:
+            bits = 0
+            for x in rule.antecedent:
+                bits |= 1 << x
+            for x in rule.consequent:
+                bits |= 1 << (x + shift)
+            rule_bits[rule] = bits
+
+        maximal_rules = RuleStore()
+        for rule in sorted(
+            rules, key=lambda rule: rule_bits[rule].bit_count(), reverse=True
+        ):
+            maximal_rules.add(rule, 0, 0, rule_bits[rule])
+        return maximal_rules.rules
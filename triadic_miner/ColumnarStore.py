@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import numpy as np
+
+from triadic_miner.AssociationRules import AssociationRule
+from triadic_miner.SymbolTable import SymbolTable
+from triadic_miner.TriadicConcept import TriadicConcept
+
+DIMENSIONS = ("objects", "attributes", "conditions")
+SCORES = {
+    "stability": ("concept_stability", ("value", "low", "high")),
+    "separation": ("separation_index", ("value",)),
+}
+
+
+class ColumnarStore:
+    """Class that keeps the outputs of the pipeline (concepts, links,
+    generators, scores and rules) as columns of interned IDs, and saves them
+    in a single NumPy .npz file with the names of the objects, attributes and
+    conditions as the shared dictionary of the IDs.
+
+    Every column of sets of IDs is stored in a CSR layout: the IDs of all the
+    rows concatenated ('<table>_<column>_ids') and the offsets of each row
+    ('<table>_<column>_offsets'), so row i is ids[offsets[i]:offsets[i + 1]].
+    The concepts are referred to by their concept ID, the position of the
+    concept in the ConceptStore. The tables are:
+        - concept: extent of each concept
+        - feature, generator, stability and separation: the (intent, modus)
+        pairs of each concept, with their scores ('_value', '_low', '_high',
+        NaN when missing) and the offsets of the rows of each concept
+        ('<table>_concept_offsets')
+        - extensional_generator: the extensional generators of each concept
+        - link: target and source concept IDs
+        - one table per rule family (BCAI, BACI, BCAAR, BACAR, extensional):
+        antecedent, consequent and condition IDs, support, confidence, lift,
+        and the current and successor concept IDs (-1 when there is none)
+    """
+
+    def __init__(self, arrays=None, triadic_concepts=None):
+        self.arrays = {} if arrays is None else arrays
+        self.extent_bits_index = {}
+        if triadic_concepts is not None:
+            self.extent_bits_index = triadic_concepts.extent_bits_index
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    def pack(rows):
+        """Takes rows of IDs and returns their CSR layout.
+
+        Args:
+            rows (iterable): iterables of IDs
+
+        Returns:
+            tuple: the offsets of each row and the concatenated IDs
+        """
+
+        offsets = [0]
+        ids = []
+        for row in rows:
+            ids.extend(row)
+            offsets.append(len(ids))
+        return np.array(offsets, dtype=np.int64), np.array(ids, dtype=np.int32)
+
+    def add_column(self, table, column, rows):
+        offsets, ids = ColumnarStore.pack(rows)
+        self.arrays[f"{table}_{column}_offsets"] = offsets
+        self.arrays[f"{table}_{column}_ids"] = ids
+
+    def get_row(self, table, column, row):
+        """Takes a table, a column of sets of IDs and a row, and returns the
+        IDs of the row.
+
+        Returns:
+            tuple: sorted IDs of the row
+        """
+
+        offsets = self.arrays[f"{table}_{column}_offsets"]
+        ids = self.arrays[f"{table}_{column}_ids"]
+        return tuple(ids[offsets[row] : offsets[row + 1]].tolist())
+
+    def decode(self, ids, dimension):
+        """Takes IDs and the name of their dimension ('objects', 'attributes'
+        or 'conditions') and returns the sorted names.
+
+        Returns:
+            list: sorted names of the elements
+        """
+
+        names = self.arrays[dimension]
+        return sorted(str(names[x]) for x in ids)
+
+    def add_symbols(self, symbols):
+        for dimension in DIMENSIONS:
+            self.arrays[dimension] = np.array(
+                getattr(symbols, dimension).names, dtype=str
+            )
+
+    def add_triadic_concepts(self, triadic_concepts):
+        """Takes the triadic_concepts and stores their extents, (intent,
+        modus) pairs, Feature Generators, extensional generators, stability
+        and separation index.
+
+        Args:
+            triadic_concepts (ConceptStore): the TriadicConcept objects
+        """
+
+        symbols = triadic_concepts.symbols
+        self.add_symbols(symbols)
+        self.extent_bits_index = triadic_concepts.extent_bits_index
+        get_ids = AssociationRule.get_ids
+
+        self.add_column(
+            "concept",
+            "extent",
+            (get_ids(concept.extent_bits) for concept in triadic_concepts),
+        )
+        self.add_pairs(
+            "feature",
+            (
+                zip(concept.intent_bits, concept.modus_bits)
+                for concept in triadic_concepts
+            ),
+        )
+        self.add_pairs(
+            "generator",
+            (
+                [
+                    (
+                        symbols.attributes.encode(generator[0]),
+                        symbols.conditions.encode(generator[1]),
+                    )
+                    for generator in concept.feature_generator_minimal
+                ]
+                for concept in triadic_concepts
+            ),
+        )
+        for table, (field_name, values) in SCORES.items():
+            self.add_pairs(
+                table,
+                (
+                    [
+                        (
+                            symbols.attributes.encode(score[0]),
+                            symbols.conditions.encode(score[1]),
+                            *score[2:],
+                        )
+                        for score in getattr(concept, field_name)
+                    ]
+                    for concept in triadic_concepts
+                ),
+                values,
+            )
+
+        concept_offsets = [0]
+        generators = []
+        for concept in triadic_concepts:
+            for generator in concept.extensional_generator_minimal:
+                generators.append(get_ids(symbols.objects.encode(generator)))
+            concept_offsets.append(len(generators))
+        self.arrays["extensional_generator_concept_offsets"] = np.array(
+            concept_offsets, dtype=np.int64
+        )
+        self.add_column("extensional_generator", "extent", generators)
+
+    def add_pairs(self, table, concepts_rows, values=()):
+        """Takes a table and, for each concept, its rows (intent bitmask,
+        modus bitmask, *values), and stores them with the offsets of the
+        rows of each concept.
+
+        Args:
+            table (str): name of the table
+            concepts_rows (iterable): rows of each concept
+            values (tuple): names of the value columns
+        """
+
+        concept_offsets = [0]
+        rows = []
+        for concept_rows in concepts_rows:
+            rows.extend(concept_rows)
+            concept_offsets.append(len(rows))
+        self.arrays[f"{table}_concept_offsets"] = np.array(
+            concept_offsets, dtype=np.int64
+        )
+        get_ids = AssociationRule.get_ids
+        self.add_column(table, "intent", (get_ids(row[0]) for row in rows))
+        self.add_column(table, "modus", (get_ids(row[1]) for row in rows))
+        for index, value in enumerate(values, 2):
+            self.arrays[f"{table}_{value}"] = np.array(
+                [row[index] if len(row) > index else np.nan for row in rows],
+                dtype=float,
+            )
+
+    def add_links(self, links):
+        """Takes the links and stores the concept IDs of their targets and
+        sources.
+        """
+
+        self.arrays["link_target"] = links.targets
+        self.arrays["link_source"] = links.sources
+
+    def get_concept_id(self, extent):
+        if extent is None:
+            return -1
+        return self.extent_bits_index[sum(1 << x for x in extent)]
+
+    def add_rules(self, family, rules):
+        """Takes a rule family and its rules, and stores them. The extents
+        of the rules are stored as the IDs of their concepts, so the store
+        must be created with the triadic_concepts (or add_triadic_concepts
+        called first).
+
+        Args:
+            family (str): name of the rule family
+            rules (list): list of AssociationRule objects
+        """
+
+        self.add_column(family, "antecedent", (rule.antecedent for rule in rules))
+        self.add_column(family, "consequent", (rule.consequent for rule in rules))
+        self.add_column(family, "condition", (rule.condition for rule in rules))
+        for metric in ("support", "confidence", "lift"):
+            self.arrays[f"{family}_{metric}"] = np.array(
+                [getattr(rule, metric) for rule in rules], dtype=float
+            )
+        self.arrays[f"{family}_current_concept"] = np.array(
+            [self.get_concept_id(rule.current_concept_extent) for rule in rules],
+            dtype=np.int32,
+        )
+        self.arrays[f"{family}_successor_concept"] = np.array(
+            [self.get_concept_id(rule.successor_concept_extent) for rule in rules],
+            dtype=np.int32,
+        )
+
+    def get_rules(self, family):
+        """Takes a rule family and returns its stored rules.
+
+        Args:
+            family (str): name of the rule family
+
+        Returns:
+            list: list of AssociationRule objects
+        """
+
+        def get_extent(concept_id):
+            if concept_id < 0:
+                return None
+            return self.get_row("concept", "extent", concept_id)
+
+        rules = []
+        for row in range(len(self.arrays[f"{family}_support"])):
+            rules.append(
+                AssociationRule(
+                    antecedent=self.get_row(family, "antecedent", row),
+                    consequent=self.get_row(family, "consequent", row),
+                    condition=self.get_row(family, "condition", row),
+                    support=float(self.arrays[f"{family}_support"][row]),
+                    confidence=float(self.arrays[f"{family}_confidence"][row]),
+                    lift=float(self.arrays[f"{family}_lift"][row]),
+                    current_concept_extent=get_extent(
+                        int(self.arrays[f"{family}_current_concept"][row])
+                    ),
+                    successor_concept_extent=get_extent(
+                        int(self.arrays[f"{family}_successor_concept"][row])
+                    ),
+                )
+            )
+        return rules
+
+    def get_triadic_concepts(self):
+        """Returns the stored concepts, with the same concept IDs, symbol
+        table and bitmasks as the ConceptStore they were taken from, and
+        their Feature Generators as [intent, modus] lists of sorted names.
+        The scores and the extensional generators are not restored.
+
+        Returns:
+            ConceptStore: the TriadicConcept objects
+        """
+
+        symbols = SymbolTable()
+        for dimension in DIMENSIONS:
+            getattr(symbols, dimension).intern_all(self.arrays[dimension].tolist())
+
+        def get_pairs(table, concept_id):
+            offsets = self.arrays[f"{table}_concept_offsets"]
+            return [
+                [
+                    self.decode(self.get_row(table, "intent", row), "attributes"),
+                    self.decode(self.get_row(table, "modus", row), "conditions"),
+                ]
+                for row in range(offsets[concept_id], offsets[concept_id + 1])
+            ]
+
+        # The concepts are stored sorted by extent size, so grouping their
+        # rows again keeps their order, and the symbols already hold every
+        # name, so the IDs do not change
+        size = len(self.arrays["concept_extent_offsets"]) - 1
+        rows = (
+            (
+                frozenset(
+                    self.decode(
+                        self.get_row("concept", "extent", concept_id), "objects"
+                    )
+                ),
+                set(intent),
+                set(modus),
+            )
+            for concept_id in range(size)
+            for intent, modus in get_pairs("feature", concept_id)
+        )
+        triadic_concepts = TriadicConcept.group_triadic_concepts(rows, symbols)
+        for concept in triadic_concepts:
+            concept.feature_generator_minimal = get_pairs(
+                "generator", concept.concept_id
+            )
+        return triadic_concepts
+
+    def get_links(self):
+        """Returns the stored links.
+
+        Returns:
+            list: (target concept ID, source concept ID) of each link
+        """
+
+        return list(
+            zip(
+                self.arrays["link_target"].tolist(), self.arrays["link_source"].tolist()
+            )
+        )
+
+    def save(self, file_path):
+        np.savez(file_path, **self.arrays)
+
+    def save_rules(file_path, triadic_concepts, rules):
+        """Takes the triadic_concepts and the rules of each family, and saves
+        them in a .npz file that can be read on its own, as the rules of a
+        point of a sweep.
+
+        Args:
+            file_path (str): path to the .npz file
+            triadic_concepts (ConceptStore): the TriadicConcept objects
+            rules (dict): list of AssociationRule objects of each family
+        """
+
+        columnar_store = ColumnarStore()
+        columnar_store.add_triadic_concepts(triadic_concepts)
+        for family, family_rules in rules.items():
+            columnar_store.add_rules(family, family_rules)
+        columnar_store.save(file_path)
+
+    def load(file_path):
+        """Takes the path of a .npz file saved by a ColumnarStore and loads
+        all of its columns.
+
+        Args:
+            file_path (str): path to the .npz file
+
+        Returns:
+            ColumnarStore: the loaded store
+        """
+
+        with np.load(file_path, allow_pickle=False) as columns:
+            return ColumnarStore({name: columns[name] for name in columns.files})
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.SymbolTable import SymbolTable
+from triadic_miner.TriadicConcept import TriadicConcept
+
+
+class ConceptMiner:
+    """Class that mines the Triadic Concepts (closed triclusters) of a
+    ternary relation, so the pipeline can start from the raw triples
+    (the '.data' files) instead of the output of Data Peeler.
+
+    The smallest dimension of the relation is enumerated first: for each
+    of its closed sets D, the dyadic context K_D (pairs of the two other
+    dimensions that hold for every element of D) is built as bitsets, its
+    dyadic concepts are enumerated with Close-by-One, and every dyadic
+    concept for which D is maximal is a Triadic Concept.
+    """
+
+    def read_triples(file_path, symbols):
+        """Reads a file with one triple per line ('object attribute
+        condition'), where each dimension may hold a comma separated list of
+        elements (the cartesian product of the lists is added to the
+        relation).
+
+        Args:
+            file_path (string): path to the input file
+            symbols (SymbolTable): table where the elements are interned
+
+        Returns:
+            triples (set): set of (object ID, attribute ID, condition ID)
+        """
+
+        triples = set()
+        with open(file_path, "r") as reader:
+            for row in reader:
+                line = row.split()
+                if line == []:
+                    continue
+                objects = [symbols.objects.intern(x) for x in line[0].split(",")]
+                attributes = [symbols.attributes.intern(x) for x in line[1].split(",")]
+                conditions = [symbols.conditions.intern(x) for x in line[2].split(",")]
+                for g in objects:
+                    for m in attributes:
+                        for b in conditions:
+                            triples.add((g, m, b))
+        return triples
+
+    def mine_triadic_concepts(triples, dimension_sizes):
+        """Takes the triples of a ternary relation and yields all its
+        Triadic Concepts, including the ones with an empty dimension.
+
+        Args:
+            triples (set): set of (object ID, attribute ID, condition ID)
+            dimension_sizes (list): number of objects, attributes and
+            conditions
+
+        Yields:
+            tuple: bitmasks (extent, intent, modus) of a Triadic Concept
+        """
+
+        # The smallest dimension (D) is enumerated first, the middle one (Z)
+        # is enumerated with Close-by-One and the largest one (X) is kept as
+        # the bitmasks of the dyadic extents
+        outer, inner, largest = sorted(range(3), key=lambda x: dimension_sizes[x])
+        n_D, n_Z, n_X = (dimension_sizes[x] for x in (outer, inner, largest))
+        if n_D == 0 or n_Z == 0 or n_X == 0:
+            return
+
+        full_X = (1 << n_X) - 1
+        full_Z = (1 << n_Z) - 1
+        columns = [[0] * n_Z for _ in range(n_D)]
+        for triple in triples:
+            columns[triple[outer]][triple[inner]] |= 1 << triple[largest]
+
+        def closure_D(columns_D):
+            D = 0
+            for b in range(n_D):
+                columns_b = columns[b]
+                for z in range(n_Z):
+                    if columns_D[z] & ~columns_b[z]:
+                        break
+                else:
+                    D |= 1 << b
+            return D
+
+        def closed_sets_D():
+            columns_D = [full_X] * n_Z
+            stack = [(columns_D, closure_D(columns_D), 0)]
+            while stack:
+                columns_D, D, start = stack.pop()
+                yield D, columns_D
+                for j in range(start, n_D):
+                    if D >> j & 1:
+                        continue
+                    new_columns_D = [x & y for x, y in zip(columns_D, columns[j])]
+                    new_D = closure_D(new_columns_D)
+                    if (new_D ^ D) & ((1 << j) - 1) == 0:
+                        stack.append((new_columns_D, new_D, j + 1))
+
+        def maximal_D(extent, intent):
+            D = 0
+            for b in range(n_D):
+                columns_b = columns[b]
+                for z in SymbolTable.iter_bits(intent):
+                    if extent & ~columns_b[z]:
+                        break
+                else:
+                    D |= 1 << b
+            return D
+
+        def to_dimensions(X, Z, D):
+            concept = [0, 0, 0]
+            concept[largest], concept[inner], concept[outer] = X, Z, D
+            return tuple(concept)
+
+        for D, columns_D in closed_sets_D():
+            rows_D = [0] * n_X
+            for z in range(n_Z):
+                for x in SymbolTable.iter_bits(columns_D[z]):
+                    rows_D[x] |= 1 << z
+
+            def closure_Z(extent):
+                intent = full_Z
+                for x in SymbolTable.iter_bits(extent):
+                    intent &= rows_D[x]
+                    if intent == 0:
+                        break
+                return intent
+
+            stack = [(full_X, closure_Z(full_X), 0)]
+            while stack:
+                extent, intent, start = stack.pop()
+                if maximal_D(extent, intent) == D:
+                    yield to_dimensions(extent, intent, D)
+                for j in range(start, n_Z):
+                    if intent >> j & 1:
+                        continue
+                    new_extent = extent & columns_D[j]
+                    if new_extent == 0:
+                        continue
+                    new_intent = closure_Z(new_extent)
+                    if (new_intent ^ intent) & ((1 << j) - 1) == 0:
+                        stack.append((new_extent, new_intent, j + 1))
+
+            # The dyadic concept with an empty extent is not reached by the
+            # enumeration above, it exists when no element of X has all Z
+            bottom = full_X
+            for z in range(n_Z):
+                bottom &= columns_D[z]
+            if bottom == 0 and maximal_D(0, full_Z) == D:
+                yield to_dimensions(0, full_Z, D)
+
+    def get_triadic_concepts_from_data_file(file_path):
+        """Reads the triples of a '.data' file, mines its Triadic Concepts
+        and transforms them in objects of the class TriadicConcept, in the
+        same way as the output of Data Peeler is read (empty intents and
+        modi are represented by 'ø').
+
+        Args:
+            file_path (string): path to the input file
+
+        Returns:
+            ConceptStore: returns the TriadicConcept objects indexed by
+            extent and by concept ID
+        """
+
+        symbols = SymbolTable()
+        triples = ConceptMiner.read_triples(file_path, symbols)
+        dimension_sizes = [
+            len(symbols.objects),
+            len(symbols.attributes),
+            len(symbols.conditions),
+        ]
+
+        def decode(bits, dimension):
+            names = dimension.decode(bits)
+            if names == set():
+                return {"ø"}
+            return names
+
+        rows = (
+            (
+                frozenset(symbols.objects.decode(extent)),
+                decode(intent, symbols.attributes),
+                decode(modus, symbols.conditions),
+            )
+            for extent, intent, modus in ConceptMiner.mine_triadic_concepts(
+                triples, dimension_sizes
+            )
+        )
+
+        return TriadicConcept.group_triadic_concepts(rows, symbols)
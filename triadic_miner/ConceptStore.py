@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from collections.abc import Sequence
+
+
+class ConceptStore(Sequence):
+    """Class that stores the triadic concepts of a dataset and indexes them
+    by extent and by concept ID.
+
+    The concept ID is the position of the concept in the store, so it is
+    stable for the whole execution of the pipeline. The store behaves like
+    the list of TriadicConcept objects used before (indexing, slicing,
+    iteration and 'index(extent)'), but every lookup by extent is a dict
+    lookup instead of a linear scan. It also keeps the SymbolTable used to
+    encode the extents, intents and modi as bitmasks.
+    """
+
+    def __init__(self, triadic_concepts, symbols=None):
+        self.triadic_concepts = list(triadic_concepts)
+        self.symbols = symbols
+        self.extent_index = {}
+        self.extent_bits_index = {}
+        for concept_id, concept in enumerate(self.triadic_concepts):
+            concept.concept_id = concept_id
+            self.extent_index[frozenset(concept.extent)] = concept_id
+            self.extent_bits_index[concept.extent_bits] = concept_id
+
+    def __getitem__(self, key):
+        return self.triadic_concepts[key]
+
+    def __len__(self):
+        return len(self.triadic_concepts)
+
+    def __iter__(self):
+        return iter(self.triadic_concepts)
+
+    def __contains__(self, extent):
+        return frozenset(extent) in self.extent_index
+
+    def index(self, extent, start=0, stop=None):
+        """Takes an extent and returns the ID of the concept that has it.
+
+        Args:
+            extent (set): the extent of a TriadicConcept
+            start (int): first concept ID searched, as in list.index
+            stop (int): concept ID where the search stops, as in list.index
+
+        Raises:
+            ValueError: if no concept in [start, stop) has this extent (same
+            behavior as list.index)
+
+        Returns:
+            int: the concept ID
+        """
+
+        concept_id = self.extent_index.get(frozenset(extent))
+        if concept_id is not None and concept_id in range(len(self))[start:stop]:
+            return concept_id
+        raise ValueError(f"{extent} is not in the ConceptStore")
+
+    def get(self, extent):
+        """Takes an extent and returns the TriadicConcept that has it.
+
+        Args:
+            extent (set): the extent of a TriadicConcept
+
+        Returns:
+            TriadicConcept: the concept associated with the extent
+        """
+
+        return self.triadic_concepts[self.index(extent)]
+
+    def get_by_id(self, concept_id):
+        """Takes a concept ID and returns the associated TriadicConcept.
+
+        Args:
+            concept_id (int): the ID of a TriadicConcept
+
+        Returns:
+            TriadicConcept: the concept associated with the ID
+        """
+
+        return self.triadic_concepts[concept_id]
+
+    def snapshot(self, fields=()):
+        """Returns a compact copy of the store, to be sent to worker
+        processes: each concept only keeps its extent, intent, modus, the
+        bitmask of its extent and the given fields. The concept IDs are the
+        same as in this store.
+
+        Args:
+            fields (iterable): names of the extra TriadicConcept fields to
+            be copied
+
+        Returns:
+            ConceptStore: the compact copy of the store
+        """
+
+        triadic_concepts = []
+        for concept in self.triadic_concepts:
+            concept_copy = type(concept)(
+                concept.extent,
+                concept.intent,
+                concept.modus,
+                concept.extent_size,
+                extent_bits=concept.extent_bits,
+            )
+            for field_name in fields:
+                setattr(concept_copy, field_name, getattr(concept, field_name))
+            triadic_concepts.append(concept_copy)
+        return ConceptStore(triadic_concepts)
+
+    def extents(self):
+        """Returns the set of all unique extents stored
+
+        Returns:
+            set: set of frozensets, one per Triadic Concept
+        """
+
+        return set(self.extent_index)
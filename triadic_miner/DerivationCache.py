@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import threading
+from collections import OrderedDict
+
+from triadic_miner.SymbolTable import SymbolTable
+
+
+MAX_SIZE = 100000  # Default amount of derivations kept in the cache
+
+
+class DerivationCache:
+    """Class that memoizes the derivation operators of a FormalContext.
+
+    The extension and intension are cached by the frozenset of their
+    arguments, so the same set of properties (or objects) is only derived
+    once, in whatever order it is given. Both derivations are kept in a
+    single OrderedDict, keyed by the name of the derivation and the
+    arguments, in the order they were last used: the cache keeps at most
+    max_size derivations and evicts the least recently used one, whether it
+    is an extension or an intension. The number of hits, misses and
+    evictions is kept to be saved in the report.
+
+    Every other attribute (properties, property_index, objects, ...) is read
+    from the FormalContext, so the cache can be used in place of it.
+
+    NOTE: with the 'processes' backend of the Executor each worker process
+    has its own copy of the cache, and its counters are not sent back, so
+    the report marks them as not available.
+    """
+
+    def __init__(self, formal_context, max_size=MAX_SIZE):
+        if max_size < 0:
+            raise ValueError("max_size must be a non negative integer")
+        self.formal_context = formal_context
+        self.max_size = max_size
+        self.derivations = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name == "formal_context":
+            raise AttributeError(name)
+        return getattr(self.formal_context, name)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def get_derivation(self, name, arguments, derivation):
+        """Takes the name of a derivation, the frozenset of its arguments and
+        the derivation operator, and returns the cached result, computing
+        and storing it if needed.
+
+        Args:
+            name (str): 'extension' or 'intension'
+            arguments (frozenset): the arguments of the derivation
+            derivation (function): the derivation operator of the
+            FormalContext
+
+        Returns:
+            int: bitmask returned by the derivation operator
+        """
+
+        key = (name, arguments)
+        with self.lock:
+            bits = self.derivations.get(key)
+            if bits is not None:
+                self.derivations.move_to_end(key)
+                self.hits += 1
+                return bits
+            self.misses += 1
+
+        bits = derivation(arguments)
+        if self.max_size == 0:
+            return bits
+
+        with self.lock:
+            self.derivations[key] = bits
+            if len(self.derivations) > self.max_size:
+                self.derivations.popitem(last=False)
+                self.evictions += 1
+        return bits
+
+    def extension_bits(self, properties):
+        return self.get_derivation(
+            "extension", frozenset(properties), self.formal_context.extension_bits
+        )
+
+    def intension_bits(self, objects):
+        return self.get_derivation(
+            "intension", frozenset(objects), self.formal_context.intension_bits
+        )
+
+    def extension(self, properties):
+        """Takes property names and returns the names of the objects that
+        have all of them.
+
+        Args:
+            properties (iterable): names of the properties
+
+        Returns:
+            list: names of the objects
+        """
+
+        return [
+            self.formal_context.objects[x]
+            for x in SymbolTable.iter_bits(self.extension_bits(properties))
+        ]
+
+    def intension(self, objects):
+        """Takes object names and returns the names of the properties shared
+        by all of them.
+
+        Args:
+            objects (iterable): names of the objects
+
+        Returns:
+            list: names of the properties
+        """
+
+        return [
+            self.formal_context.properties[x]
+            for x in SymbolTable.iter_bits(self.intension_bits(objects))
+        ]
+
+    def get_statistics(self):
+        """Returns the counters of the cache.
+
+        Returns:
+            dict: hits, misses, evictions, size and max_size of the cache
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.derivations),
+            "max_size": self.max_size,
+        }
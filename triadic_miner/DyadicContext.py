@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import numpy as np
+
+
+class DyadicContext:
+    """Class that represents the dyadic context K1 x K2 (attributes x
+    conditions) of a Triadic Concept as a boolean NumPy matrix, with integer
+    indexes for its rows (attributes) and columns (conditions).
+
+    The rows and columns keep the order used by the previous pandas
+    Dataframe, so the Feature Generators are produced in the same order.
+    """
+
+    def __init__(self, intent, modus):
+        """Takes the intent and the modus associated with a Triadic Concept
+        and creates the context annotated with their incidences.
+
+        Args:
+            intent (list): list of intents associated with a Triadic Concept
+            modus (list): list of modus associated with a Triadic Concept
+        """
+
+        if len(intent) < 2:
+            self.rows = [list(x) for x in intent][0] if intent else []
+            self.columns = [list(x) for x in modus][0] if modus else []
+        else:
+            self.rows = list(set([y for x in intent for y in x]))
+            self.columns = list(set([y for x in modus for y in x]))
+        self.row_index = {x: i for i, x in enumerate(self.rows)}
+        self.column_index = {x: i for i, x in enumerate(self.columns)}
+        self.incidences = self.get_mask(intent, modus)
+
+    def get_mask(self, intent, modus):
+        """Takes pairs of intent and modus and returns the boolean matrix
+        with their incidences, restricted to the rows and columns of this
+        context.
+
+        Args:
+            intent (list): list of intents associated with a Triadic Concept
+            modus (list): list of modus associated with a Triadic Concept
+
+        Returns:
+            mask (numpy array): boolean matrix with the same shape as the
+            context
+        """
+
+        mask = np.zeros((len(self.rows), len(self.columns)), dtype=bool)
+        for intent_item, modus_item in zip(intent, modus):
+            rows = [self.row_index[x] for x in intent_item if x in self.row_index]
+            columns = [
+                self.column_index[y] for y in modus_item if y in self.column_index
+            ]
+            if rows and columns:
+                mask[np.ix_(rows, columns)] = True
+        return mask
+
+    def remove_face(self, target_intent, target_modus):
+        """Takes the intent and modus part of a Triadic Concept that is a
+        successor, and removes its incidences (the shared features) from the
+        context in one operation.
+
+        Args:
+            target_intent (list): list of intents associated with a
+            Triadic Concept
+            target_modus (list): list of modus associated with a
+            Triadic Concept
+        """
+
+        self.incidences &= ~self.get_mask(target_intent, target_modus)
+
+    def get_incidences(self):
+        """Returns the incidences of the context, row by row.
+
+        Returns:
+            list: list of [attribute, condition] pairs
+        """
+
+        rows, columns = np.nonzero(self.incidences)
+        return [[self.rows[i], self.columns[j]] for i, j in zip(rows, columns)]
+
+    def get_row_incidences(self):
+        """Returns, for each row of the context, the columns where it has an
+        incidence.
+
+        Returns:
+            list: list of (attribute, list of conditions) tuples, one per row
+        """
+
+        return [
+            (
+                attribute,
+                [self.columns[j] for j in np.flatnonzero(self.incidences[i])],
+            )
+            for i, attribute in enumerate(self.rows)
+        ]
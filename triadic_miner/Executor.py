@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from itertools import repeat
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+
+BACKENDS = ("serial", "threads", "processes")
+WORKERS = 8  # Default amount of threads or processes
+CHUNK_SIZE = 1  # Default amount of tasks sent at once to a worker
+
+# Arguments shared by all the tasks of a process pool, set once per worker
+# process by 'Executor.initialize_worker'
+WORKER_STATE = {}
+
+
+class Executor:
+    """Class that runs the per-concept stages of the pipeline (Feature
+    Generators, their validation and the Concept Stability) with one of the
+    backends:
+
+    - 'serial': runs the tasks one after the other in the current process;
+    - 'threads': runs the tasks in a ThreadPool (the previous behavior);
+    - 'processes': runs the tasks in a process Pool. The arguments shared by
+      all the tasks are sent once to each worker process, when it starts,
+      instead of once per task.
+    """
+
+    def __init__(self, backend="threads", workers=WORKERS, chunk_size=CHUNK_SIZE):
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}', expected one of {', '.join(BACKENDS)}"
+            )
+        if workers < 1 or chunk_size < 1:
+            raise ValueError("workers and chunk_size must be positive integers")
+        self.backend = backend
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def share_concepts(self, triadic_concepts, fields=()):
+        """Takes the triadic_concepts that will be shared by all the tasks
+        and returns what should be passed to them: the ConceptStore itself
+        for the serial and threads backends, and a compact snapshot (only
+        extent, intent, modus and the given fields) for the processes
+        backend, since it has to be pickled.
+
+        Args:
+            triadic_concepts (ConceptStore): the Triadic Concepts
+            fields (iterable): names of the extra TriadicConcept fields read
+            by the tasks
+
+        Returns:
+            ConceptStore: the Triadic Concepts to be shared with the tasks
+        """
+
+        if self.backend == "processes":
+            return triadic_concepts.snapshot(fields)
+        return triadic_concepts
+
+    def map(self, function, items, *shared):
+        """Calls function(item, *shared) for every item and returns the
+        results in the same order as the items.
+
+        Args:
+            function (function): function executed by each task, it has to
+            be defined at module or class level for the processes backend
+            items (iterable): the first argument of each task
+            *shared: the remaining arguments, shared by all the tasks
+
+        Returns:
+            list: the results of the tasks
+        """
+
+        if self.backend == "serial":
+            return [function(item, *shared) for item in items]
+
+        if self.backend == "threads":
+            pool = ThreadPool(self.workers)
+            try:
+                return pool.starmap(
+                    function,
+                    zip(items, *[repeat(x) for x in shared]),
+                    chunksize=self.chunk_size,
+                )
+            finally:
+                pool.close()
+
+        with Pool(
+            self.workers,
+            initializer=Executor.initialize_worker,
+            initargs=(function, shared),
+        ) as pool:
+            return pool.map(Executor.run_task, items, chunksize=self.chunk_size)
+
+    def initialize_worker(function, shared):
+        """Stores the function and the shared arguments in the worker
+        process, so each task only carries its own item.
+
+        Args:
+            function (function): function executed by each task
+            shared (tuple): the arguments shared by all the tasks
+        """
+
+        WORKER_STATE["function"] = function
+        WORKER_STATE["shared"] = shared
+
+    def run_task(item):
+        """Runs one task in a worker process.
+
+        Args:
+            item: the first argument of the task
+
+        Returns:
+            the result of the task
+        """
+
+        return WORKER_STATE["function"](item, *WORKER_STATE["shared"])
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.SymbolTable import SymbolTable
+
+
+class FormalContext:
+    """Class that represents a (dyadic) Formal Context as bitsets: each row
+    is the bitmask of the properties of an object, and each column is the
+    bitmask of the objects that have a property.
+
+    The derivation operators are computed with bitwise ANDs: the extension
+    of a set of properties is the AND of their columns, and the intension
+    of a set of objects is the AND of their rows.
+    """
+
+    def __init__(self, objects, properties, rows):
+        """Takes the names of the objects and properties and the rows of
+        the incidence matrix.
+
+        Args:
+            objects (list): names of the objects
+            properties (list): names of the properties
+            rows (list): bitmask of the properties of each object, where
+            the bit i is set when the object has the property i
+        """
+
+        self.objects = list(objects)
+        self.properties = list(properties)
+        self.rows = list(rows)
+        self.object_index = {x: i for i, x in enumerate(self.objects)}
+        self.property_index = {x: i for i, x in enumerate(self.properties)}
+        self.columns = [0] * len(self.properties)
+        for object_id, row in enumerate(self.rows):
+            for property_id in SymbolTable.iter_bits(row):
+                self.columns[property_id] |= 1 << object_id
+        self.all_objects = (1 << len(self.objects)) - 1
+        self.all_properties = (1 << len(self.properties)) - 1
+
+    def from_incidences(incidences):
+        """Takes the incidences of a Formal Context and creates it. The
+        objects and properties are indexed in order of appearance.
+
+        Args:
+            incidences (iterable): pairs (object, property)
+
+        Returns:
+            FormalContext: the Formal Context with these incidences
+        """
+
+        rows = {}
+        property_index = {}
+        for _object, _property in incidences:
+            property_id = property_index.setdefault(_property, len(property_index))
+            rows[_object] = rows.get(_object, 0) | 1 << property_id
+        return FormalContext(rows.keys(), property_index.keys(), rows.values())
+
+    def extension_bits(self, properties):
+        """Takes property names and returns the bitmask of the objects that
+        have all of them.
+
+        Args:
+            properties (iterable): names of the properties
+
+        Raises:
+            KeyError: if a property is not in the Formal Context
+
+        Returns:
+            int: bitmask of the objects
+        """
+
+        bits = self.all_objects
+        for _property in properties:
+            bits &= self.columns[self.property_index[_property]]
+        return bits
+
+    def intension_bits(self, objects):
+        """Takes object names and returns the bitmask of the properties
+        shared by all of them.
+
+        Args:
+            objects (iterable): names of the objects
+
+        Raises:
+            KeyError: if an object is not in the Formal Context
+
+        Returns:
+            int: bitmask of the properties
+        """
+
+        bits = self.all_properties
+        for _object in objects:
+            bits &= self.rows[self.object_index[_object]]
+        return bits
+
+    def extension(self, properties):
+        """Takes property names and returns the names of the objects that
+        have all of them.
+
+        Args:
+            properties (iterable): names of the properties
+
+        Returns:
+            list: names of the objects
+        """
+
+        return [
+            self.objects[x]
+            for x in SymbolTable.iter_bits(self.extension_bits(properties))
+        ]
+
+    def intension(self, objects):
+        """Takes object names and returns the names of the properties shared
+        by all of them.
+
+        Args:
+            objects (iterable): names of the objects
+
+        Returns:
+            list: names of the properties
+        """
+
+        return [
+            self.properties[x]
+            for x in SymbolTable.iter_bits(self.intension_bits(objects))
+        ]
+
+    def is_concept(self, objects, properties):
+        """Checks whether the pair (objects, properties) is a Formal Concept
+        of the context, i.e. if each set is the derivation of the other.
+
+        Args:
+            objects (iterable): names of the objects
+            properties (iterable): names of the properties
+
+        Returns:
+            bool: True if the pair is a Formal Concept
+        """
+
+        objects = set(objects)
+        properties = set(properties)
+        if not objects.issubset(self.object_index) or not properties.issubset(
+            self.property_index
+        ):
+            return False
+        objects_bits = 0
+        for _object in objects:
+            objects_bits |= 1 << self.object_index[_object]
+        properties_bits = 0
+        for _property in properties:
+            properties_bits |= 1 << self.property_index[_property]
+        return (
+            self.intension_bits(objects) == properties_bits
+            and self.extension_bits(properties) == objects_bits
+        )
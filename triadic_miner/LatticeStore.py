@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+
+from triadic_miner.ColumnarStore import ColumnarStore, SCORES
+
+MAGIC = b"TRIADLAT"
+VERSION = 1
+ALIGNMENT = 64  # Bytes, every array starts at a multiple of it
+SECTIONS = ("generator", "extensional_generator") + tuple(SCORES)
+
+
+class LatticeStore:
+    """Class that saves the lattice of triadic concepts in a binary file that
+    is opened with mmap, so a later analysis session gets the concepts and
+    their covers back in milliseconds without parsing or recomputing them.
+
+    The file holds the arrays of a ColumnarStore (symbol tables and CSR
+    arrays of the extents, intents and modi, and the optional generator and
+    score sections), plus the upper and lower covers of each concept in a
+    CSR layout. It starts with a magic number, the length of a JSON header
+    with the dtype, shape and offset of each array, and the header itself;
+    the arrays follow, each one aligned to ALIGNMENT bytes. The loaded
+    arrays are read-only views of the mapped file.
+    """
+
+    def __init__(self, arrays, mapped_file=None):
+        self.arrays = arrays
+        self.mapped_file = mapped_file
+        self.extent_index = None
+
+    def __len__(self):
+        return len(self.arrays["concept_extent_offsets"]) - 1
+
+    def __getitem__(self, concept_id):
+        if not -len(self) <= concept_id < len(self):
+            raise IndexError("concept ID out of range")
+        return ConceptView(self, concept_id % len(self))
+
+    def __iter__(self):
+        return (ConceptView(self, concept_id) for concept_id in range(len(self)))
+
+    def save(file_path, triadic_concepts, links, sections=SECTIONS):
+        """Takes the triadic_concepts and the links computed by T-iPred and
+        saves them in a lattice file.
+
+        Args:
+            file_path (str): path to the lattice file
+            triadic_concepts (ConceptStore): the TriadicConcept objects
+            links (Links): the links between Triadic Concepts
+            sections (tuple): optional sections to be saved, among
+            'generator', 'extensional_generator', 'stability' and
+            'separation'
+        """
+
+        columnar_store = ColumnarStore(triadic_concepts=triadic_concepts)
+        columnar_store.add_triadic_concepts(triadic_concepts)
+        arrays = {
+            name: array
+            for name, array in columnar_store.arrays.items()
+            if not name.startswith(tuple(f"{section}_" for section in SECTIONS))
+            or name.startswith(tuple(f"{section}_" for section in sections))
+        }
+        # A link goes from a concept (source) to its upper cover (target)
+        arrays["upper_cover_offsets"] = links.successor_offsets
+        arrays["upper_cover_ids"] = links.successor_ids
+        arrays["lower_cover_offsets"] = links.predecessor_offsets
+        arrays["lower_cover_ids"] = links.predecessor_ids
+
+        offsets = {}
+        offset = 0
+        for name, array in arrays.items():
+            offsets[name] = offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            offset += array.nbytes
+        header = {
+            "version": VERSION,
+            "arrays": {
+                name: [array.dtype.str, list(array.shape), offsets[name]]
+                for name, array in arrays.items()
+            },
+        }
+        header = json.dumps(header).encode("utf-8")
+        start = len(MAGIC) + 8 + len(header)
+        start = -(-start // ALIGNMENT) * ALIGNMENT
+
+        temporary_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as writer:
+            writer.write(MAGIC)
+            writer.write(len(header).to_bytes(8, "little"))
+            writer.write(header)
+            for name, array in arrays.items():
+                writer.seek(start + offsets[name])
+                writer.write(np.ascontiguousarray(array).tobytes())
+        os.replace(temporary_path, file_path)
+
+    def load(file_path):
+        """Takes the path of a lattice file and maps it in memory.
+
+        Args:
+            file_path (str): path to the lattice file
+
+        Raises:
+            ValueError: if the file is not a lattice file of this version
+
+        Returns:
+            LatticeStore: the read-only lattice
+        """
+
+        with open(file_path, "rb") as reader:
+            mapped_file = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped_file[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{file_path} is not a lattice file")
+        header_size = int.from_bytes(mapped_file[len(MAGIC) : len(MAGIC) + 8], "little")
+        header = json.loads(
+            mapped_file[len(MAGIC) + 8 : len(MAGIC) + 8 + header_size].decode("utf-8")
+        )
+        if header["version"] != VERSION:
+            raise ValueError(
+                f"{file_path} has version {header['version']}, expected {VERSION}"
+            )
+        start = len(MAGIC) + 8 + header_size
+        start = -(-start // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.frombuffer(
+                mapped_file, dtype=dtype, count=count, offset=start + offset
+            ).reshape(shape)
+        return LatticeStore(arrays, mapped_file)
+
+    def get_row(self, table, column, row):
+        offsets = self.arrays[f"{table}_{column}_offsets"]
+        return self.arrays[f"{table}_{column}_ids"][offsets[row] : offsets[row + 1]]
+
+    def decode(self, ids, dimension):
+        """Takes IDs and the name of their dimension ('objects', 'attributes'
+        or 'conditions') and returns the set of their names.
+        """
+
+        names = self.arrays[dimension]
+        return set(str(names[x]) for x in ids)
+
+    def get_rows(self, table, concept_id):
+        """Takes a table of (intent, modus) rows and a concept ID, and returns
+        the range of the rows of the concept, or an empty range when the
+        section was not saved.
+        """
+
+        offsets = self.arrays.get(f"{table}_concept_offsets")
+        if offsets is None:
+            return range(0)
+        return range(offsets[concept_id], offsets[concept_id + 1])
+
+    def get_upper_covers(self, concept_id):
+        """Returns the IDs of the upper covers (targets of the links) of a
+        concept.
+        """
+
+        offsets = self.arrays["upper_cover_offsets"]
+        return self.arrays["upper_cover_ids"][
+            offsets[concept_id] : offsets[concept_id + 1]
+        ]
+
+    def get_lower_covers(self, concept_id):
+        """Returns the IDs of the lower covers (sources of the links) of a
+        concept.
+        """
+
+        offsets = self.arrays["lower_cover_offsets"]
+        return self.arrays["lower_cover_ids"][
+            offsets[concept_id] : offsets[concept_id + 1]
+        ]
+
+    def index(self, extent):
+        """Takes an extent and returns the ID of the concept that has it. The
+        index of the extents is built on the first call.
+
+        Raises:
+            ValueError: if no concept has this extent
+        """
+
+        if self.extent_index is None:
+            self.extent_index = {
+                frozenset(concept.extent): concept.concept_id for concept in self
+            }
+        try:
+            return self.extent_index[frozenset(extent)]
+        except KeyError:
+            raise ValueError(f"{extent} is not in the LatticeStore") from None
+
+    def get(self, extent):
+        return self[self.index(extent)]
+
+
+class ConceptView:
+    """Read-only view of a concept of a LatticeStore. It has the same fields
+    as a TriadicConcept, which are decoded from the mapped arrays when they
+    are read.
+    """
+
+    __slots__ = ("lattice", "concept_id")
+
+    def __init__(self, lattice, concept_id):
+        self.lattice = lattice
+        self.concept_id = concept_id
+
+    def __repr__(self):
+        return f"ConceptView(concept_id={self.concept_id})"
+
+    def get_pairs(self, table, values=()):
+        lattice = self.lattice
+        pairs = []
+        for row in lattice.get_rows(table, self.concept_id):
+            pairs.append(
+                [
+                    lattice.decode(lattice.get_row(table, "intent", row), "attributes"),
+                    lattice.decode(lattice.get_row(table, "modus", row), "conditions"),
+                ]
+                + [
+                    float(lattice.arrays[f"{table}_{value}"][row])
+                    for value in values
+                    if not np.isnan(lattice.arrays[f"{table}_{value}"][row])
+                ]
+            )
+        return pairs
+
+    @property
+    def extent(self):
+        return self.lattice.decode(
+            self.lattice.get_row("concept", "extent", self.concept_id), "objects"
+        )
+
+    @property
+    def extent_size(self):
+        offsets = self.lattice.arrays["concept_extent_offsets"]
+        return int(offsets[self.concept_id + 1] - offsets[self.concept_id])
+
+    @property
+    def intent(self):
+        return [pair[0] for pair in self.get_pairs("feature")]
+
+    @property
+    def modus(self):
+        return [pair[1] for pair in self.get_pairs("feature")]
+
+    @property
+    def extent_bits(self):
+        bits = 0
+        for x in self.lattice.get_row("concept", "extent", self.concept_id):
+            bits |= 1 << int(x)
+        return bits
+
+    @property
+    def feature_generator_minimal(self):
+        return self.get_pairs("generator")
+
+    @property
+    def concept_stability(self):
+        return self.get_pairs("stability", SCORES["stability"][1])
+
+    @property
+    def separation_index(self):
+        return self.get_pairs("separation", SCORES["separation"][1])
+
+    @property
+    def extensional_generator_minimal(self):
+        lattice = self.lattice
+        return [
+            lattice.decode(
+                lattice.get_row("extensional_generator", "extent", row), "objects"
+            )
+            for row in lattice.get_rows("extensional_generator", self.concept_id)
+        ]
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import numpy as np
+
+
+class Links:
+    """Class that stores the links computed by T-iPred between the triadic
+    concepts as pairs of concept IDs, with the successors and predecessors
+    of every concept in a CSR layout.
+
+    A link goes from a concept (source) to one of its upper covers (target),
+    whose extent is larger. The edges are kept in two int32 arrays, in the
+    order they were found, and the CSR arrays give the successors (targets)
+    and predecessors (sources) of a concept as a slice, without a dict of
+    extents. The class also behaves like the list of (target extent, source
+    extent) tuples used before (len, indexing, iteration, reversed and 'in'),
+    with the extents taken from the concept IDs.
+
+    The statistics are the counters of the T-iPred run that found the
+    links (see get_statistics).
+    """
+
+    def __init__(self, extents, targets, sources, statistics=None):
+        self.extents = tuple(frozenset(extent) for extent in extents)
+        self.targets = np.asarray(targets, dtype=np.int32)
+        self.sources = np.asarray(sources, dtype=np.int32)
+        self.statistics = {} if statistics is None else statistics
+        self.extent_index = None
+        size = len(self.extents)
+        self.successor_offsets, self.successor_ids = Links.get_csr(
+            self.sources, self.targets, size
+        )
+        self.predecessor_offsets, self.predecessor_ids = Links.get_csr(
+            self.targets, self.sources, size
+        )
+
+    def __len__(self):
+        return len(self.targets)
+
+    def __getitem__(self, index):
+        return self.get_link(int(self.targets[index]), int(self.sources[index]))
+
+    def __iter__(self):
+        return (self.get_link(target, source) for target, source in self.iter_edges())
+
+    def __contains__(self, link):
+        target, source = link
+        try:
+            target = self.index(target)
+            source = self.index(source)
+        except ValueError:
+            return False
+        return target in self.get_successors(source)
+
+    def get_csr(keys, values, size):
+        """Takes the pairs (keys[i], values[i]) and returns the values of
+        each key in a CSR layout, in the order of the pairs.
+
+        Args:
+            keys (numpy array): keys in [0, size)
+            values (numpy array): values of the pairs
+            size (int): number of keys
+
+        Returns:
+            tuple: the offsets of each key and the values sorted by key
+        """
+
+        order = np.argsort(keys, kind="stable")
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+        return offsets, values[order].astype(np.int32)
+
+    def create(triadic_concepts, targets, sources, statistics=None):
+        """Takes the triadic_concepts and the concept IDs of the targets and
+        sources of the links, and returns the Links.
+
+        Args:
+            triadic_concepts (ConceptStore): the TriadicConcept objects
+            targets (list): concept ID of the target of each link
+            sources (list): concept ID of the source of each link
+            statistics (dict): counters of the T-iPred run
+
+        Returns:
+            Links: the links between the Triadic Concepts
+        """
+
+        return Links(
+            (concept.extent for concept in triadic_concepts),
+            targets,
+            sources,
+            statistics,
+        )
+
+    def get_link(self, target, source):
+        """Takes the concept IDs of a link and returns it as a tuple (target
+        extent, source extent).
+        """
+
+        return set(self.extents[target]), self.extents[source]
+
+    def iter_edges(self):
+        """Returns an iterator over the (target concept ID, source concept
+        ID) of the links, in the order they were found.
+        """
+
+        return zip(self.targets.tolist(), self.sources.tolist())
+
+    def index(self, extent):
+        """Takes an extent and returns the ID of the concept that has it. The
+        index of the extents is built on the first call.
+
+        Raises:
+            ValueError: if no concept has this extent
+        """
+
+        if self.extent_index is None:
+            self.extent_index = {
+                extent: concept_id for concept_id, extent in enumerate(self.extents)
+            }
+        try:
+            return self.extent_index[frozenset(extent)]
+        except KeyError:
+            raise ValueError(f"{extent} is not in the Links") from None
+
+    def get_successors(self, concept_id):
+        """Returns the concept IDs of the successors (upper covers) of a
+        concept.
+        """
+
+        offsets = self.successor_offsets
+        return self.successor_ids[offsets[concept_id] : offsets[concept_id + 1]]
+
+    def get_predecessors(self, concept_id):
+        """Returns the concept IDs of the predecessors (lower covers) of a
+        concept.
+        """
+
+        offsets = self.predecessor_offsets
+        return self.predecessor_ids[offsets[concept_id] : offsets[concept_id + 1]]
+
+    def get_sources(self):
+        """Returns the concept IDs that have at least one successor, in
+        increasing order.
+        """
+
+        return np.flatnonzero(np.diff(self.successor_offsets)).tolist()
+
+    def get_statistics(self):
+        """Returns the counters of the T-iPred run that found the links.
+
+        Returns:
+            dict: links, the largest size of the border (border_max), the
+            sum of the border sizes over the concepts (border_total), the
+            border extents intersected with a concept (intersected), and the
+            intersections kept as candidates (candidates) or discarded
+            because they are not extents (discarded)
+        """
+
+        return {"links": len(self), **self.statistics}
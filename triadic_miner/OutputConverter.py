@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import os
+
+NORMALIZED_SUFFIXES = (
+    "links",
+    "generators",
+    "concept_stability",
+    "separation_index",
+    "ext_generators",
+)
+
+
+class OutputConverter:
+    """Class that converts the normalized outputs (see Report), where the
+    links, generators and scores refer to the concepts by their concept ID,
+    back to the verbose outputs, where every concept is written as its
+    extent. The extent of each concept ID is read from the concepts file.
+    """
+
+    def read_extents(triadic_concepts_file_path):
+        """Takes a normalized concepts file and returns the extent of each
+        concept ID.
+
+        Args:
+            triadic_concepts_file_path (str): path to the concepts file
+
+        Returns:
+            dict: extent (as written in the file) of each concept ID
+        """
+
+        extents = {}
+        concept_id = None
+        with open(triadic_concepts_file_path, "r", encoding="utf-8") as reader:
+            for line in reader:
+                if line.startswith("CONCEPT: "):
+                    concept_id = line[len("CONCEPT: ") :].rstrip("\n")
+                elif line.startswith("EXTENT: ") and concept_id is not None:
+                    extents[concept_id] = line[len("EXTENT: ") :].rstrip("\n")
+                    concept_id = None
+        return extents
+
+    def convert_line(line, extents):
+        """Takes a line of a normalized file and returns the verbose line."""
+
+        if line.startswith("CONCEPT: "):
+            concept_id = line[len("CONCEPT: ") :].rstrip("\n")
+            if concept_id in extents:
+                return "EXTENT: {0}\n".format(extents[concept_id])
+            return ""
+        parts = line.rstrip("\n").split(" --> ")
+        if len(parts) == 2 and all(part in extents for part in parts):
+            # The target of a link is written as an empty string when its
+            # extent is empty, as in Report.save_links
+            target = extents[parts[1]]
+            return "{0} --> {1}\n".format(
+                extents[parts[0]], "" if target == "ø" else target
+            )
+        return line
+
+    def convert_file(
+        input_file_path, output_file_path, extents, is_concepts_file=False
+    ):
+        """Takes a normalized file and writes it in the verbose format. The
+        output is written under a temporary name and then renamed, so the
+        input file can also be the output file.
+
+        Args:
+            input_file_path (str): path to the normalized file
+            output_file_path (str): path to the verbose file
+            extents (dict): extent of each concept ID
+            is_concepts_file (bool): True for the concepts file, whose
+            concept ID lines are removed
+        """
+
+        temporary_path = f"{output_file_path}.{os.getpid()}.tmp"
+        with open(input_file_path, "r", encoding="utf-8") as reader, open(
+            temporary_path, "w", encoding="utf-8"
+        ) as writer:
+            for line in reader:
+                if is_concepts_file:
+                    # The extents are already in the concepts file
+                    if not line.startswith("CONCEPT: "):
+                        writer.write(line)
+                else:
+                    writer.write(OutputConverter.convert_line(line, extents))
+        os.replace(temporary_path, output_file_path)
+
+    def convert_output(output_dir, file_name, verbose_output_dir=None):
+        """Takes the folder of the normalized outputs of an input file and
+        writes its concepts, links, generators and scores files in the
+        verbose format.
+
+        Args:
+            output_dir (str): folder with the normalized outputs
+            file_name (str): name of the input file (without extension)
+            verbose_output_dir (str): folder of the verbose outputs, the
+            normalized files are replaced when it is None
+        """
+
+        if verbose_output_dir is None:
+            verbose_output_dir = output_dir
+        os.makedirs(verbose_output_dir, exist_ok=True)
+        triadic_concepts_file_path = os.path.join(output_dir, f"{file_name}.concepts")
+        extents = OutputConverter.read_extents(triadic_concepts_file_path)
+        for suffix in ("concepts",) + NORMALIZED_SUFFIXES:
+            input_file_path = os.path.join(output_dir, f"{file_name}.{suffix}")
+            if os.path.exists(input_file_path):
+                OutputConverter.convert_file(
+                    input_file_path,
+                    os.path.join(verbose_output_dir, f"{file_name}.{suffix}"),
+                    extents,
+                    suffix == "concepts",
+                )
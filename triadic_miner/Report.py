@@ -5,19 +5,55 @@
 
 import os
 
+from triadic_miner.AssociationRules import (
+    AssociationRule,
+    RULE_FAMILIES,
+    IMPLICATION_FAMILIES,
+)
+
 EMPTY_SET = set([])
+RULE_HEADERS = {
+    "BCAI": ("BCAI IMPLICATIONS", 7),
+    "BACI": ("BACI IMPLICATIONS", 7),
+    "BCAAR": ("BCAAR ASSOCIATION RULES", 6),
+    "BACAR": ("BACAR ASSOCIATION RULES", 6),
+}
 
 
 class Report:
-    def __init__(self, file_path, file_name):
+    def __init__(self, file_path, file_name, normalized=False):
         self.file_path = file_path
         self.file_name = file_name
+        self.normalized = normalized
         self.module_time = []
         self.sections = []
+        self.cache_statistics = []
+        self.stage_cache_statistics = None
+        self.rule_counts = None
+        self.links_statistics = None
 
     def add_module_time(self, title, time):
         self.module_time.append({"module_name": title, "time": time})
 
+    def add_cache_statistics(self, title, statistics):
+        """Takes the name of a cache and its counters, or None when they
+        are not available (e.g. with the 'processes' backend).
+        """
+
+        if statistics is None:
+            self.cache_statistics.append({"cache_name": title})
+        else:
+            self.cache_statistics.append({"cache_name": title, **statistics})
+
+    def add_stage_cache_statistics(self, statistics):
+        self.stage_cache_statistics = statistics
+
+    def add_rule_counts(self, rule_counts):
+        self.rule_counts = rule_counts
+
+    def add_links_statistics(self, statistics):
+        self.links_statistics = statistics
+
     def check_output_folder(self):
         output_dir = os.path.dirname(self.file_path)
         os.makedirs(output_dir, exist_ok=True)
@@ -28,6 +64,47 @@ class Report:
         file.write("\t" * number_indentation + title + "\n")
         file.write("*" + "=" * 75 + "*" + "\n\n")
 
+    def format_extent(extent):
+        if extent == EMPTY_SET:
+            return "ø"
+        return ", ".join(sorted(extent))
+
+    def write_concept(self, file, concept):
+        """Writes the line that identifies a concept in the outputs: its
+        concept ID when the outputs are normalized (the extent of each ID is
+        only written in the concepts file), or its extent.
+        """
+
+        if self.normalized:
+            file.write("CONCEPT: {0}\n".format(concept.concept_id))
+        else:
+            file.write("EXTENT: {0}\n".format(Report.format_extent(concept.extent)))
+
+    def format_rule_part(ids, dimension):
+        return ", ".join(AssociationRule.decode(ids, dimension))
+
+    def get_rule_dimensions(family, symbols):
+        """Takes a rule family and the symbol tables, and returns the
+        dimensions of the antecedent and consequent, and of the condition.
+        """
+
+        if family in ("BCAI", "BCAAR"):
+            return symbols.attributes, symbols.conditions
+        return symbols.conditions, symbols.attributes
+
+    def format_rule(rule, family, symbols):
+        dimension, condition_dimension = Report.get_rule_dimensions(family, symbols)
+        left_part = Report.format_rule_part(rule.antecedent, dimension)
+        right_part = Report.format_rule_part(rule.consequent, dimension)
+        condition = Report.format_rule_part(rule.condition, condition_dimension)
+        if family in IMPLICATION_FAMILIES:
+            return "({0} -> {1}) {2} \t (support = {3}, confidence = {4})\n".format(
+                left_part, right_part, condition, rule.support, rule.confidence
+            )
+        return "({0} -> {1}) {2} \t (support = {3}, confidence = {4}, lift = {5})\n".format(
+            left_part, right_part, condition, rule.support, rule.confidence, rule.lift
+        )
+
     def save_report(self):
         self.check_output_folder()
 
@@ -52,6 +129,71 @@ class Report:
                 "{:.4}".format(total_time / 3600),
             )
         )
+
+        for cache in self.cache_statistics:
+            if "hits" not in cache:
+                file.write(
+                    "\n{0}: statistics not available with the processes "
+                    "backend\n".format(cache["cache_name"])
+                )
+                continue
+            lookups = cache["hits"] + cache["misses"]
+            hit_rate = 100 * cache["hits"] / lookups if lookups else 0
+            file.write(
+                "\n{0}: {1} hits, {2} misses ({3}% hit rate), {4} evictions, "
+                "{5} of {6} entries used\n".format(
+                    cache["cache_name"],
+                    cache["hits"],
+                    cache["misses"],
+                    "{:.2f}".format(hit_rate),
+                    cache["evictions"],
+                    cache["size"],
+                    cache["max_size"],
+                )
+            )
+
+        if self.stage_cache_statistics is not None:
+            hits = self.stage_cache_statistics["hits"]
+            misses = self.stage_cache_statistics["misses"]
+            if hits or misses:
+                file.write(
+                    "\nStage cache: {0} hits ({1}), {2} misses ({3})\n".format(
+                        len(hits),
+                        ", ".join(hits) or "-",
+                        len(misses),
+                        ", ".join(misses) or "-",
+                    )
+                )
+
+        if self.links_statistics and "border_total" in self.links_statistics:
+            statistics = self.links_statistics
+            border_total = statistics["border_total"]
+            intersected = (
+                100 * statistics["intersected"] / border_total if border_total else 0
+            )
+            file.write(
+                "\nT-iPred: {0} links, border of at most {1} extents, {2} of {3} "
+                "border extents intersected ({4}%), {5} candidates, {6} "
+                "discarded intersections\n".format(
+                    statistics["links"],
+                    statistics["border_max"],
+                    statistics["intersected"],
+                    border_total,
+                    "{:.2f}".format(intersected),
+                    statistics["candidates"],
+                    statistics["discarded"],
+                )
+            )
+
+        if self.rule_counts is not None:
+            file.write(
+                "\nRules: {0}\n".format(
+                    ", ".join(
+                        f"{family} {count}"
+                        for family, count in self.rule_counts.items()
+                    )
+                )
+            )
         file.close()
 
     def save_triadic_concepts(self, triadic_concepts, triadic_concepts_file_path):
@@ -60,14 +202,11 @@ class Report:
         Report.write_header(file, "TRIADIC CONCEPTS", 7)
 
         for concept in triadic_concepts:
-            extent = concept.extent
             intent = concept.intent
             modus = concept.modus
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-
-            file.write("EXTENT: {0}\n".format(extent))
+            if self.normalized:
+                file.write("CONCEPT: {0}\n".format(concept.concept_id))
+            file.write("EXTENT: {0}\n".format(Report.format_extent(concept.extent)))
 
             for attribute in zip(intent, modus):
                 _int = str(", ".join([", ".join(x for x in sorted(attribute[0]))]))
@@ -81,6 +220,12 @@ class Report:
         file = open(links_concepts_file_path, "w", encoding="utf-8")
         Report.write_header(file, "LINKS COMPUTED BY T-iPRED", 7)
 
+        if self.normalized:
+            for target, concept in links.iter_edges():
+                file.write("{0} --> {1}\n".format(concept, target))
+            file.close()
+            return
+
         for link in links:
             concept, target = link[1], link[0]
             if concept == EMPTY_SET:
@@ -101,12 +246,8 @@ class Report:
         Report.write_header(file, "FEATURES GENERATORS", 7)
 
         for concept in triadic_concepts:
-            extent = concept.extent
             generators = concept.feature_generator_minimal
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-            file.write("EXTENT: {0}\n".format(extent))
+            self.write_concept(file, concept)
             if generators != []:
                 for gen in generators:
                     intent = format_generator_part(gen[0])
@@ -117,78 +258,33 @@ class Report:
             file.write("\n\n")
         file.close()
 
-    def save_BCAI_implications(self, BCAI_implications, BCAI_implications_file_path):
-
-        file = open(BCAI_implications_file_path, "w", encoding="utf-8")
-        Report.write_header(file, "BCAI IMPLICATIONS", 7)
-
-        for rule in BCAI_implications:
-            left_part = str(", ".join([", ".join(x for x in sorted(rule.antecedent))]))
-            right_part = str(", ".join([", ".join(x for x in sorted(rule.consequent))]))
-            condition = str(", ".join([", ".join(x for x in sorted(rule.condition))]))
-            support = rule.support
-            confidence = rule.confidence
-            file.write(
-                "({0} -> {1}) {2} \t (support = {3}, confidence = {4})\n".format(
-                    left_part, right_part, condition, support, confidence
-                )
-            )
-        file.close()
-
-    def save_BACI_implications(self, BACI_implications, BACI_implications_file_path):
-
-        file = open(BACI_implications_file_path, "w", encoding="utf-8")
-        Report.write_header(file, "BACI IMPLICATIONS", 7)
-
-        for rule in BACI_implications:
-            left_part = str(", ".join([", ".join(x for x in sorted(rule.antecedent))]))
-            right_part = str(", ".join([", ".join(x for x in sorted(rule.consequent))]))
-            condition = str(", ".join([", ".join(x for x in sorted(rule.condition))]))
-            support = rule.support
-            confidence = rule.confidence
-            file.write(
-                "({0} -> {1}) {2} \t (support = {3}, confidence = {4})\n".format(
-                    left_part, right_part, condition, support, confidence
-                )
-            )
-        file.close()
+    def save_BCAI_implications(
+        self, BCAI_implications, symbols, BCAI_implications_file_path
+    ):
+        Report.save_rules(
+            BCAI_implications, "BCAI", symbols, BCAI_implications_file_path
+        )
 
-    def save_BCAAR_rules(self, BCAAR_rules, BCAAR_rules_file_path):
+    def save_BACI_implications(
+        self, BACI_implications, symbols, BACI_implications_file_path
+    ):
+        Report.save_rules(
+            BACI_implications, "BACI", symbols, BACI_implications_file_path
+        )
 
-        file = open(BCAAR_rules_file_path, "w", encoding="utf-8")
-        Report.write_header(file, "BCAAR ASSOCIATION RULES", 6)
+    def save_BCAAR_rules(self, BCAAR_rules, symbols, BCAAR_rules_file_path):
+        Report.save_rules(BCAAR_rules, "BCAAR", symbols, BCAAR_rules_file_path)
 
-        for rule in BCAAR_rules:
-            left_part = str(", ".join([", ".join(x for x in sorted(rule.antecedent))]))
-            right_part = str(", ".join([", ".join(x for x in sorted(rule.consequent))]))
-            condition = str(", ".join([", ".join(x for x in sorted(rule.condition))]))
-            support = rule.support
-            confidence = rule.confidence
-            lift = rule.lift
-            file.write(
-                "({0} -> {1}) {2} \t (support = {3}, confidence = {4}, lift = {5})\n".format(
-                    left_part, right_part, condition, support, confidence, lift
-                )
-            )
-        file.close()
+    def save_BACAR_rules(self, BACAR_rules, symbols, BACAR_rules_file_path):
+        Report.save_rules(BACAR_rules, "BACAR", symbols, BACAR_rules_file_path)
 
-    def save_BACAR_rules(self, BACAR_rules, BACAR_rules_file_path):
+    def save_rules(rules, family, symbols, rules_file_path):
 
-        file = open(BACAR_rules_file_path, "w", encoding="utf-8")
-        Report.write_header(file, "BACAR ASSOCIATION RULES", 6)
+        file = open(rules_file_path, "w", encoding="utf-8")
+        Report.write_header(file, *RULE_HEADERS[family])
 
-        for rule in BACAR_rules:
-            left_part = str(", ".join([", ".join(x for x in sorted(rule.antecedent))]))
-            right_part = str(", ".join([", ".join(x for x in sorted(rule.consequent))]))
-            condition = str(", ".join([", ".join(x for x in sorted(rule.condition))]))
-            support = rule.support
-            confidence = rule.confidence
-            lift = rule.lift
-            file.write(
-                "({0} -> {1}) {2} \t (support = {3}, confidence = {4}, lift = {5})\n".format(
-                    left_part, right_part, condition, support, confidence, lift
-                )
-            )
+        for rule in rules:
+            file.write(Report.format_rule(rule, family, symbols))
         file.close()
 
     def save_concept_stability(self, triadic_concepts, concept_stability_file_path):
@@ -197,11 +293,7 @@ class Report:
         Report.write_header(file, "CONCEPT STABILITY", 7)
 
         for concept in triadic_concepts:
-            extent = concept.extent
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-            file.write("EXTENT: {0}\n".format(extent))
+            self.write_concept(file, concept)
             stability = concept.concept_stability
             if not stability == []:
                 for attribute in stability:
@@ -210,6 +302,9 @@ class Report:
                     )
                     modus = str(", ".join([", ".join(x for x in sorted(attribute[1]))]))
                     concept_stability = attribute[2]
+                    if len(attribute) > 3:
+                        # Monte Carlo estimate with its confidence interval
+                        concept_stability = "{0} [{1}, {2}]".format(*attribute[2:5])
                     file.write(
                         "({0} - {1}) = {2}\n".format(intent, modus, concept_stability)
                     )
@@ -224,11 +319,7 @@ class Report:
         Report.write_header(file, "SEPARATION INDEX", 7)
 
         for concept in triadic_concepts:
-            extent = concept.extent
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-            file.write("EXTENT: {0}\n".format(extent))
+            self.write_concept(file, concept)
             separation_idx = concept.separation_index
             if not separation_idx == []:
                 for attribute in separation_idx:
@@ -251,11 +342,7 @@ class Report:
         Report.write_header(file, "TRIADIC RELEVANCE INDEX", 6)
 
         for concept in triadic_concepts:
-            extent = concept.extent
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-            file.write("EXTENT: {0}\n".format(extent))
+            self.write_concept(file, concept)
             triadic_relevance_index_idx = concept.triadic_relevance_index
             if not triadic_relevance_index_idx == []:
                 for attribute in triadic_relevance_index_idx:
@@ -278,31 +365,31 @@ class Report:
         Report.write_header(file, "EXTENSIONAL GENERATORS", 7)
 
         for concept in triadic_concepts:
-            extent = concept.extent
             generators = concept.extensional_generator_minimal
-            if extent == EMPTY_SET:
-                extent = "ø"
-            extent = str(", ".join([", ".join(x for x in sorted(extent))]))
-            file.write("EXTENT: {0}\n".format(extent))
+            self.write_concept(file, concept)
             if generators != []:
+                # A generator is a set of objects or a single object (a
+                # name), they are written sorted by their names
+                generators = sorted(
+                    [gen] if isinstance(gen, str) else sorted(gen) for gen in generators
+                )
                 for gen in generators:
-                    extent_gen = str(", ".join([", ".join(x for x in sorted(gen))]))
-                    file.write("({0})\n".format(extent_gen))
+                    file.write("({0})\n".format(", ".join(gen)))
             else:
                 file.write("ø\n")
             file.write("\n\n")
         file.close()
 
     def save_extensional_implications(
-        self, extensional_implications, extensional_implications_file_path
+        self, extensional_implications, symbols, extensional_implications_file_path
     ):
 
         file = open(extensional_implications_file_path, "w", encoding="utf-8")
         Report.write_header(file, "EXTENSIONAL IMPLICATIONS", 7)
 
         for rule in extensional_implications:
-            left_part = str(", ".join([", ".join(x for x in sorted(rule.antecedent))]))
-            right_part = str(", ".join([", ".join(x for x in sorted(rule.consequent))]))
+            left_part = Report.format_rule_part(rule.antecedent, symbols.objects)
+            right_part = Report.format_rule_part(rule.consequent, symbols.objects)
             confidence = rule.confidence
             file.write(
                 "({0} -> {1}) \t (confidence = {2})\n".format(
@@ -310,3 +397,14 @@ class Report:
                 )
             )
         file.close()
+
+    def save_sweep_summary(self, sweep, sweep_summary_file_path):
+
+        file = open(sweep_summary_file_path, "w", encoding="utf-8")
+        Report.write_header(file, "THRESHOLD SWEEP", 7)
+
+        file.write("support\tconfidence\t" + "\t".join(RULE_FAMILIES) + "\n")
+        for (support, confidence), rules in sweep.items():
+            counts = "\t".join(str(len(rules[family])) for family in RULE_FAMILIES)
+            file.write(f"{support}\t{confidence}\t{counts}\n")
+        file.close()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import json
+
+from triadic_miner.AssociationRules import AssociationRule, IMPLICATION_FAMILIES
+from triadic_miner.Report import Report, RULE_HEADERS
+
+RULE_OUTPUTS = ("text", "jsonl", "count")
+
+
+class RuleSink:
+    """Class that receives the rules of a family as they are computed and
+    only counts them. The subclasses write every rule to a file as soon as
+    it is added, so the rules never need to be kept in memory.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, rule):
+        self.count += 1
+        self.write(rule)
+
+    def write(self, rule):
+        pass
+
+    def close(self):
+        pass
+
+    def create(rule_output, family, symbols, rules_file_path):
+        """Takes the kind of output set up by the user and returns the sink of
+        a rule family.
+
+        Args:
+            rule_output (str): 'text', 'jsonl' or 'count'
+            family (str): name of the rule family
+            symbols (SymbolTables): symbol tables of the triadic concepts
+            rules_file_path (str): path to the file of the rule family, the
+            JSONL file has the '.jsonl' extension added
+
+        Returns:
+            RuleSink: the sink of the rule family
+        """
+
+        if rule_output == "text":
+            return TextRuleSink(family, symbols, rules_file_path)
+        if rule_output == "jsonl":
+            return JSONLRuleSink(family, symbols, f"{rules_file_path}.jsonl")
+        if rule_output == "count":
+            return RuleSink()
+        raise ValueError(
+            f"Unknown rule_output '{rule_output}', expected one of {RULE_OUTPUTS}"
+        )
+
+
+class TextRuleSink(RuleSink):
+    """Sink that writes the rules in the text format of the Report."""
+
+    def __init__(self, family, symbols, rules_file_path):
+        super().__init__()
+        self.family = family
+        self.symbols = symbols
+        self.file = open(rules_file_path, "w", encoding="utf-8")
+        Report.write_header(self.file, *RULE_HEADERS[family])
+
+    def write(self, rule):
+        self.file.write(Report.format_rule(rule, self.family, self.symbols))
+
+    def close(self):
+        self.file.close()
+
+
+class JSONLRuleSink(RuleSink):
+    """Sink that writes one JSON object per rule, with the names of the
+    elements of its antecedent, consequent and condition and its metrics.
+    """
+
+    def __init__(self, family, symbols, rules_file_path):
+        super().__init__()
+        self.family = family
+        self.dimension, self.condition_dimension = Report.get_rule_dimensions(
+            family, symbols
+        )
+        self.file = open(rules_file_path, "w", encoding="utf-8")
+
+    def write(self, rule):
+        record = {
+            "antecedent": AssociationRule.decode(rule.antecedent, self.dimension),
+            "consequent": AssociationRule.decode(rule.consequent, self.dimension),
+            "condition": AssociationRule.decode(
+                rule.condition, self.condition_dimension
+            ),
+            "support": rule.support,
+            "confidence": rule.confidence,
+        }
+        if self.family not in IMPLICATION_FAMILIES:
+            record["lift"] = rule.lift
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ColumnarRuleSink(RuleSink):
+    """Sink that collects the rules of a family and stores them as columns
+    of IDs in a ColumnarStore when it is closed.
+    """
+
+    def __init__(self, family, columnar_store):
+        super().__init__()
+        self.family = family
+        self.columnar_store = columnar_store
+        self.rules = []
+
+    def write(self, rule):
+        self.rules.append(rule)
+
+    def close(self):
+        self.columnar_store.add_rules(self.family, self.rules)
+        self.rules = []
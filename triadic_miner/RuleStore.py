@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+from triadic_miner.SymbolTable import SymbolTable
+
+
+class RuleStore:
+    """Class that keeps the implications computed so far, indexed by their
+    canonical (antecedent, condition) pair, so a new implication can be
+    checked for redundancy without scanning the existing ones.
+
+    The antecedent, consequent and condition are given as bitmasks of
+    interned IDs, so the order of their elements does not matter. For each
+    (antecedent, condition) key there is a superset index: every element
+    maps to the bitmask of the rules (numbered inside the key) whose
+    consequent contains it. The rules whose consequent is a superset of a
+    given set are the AND of the entries of its elements.
+
+    When a sink is given, the rules that are not redundant are passed on to
+    it as soon as they are added instead of being kept: only the index of
+    their bitmasks stays in memory.
+    """
+
+    def __init__(self, sink=None):
+        self.rules = []
+        self.indexes = {}
+        self.sizes = {}
+        self.sink = sink
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def is_redundant(self, antecedent, condition, consequent):
+        """Checks whether an implication is redundant given the stored ones,
+        i.e. if there is a stored implication with the same antecedent and
+        condition whose consequent contains all elements of this consequent.
+
+        Args:
+            antecedent (int): bitmask of the antecedent
+            condition (int): bitmask of the condition
+            consequent (int): bitmask of the consequent
+
+        Returns:
+            bool: True if the implication is redundant
+        """
+
+        index = self.indexes.get((antecedent, condition))
+        if index is None:
+            return False
+        rules = -1
+        for element in SymbolTable.iter_bits(consequent):
+            rules &= index.get(element, 0)
+            if rules == 0:
+                return False
+        return True
+
+    def add(self, rule, antecedent, condition, consequent):
+        """Takes an AssociationRule and the bitmasks of its antecedent,
+        condition and consequent, and stores it if it is not redundant.
+
+        Args:
+            rule (AssociationRule): the implication to be stored
+            antecedent (int): bitmask of the antecedent
+            condition (int): bitmask of the condition
+            consequent (int): bitmask of the consequent
+
+        Returns:
+            bool: True if the rule was stored, False if it was redundant
+        """
+
+        if self.is_redundant(antecedent, condition, consequent):
+            return False
+        key = (antecedent, condition)
+        index = self.indexes.setdefault(key, {})
+        rule_bit = 1 << self.sizes.get(key, 0)
+        self.sizes[key] = self.sizes.get(key, 0) + 1
+        for element in SymbolTable.iter_bits(consequent):
+            index[element] = index.get(element, 0) | rule_bit
+        if self.sink is not None:
+            self.sink.add(rule)
+        else:
+            self.rules.append(rule)
+        self.count += 1
+        return True
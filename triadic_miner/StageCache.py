@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from triadic_miner.ColumnarStore import ColumnarStore
+from triadic_miner.Links import Links
+
+HASH_BLOCK_SIZE = 1 << 20  # Bytes read at once when hashing the input file
+
+
+class StageCache:
+    """Class that keeps the results of the pipeline stages on disk, so a
+    rerun on the same input can skip the stages whose inputs did not change
+    (e.g. when only the thresholds of the rules are changed).
+
+    The result of a stage is the concepts, with their Feature Generators,
+    and the links. It is stored in a NumPy .npz file with the layout of a
+    ColumnarStore (symbol tables and CSR arrays of IDs) plus the counters of
+    the links, and it is read back without pickle, so a file of a shared
+    cache_dir cannot run code when it is loaded. The file is named after a
+    key, which is the hash of the input file, of the source code of the
+    package, and of the name and parameters of the stage and of all the
+    stages before it. Any change in one of them gives a new key, so stale
+    results are never loaded. The stages that were loaded (hits) or computed
+    (misses) are kept to be saved in the report.
+
+    The cache is disabled when cache_dir is empty: nothing is loaded or
+    saved. Old results are not removed, the cache_dir can be deleted at any
+    time.
+    """
+
+    def __init__(self, cache_dir, file_path, parameters=None):
+        """Takes the folder of the cache, the input file and the parameters
+        that are used by the first stage.
+
+        Args:
+            cache_dir (str): folder where the results are stored, an empty
+            string disables the cache
+            file_path (str): path to the input file
+            parameters (dict): parameters of the first stage
+        """
+
+        self.cache_dir = cache_dir
+        self.hits = []
+        self.misses = []
+        self.key = None
+        if cache_dir:
+            self.key = StageCache.get_hash(
+                StageCache.get_file_hash(file_path),
+                StageCache.get_code_version(),
+                parameters or {},
+            )
+
+    def get_hash(*values):
+        """Takes JSON serializable values and returns their SHA-256 hash.
+
+        Returns:
+            str: hexadecimal digest
+        """
+
+        return hashlib.sha256(
+            json.dumps(values, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def get_file_hash(file_path):
+        """Takes a file and returns the SHA-256 hash of its content.
+
+        Args:
+            file_path (str): path to the file
+
+        Returns:
+            str: hexadecimal digest
+        """
+
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as reader:
+            for block in iter(lambda: reader.read(HASH_BLOCK_SIZE), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def get_code_version():
+        """Returns the hash of the source files of the package, so results
+        computed by another version of the code are not loaded.
+
+        Returns:
+            str: hexadecimal digest
+        """
+
+        code_hash = hashlib.sha256()
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for file_name in sorted(os.listdir(package_dir)):
+            if file_name.endswith(".py"):
+                with open(os.path.join(package_dir, file_name), "rb") as reader:
+                    code_hash.update(file_name.encode("utf-8"))
+                    code_hash.update(reader.read())
+        return code_hash.hexdigest()
+
+    def chain(self, stage, parameters=None):
+        """Takes a stage and its parameters and moves the key to the one of
+        this stage, which depends on every stage chained before it.
+
+        Args:
+            stage (str): name of the stage
+            parameters (dict): parameters of the stage
+
+        Returns:
+            str: the key of the stage, or None when the cache is disabled
+        """
+
+        if self.key is not None:
+            self.key = StageCache.get_hash(self.key, stage, parameters or {})
+        return self.key
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, stage, key):
+        """Takes a stage and its key and returns its stored result.
+
+        Args:
+            stage (str): name of the stage
+            key (str): key returned by chain
+
+        Returns:
+            tuple: the ConceptStore and the Links, or None if there is none
+        """
+
+        if key is None:
+            return None
+        try:
+            columnar_store = ColumnarStore.load(self.get_path(key))
+            triadic_concepts = columnar_store.get_triadic_concepts()
+            statistics = dict(
+                zip(
+                    columnar_store["link_statistics_names"].tolist(),
+                    columnar_store["link_statistics_values"].tolist(),
+                )
+            )
+            links = Links.create(
+                triadic_concepts,
+                columnar_store["link_target"],
+                columnar_store["link_source"],
+                statistics,
+            )
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            self.misses.append(stage)
+            return None
+        self.hits.append(stage)
+        return triadic_concepts, links
+
+    def save(self, key, triadic_concepts, links):
+        """Takes the key of a stage and stores its result. The file is
+        written under a temporary name and then renamed, so an interrupted
+        run never leaves a truncated result behind.
+
+        Args:
+            key (str): key returned by chain
+            triadic_concepts (ConceptStore): the TriadicConcept objects
+            links (Links): the links between Triadic Concepts
+        """
+
+        if key is None:
+            return
+        columnar_store = ColumnarStore(triadic_concepts=triadic_concepts)
+        columnar_store.add_triadic_concepts(triadic_concepts)
+        columnar_store.add_links(links)
+        columnar_store.arrays["link_statistics_names"] = np.array(
+            list(links.statistics), dtype=str
+        )
+        columnar_store.arrays["link_statistics_values"] = np.array(
+            list(links.statistics.values()), dtype=np.int64
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_path(key)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        # A file object is given, so np.savez does not add a .npz suffix
+        with open(temporary_path, "wb") as writer:
+            np.savez(writer, **columnar_store.arrays)
+        os.replace(temporary_path, path)
+
+    def get_statistics(self):
+        """Returns the stages loaded from (hits) and computed without (misses)
+        the cache.
+
+        Returns:
+            dict: lists of the hits and misses
+        """
+
+        return {"hits": list(self.hits), "misses": list(self.misses)}
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+
+class Dimension:
+    """Class that interns the elements of one dimension of the triadic
+    context (objects, attributes or conditions) as dense integer IDs.
+
+    A set of elements is represented as an int bitmask, where the bit i is
+    set when the element with ID i belongs to the set.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        """Takes the name of an element and returns its ID, creating a new
+        ID if the element was never seen before.
+
+        Args:
+            name (str): name of the element
+
+        Returns:
+            int: the ID of the element
+        """
+
+        element_id = self.ids.get(name)
+        if element_id is None:
+            element_id = len(self.names)
+            self.ids[name] = element_id
+            self.names.append(name)
+        return element_id
+
+    def intern_all(self, names):
+        """Takes an iterable of names (or a single name), interns the ones
+        never seen before and returns the bitmask that represents them. It
+        is only used while the triadic concepts are parsed.
+
+        Args:
+            names (iterable): names of the elements
+
+        Returns:
+            int: bitmask of the elements
+        """
+
+        if isinstance(names, str):
+            names = [names]
+        bits = 0
+        for name in names:
+            bits |= 1 << self.intern(name)
+        return bits
+
+    def encode(self, names):
+        """Takes an iterable of names (or a single name) and returns the
+        bitmask that represents them. The names must have been interned.
+
+        Args:
+            names (iterable): names of the elements
+
+        Raises:
+            ValueError: if a name was never interned
+
+        Returns:
+            int: bitmask of the elements
+        """
+
+        if isinstance(names, str):
+            names = [names]
+        bits = 0
+        for name in names:
+            element_id = self.ids.get(name)
+            if element_id is None:
+                raise ValueError(f"'{name}' is not in the symbol table")
+            bits |= 1 << element_id
+        return bits
+
+    def decode(self, bits):
+        """Takes a bitmask and returns the set of names it represents.
+
+        Args:
+            bits (int): bitmask of the elements
+
+        Returns:
+            set: set with the names of the elements
+        """
+
+        return set(self.names[x] for x in SymbolTable.iter_bits(bits))
+
+
+class SymbolTable:
+    """Class that holds one Dimension per dimension of the triadic context.
+    It is built while the input file is parsed, so every element of the
+    dataset gets a dense integer ID.
+    """
+
+    def __init__(self):
+        self.objects = Dimension()
+        self.attributes = Dimension()
+        self.conditions = Dimension()
+
+    def iter_bits(bits):
+        """Takes a bitmask and yields the IDs of the bits that are set, in
+        increasing order.
+
+        Args:
+            bits (int): bitmask
+
+        Yields:
+            int: ID of each element in the bitmask
+        """
+
+        while bits:
+            lowest_bit = bits & -bits
+            yield lowest_bit.bit_length() - 1
+            bits ^= lowest_bit
+
+    def is_subset(bits, other_bits):
+        """Checks whether the set represented by bits is a subset of the set
+        represented by other_bits.
+
+        Args:
+            bits (int): bitmask of the (candidate) subset
+            other_bits (int): bitmask of the (candidate) superset
+
+        Returns:
+            bool: True if bits is a subset of other_bits
+        """
+
+        return bits & ~other_bits == 0
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+@author: pedroruas
+"""
+
+import heapq
+
+RANK_METRICS = ("support", "confidence", "lift")
+
+
+class TopKRules:
+    """Class that keeps only the k best rules by a rank metric (support,
+    confidence or lift) in a bounded min-heap, so the rules below the k-th
+    best one are never materialized.
+
+    Ties in the rank metric are broken by the order of the rules, so the
+    kept rules do not depend on the order in which they are added. Once the
+    heap is full, the score of its worst rule is a floor: a rule with a
+    lower score can not be kept, which lets the caller skip its computation.
+    """
+
+    def __init__(self, k, metric):
+        if metric not in RANK_METRICS:
+            raise ValueError(
+                f"Unknown rank metric '{metric}', expected one of {RANK_METRICS}"
+            )
+        self.k = k
+        self.metric = metric
+        self.heap = []
+        self.members = set()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (rule for _, rule in self.heap)
+
+    def get_floor(self):
+        """Returns the lowest score that a new rule needs to be kept.
+
+        Returns:
+            float: the score of the worst kept rule, or None while the heap
+            is not full
+        """
+
+        if len(self.heap) < self.k:
+            return None
+        return self.heap[0][0]
+
+    def add(self, rule):
+        """Takes a rule and keeps it if it is among the k best ones so far.
+
+        Args:
+            rule (AssociationRule): rule to be added
+
+        Returns:
+            bool: True if the rule was kept
+        """
+
+        if self.k <= 0 or rule in self.members:
+            return False
+        entry = (getattr(rule, self.metric), rule)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            _, evicted_rule = heapq.heapreplace(self.heap, entry)
+            self.members.discard(evicted_rule)
+        else:
+            return False
+        self.members.add(rule)
+        return True
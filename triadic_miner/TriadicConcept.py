@@ -3,21 +3,28 @@
 @author: pedroruas
 """
 
+import gc
+import math
+import numpy as np
 from tqdm import tqdm
-import pandas as pd
 from dataclasses import dataclass, field
-from multiprocessing.pool import ThreadPool
-from itertools import repeat
-from concepts import Definition, Context
 import pyyed
-from itertools import chain, combinations
 
 import networkx as nx
 from pyvis.network import Network
 
+from triadic_miner.ConceptStore import ConceptStore
+from triadic_miner.DyadicContext import DyadicContext
+from triadic_miner.FormalContext import FormalContext
+from triadic_miner.Executor import Executor
+from triadic_miner.Links import Links
+from triadic_miner.SymbolTable import SymbolTable
+
 
 EMPTY_SET = set([])
-PROCESSES = 8  # Amount of threads to be used in multithreading
+STABILITY_SAMPLES = 1000  # Default amount of samples of the Monte Carlo stability
+STABILITY_CONFIDENCE = 0.95  # Confidence of the Monte Carlo stability bounds
+STABILITY_MAX_FAMILY = 1024  # Largest family of covers counted exactly
 
 
 @dataclass(slots=True, order=True)
@@ -37,9 +44,25 @@ class TriadicConcept:
     concept_stability: list[list] = field(default_factory=list)
     separation_index: list[list] = field(default_factory=list)
     triadic_relevance_index: list[list] = field(default_factory=list)
+    concept_id: int = field(default=-1, compare=False)
+    extent_bits: int = field(default=0, compare=False)
+    intent_bits: list[int] = field(default_factory=list, compare=False)
+    modus_bits: list[int] = field(default_factory=list, compare=False)
+    pairs_by_intent: tuple = field(init=False, repr=False, compare=False)
+    pairs_by_modus: tuple = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.sort_index = self.extent_size
+        # Immutable views of the (intent, modus) bitmasks, sorted from the
+        # largest intent (or modus) to the smallest one, built once so the
+        # rules can scan them and stop at the first smaller feature
+        pairs = tuple(zip(self.intent_bits, self.modus_bits))
+        self.pairs_by_intent = tuple(
+            sorted(pairs, key=lambda x: x[0].bit_count(), reverse=True)
+        )
+        self.pairs_by_modus = tuple(
+            sorted(pairs, key=lambda x: x[1].bit_count(), reverse=True)
+        )
 
     def __str__(self):
 
@@ -54,7 +77,8 @@ class TriadicConcept:
                 \nExtensional Generator Minimal: {self.extensional_generator_minimal}\
                 \nConcept Stability: {self.concept_stability}\
                 \nSeparation Index: {self.separation_index}\
-                \nTriadic Relevance Index: {self.triadic_relevance_index}"
+                \nTriadic Relevance Index: {self.triadic_relevance_index}\
+                \nConcept ID: {self.concept_id}"
 
     def __eq__(self, other):
         if other == self.extent:
@@ -63,60 +87,93 @@ class TriadicConcept:
 
     def get_triadic_concepts_from_input_file(file_path):
         """Function that reads the triadic concepts computed by Data Peeler
-        and transforms them in objects of the class TriadicConcept
+        and transforms them in objects of the class TriadicConcept.
+        The file is streamed once and the rows are grouped by extent while
+        they are read.
 
         Args:
                 file_path (string): path to the input file
 
         Returns:
-                list: returns a list of TriadicConcept objects
+                ConceptStore: returns the TriadicConcept objects indexed by
+                extent and by concept ID
         """
 
-        triadic_concepts = []
-        with open(file_path, "r") as reader:
-            for row in reader:
-                line = row.rstrip("\n").split(" ")
-                if line[0] == "ø":
-                    line[0] = frozenset(EMPTY_SET)
-                    triadic_concepts.append(
-                        TriadicConcept(
-                            line[0],
-                            set(line[1].split(",")),
-                            set(line[2].split(",")),
-                            len(line[0]),
-                        )
-                    )
-                else:
-                    triadic_concepts.append(
-                        TriadicConcept(
-                            set(line[0].split(",")),
-                            set(line[1].split(",")),
-                            set(line[2].split(",")),
-                            len(set(line[0].split(","))),
-                        )
-                    )
+        def read_rows(file_path):
+            with open(file_path, "r") as reader:
+                for row in reader:
+                    line = row.rstrip("\n").split(" ")
+                    if line[0] == "ø":
+                        extent = frozenset(EMPTY_SET)
+                    else:
+                        extent = frozenset(line[0].split(","))
+                    yield extent, set(line[1].split(",")), set(line[2].split(","))
 
-        unique_triadic_concepts_extents = []
-        for concept in triadic_concepts:
-            if concept.extent not in unique_triadic_concepts_extents:
-                unique_triadic_concepts_extents.append(concept.extent)
+        return TriadicConcept.group_triadic_concepts(read_rows(file_path))
 
-        unique_triadic_concepts = []
-        for unique_extent in unique_triadic_concepts_extents:
-            list_intent = []
-            list_modus = []
-            for concept in triadic_concepts:
-                if concept.extent == unique_extent:
-                    list_intent.append(concept.intent)
-                    list_modus.append(concept.modus)
-            unique_triadic_concepts.append(
-                TriadicConcept(
-                    unique_extent, list_intent, list_modus, len(unique_extent)
+    def group_triadic_concepts(rows, symbols=None):
+        """Takes the rows (extent, intent, modus) of triadic concepts and
+        groups them by extent in a single pass, so each unique extent becomes
+        one TriadicConcept holding the list of its intents and modi.
+        The objects, attributes and conditions are interned in a SymbolTable
+        and each concept is also annotated with the bitmasks of its extent,
+        intents and modi.
+
+        Args:
+                rows (iterable): tuples (extent, intent, modus), where the
+                extent is a frozenset and the intent and modus are sets
+                symbols (SymbolTable): table where the elements are interned,
+                a new one is created when it is not given
+
+        Returns:
+                ConceptStore: returns the TriadicConcept objects, sorted by
+                extent size, indexed by extent and by concept ID
+        """
+
+        # Parsing only allocates acyclic containers, so the cyclic garbage
+        # collector is paused: its passes over the growing heap would
+        # otherwise take most of the parsing time on large files
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if symbols is None:
+                symbols = SymbolTable()
+            grouped_rows = {}
+            for extent, intent, modus in rows:
+                group = grouped_rows.get(extent)
+                if group is None:
+                    group = grouped_rows[extent] = ([], [], [], [])
+                group[0].append(intent)
+                group[1].append(modus)
+                # Sets are interned in sorted order, so the IDs (and the
+                # order of everything sorted by them) do not depend on the
+                # hash seed of the run
+                group[2].append(symbols.attributes.intern_all(sorted(intent)))
+                group[3].append(symbols.conditions.intern_all(sorted(modus)))
+
+            unique_triadic_concepts = []
+            for extent, group in grouped_rows.items():
+                list_intent, list_modus, intent_bits, modus_bits = group
+                unique_triadic_concepts.append(
+                    TriadicConcept(
+                        set(extent) if extent else extent,
+                        list_intent,
+                        list_modus,
+                        len(extent),
+                        extent_bits=symbols.objects.intern_all(sorted(extent)),
+                        intent_bits=intent_bits,
+                        modus_bits=modus_bits,
+                    )
                 )
+            return ConceptStore(
+                sorted(
+                    unique_triadic_concepts, key=lambda x: x.extent_size, reverse=False
+                ),
+                symbols,
             )
-        return sorted(
-            unique_triadic_concepts, key=lambda x: x.extent_size, reverse=False
-        )
+        finally:
+            if gc_enabled:
+                gc.enable()
 
     def create_triadic_concepts_faces(triadic_concepts):
         """Takes the list of TriadicConcepts and returns the initialized Faces
@@ -128,22 +185,30 @@ class TriadicConcept:
 
         Returns:
             faces (dict): is a dictionary with the initial faces of each
-            unique extents
-            all_extents (set): is a set with all the unique extents
+            unique extents (bitmasks)
+            all_extents (set): is a set with all the unique extents (bitmasks)
         """
 
         faces = {}
-        all_extents = set()
         for concept in triadic_concepts:
-            faces.update({frozenset(concept.extent): set({})})
-            all_extents = all_extents | set({frozenset(concept.extent)})
+            faces.update({concept.extent_bits: 0})
+        all_extents = set(faces)
 
         return faces, all_extents
 
     def T_iPred(triadic_concepts, faces, all_extents):
         """Takes the list of triadic concepts, the initial Faces and the
         unique extents of triadic concepts and calculates the links between
-        triadic concepts.
+        triadic concepts. The intersections between extents are computed
+        on their bitmasks, and the links are recorded as pairs of concept
+        IDs.
+
+        The border is indexed by object (object ID -> border extents that
+        have it), so each concept is only intersected with the border
+        extents that share an object with it, and the intersections that
+        are not extents are kept in a set to be looked up by hash. The size
+        of the border and the amount of candidates are kept in the
+        statistics of the links.
 
         Args:
                 triadic_concepts (list): list of TriadicConcept objects
@@ -152,69 +217,83 @@ class TriadicConcept:
                 triadic_concepts
 
         Returns:
-                links (list): returns a list with the links between
-                Triadic Concepts
+                links (Links): returns the links between Triadic Concepts
         """
 
-        links = []
+        iter_bits = SymbolTable.iter_bits
+        targets = []
+        sources = []
+        extent_bits_index = triadic_concepts.extent_bits_index
         border_max = 0
+        border_total = 0
+        intersected_total = 0
+        candidates_total = 0
+        discarded_total = 0
         # border <- the very first element with the smallest EXTENT cardinality
-        border = triadic_concepts[0].extent
+        border = set()
+        border_index = {}
+
+        def add_to_border(extent_bits):
+            border.add(extent_bits)
+            for x in iter_bits(extent_bits):
+                border_index.setdefault(x, set()).add(extent_bits)
+
+        def discard_from_border(extent_bits):
+            if extent_bits in border:
+                border.remove(extent_bits)
+                for x in iter_bits(extent_bits):
+                    border_index[x].discard(extent_bits)
+
+        add_to_border(triadic_concepts[0].extent_bits)
 
         for concept in tqdm(triadic_concepts[1:]):
-            Ci = set(concept.extent)
-            if len(Ci) > 1:
-                flag = True
-            list_candidate = []
+            Ci = concept.extent_bits
+            # Only the border extents that share an object with Ci have a
+            # non-empty intersection with it
+            neighbours = set()
+            for x in iter_bits(Ci):
+                neighbours.update(border_index.get(x, ()))
             candidate_set = set({})
-            for element in border:
-                aux = frozenset(Ci) & set(element)
-                if aux != EMPTY_SET:
-                    candidate_set = candidate_set | set(frozenset({aux}))
-                else:
-                    candidate_set = candidate_set | set(aux)
+            for element in neighbours:
+                candidate_set.add(Ci & element)
             discarded = candidate_set - all_extents
             candidate_set = candidate_set - discarded
+            border_total += len(border)
+            intersected_total += len(neighbours)
+            candidates_total += len(candidate_set)
+            discarded_total += len(discarded)
             if candidate_set != EMPTY_SET:
-                for element in candidate_set:
-                    if element not in list_candidate:
-                        list_candidate.append(element)
+                list_candidate = list(candidate_set)
             else:
-                list_candidate.append(frozenset(EMPTY_SET))
+                list_candidate = [0]
             for element in list_candidate:
-                try:
-                    c = faces[frozenset(element)] & Ci
-                    c_belongs_discarded = False
-                    for c_elem in discarded:
-                        if c | element == c_elem:
-                            c_belongs_discarded = True
-
-                    if c == EMPTY_SET or c_belongs_discarded:
-                        new_link = Ci, element
-                        links.append(new_link)
-                        faces[frozenset(element)] = faces[frozenset(element)] | (
-                            Ci - frozenset(element)
-                        )
-                        border = border - frozenset({element})
-                        flag = True
-                except:
-                    raise
-            if flag:
-                border = border | (frozenset({frozenset(Ci)}))
-            else:
-                border = frozenset({frozenset(Ci)}) | set(border)
-            flag = False
+                c = faces[element] & Ci
+                c_belongs_discarded = (c | element) in discarded
+
+                if c == 0 or c_belongs_discarded:
+                    targets.append(concept.concept_id)
+                    sources.append(extent_bits_index[element])
+                    faces[element] = faces[element] | (Ci & ~element)
+                    discard_from_border(element)
+            add_to_border(Ci)
             if len(border) > border_max:
                 border_max = len(border)
 
-        return links
+        statistics = {
+            "border_max": border_max,
+            "border_total": border_total,
+            "intersected": intersected_total,
+            "candidates": candidates_total,
+            "discarded": discarded_total,
+        }
+        return Links.create(triadic_concepts, targets, sources, statistics)
 
     def list_of_links_to_dict(links):
         """Takes the links between all the concepts and returns a dict with
         all the successors associated with each Triadic Concept extent.
 
         Args:
-            links (list): list with the links between Triadic Concepts
+            links (Links): the links between Triadic Concepts
 
         Returns:
             links_dic (dict): returns a dict where an extent is the key,
@@ -222,127 +301,50 @@ class TriadicConcept:
         """
 
         links_dic = {}
-        for item in links:
-            aux = []
-            target, source = item
-            if source not in links_dic:
-                aux.append(target)
-                links_dic.update({source: aux})
-            else:
-                aux = list(links_dic[source])
-                aux.append(target)
-                links_dic.update({source: aux})
+        for target, source in links:
+            links_dic.setdefault(source, []).append(target)
 
         return links_dic
 
-    def getContext_K1K2(intent, modus):
-        """Takes the intent and the modus associated with a Triadic Concept
-        and creates a formal context using a pandas Dataframe to represent it.
-
-        Args:
-            intent (list): list of intents associated with a Triadic Concept
-            modus (list): list of modus associated with a Triadic Concept
-
-        Returns:
-            context (pandas Dataframe): returns a Dataframe annotated
-            with the incidences (boolean)
-        """
-
-        intent = [list(x) for x in intent]
-        modus = [list(x) for x in modus]
-
-        if len(intent) < 2:
-            context = pd.DataFrame(index=intent, columns=modus)
-            context = context.fillna(True)
-        else:
-            intent_aux = [y for x in intent for y in x]
-            intent_aux = list(set(intent_aux))
-            modus_aux = [y for x in modus for y in x]
-            modus_aux = list(set(modus_aux))
-            context = pd.DataFrame(index=list(intent_aux), columns=list(modus_aux))
-            context = context.fillna(False)
-            for intent_item, modus_item in zip(intent, modus):
-                context.loc[intent_item, modus_item] = True
-        return context
-
-    def f_generator(concept, links_dict, triadic_concepts):
-        """Takes the concept, links_dict and triadic_concepts to compute the
+    def f_generator(concept_id, links, triadic_concepts):
+        """Takes the concept_id, links and triadic_concepts to compute the
         Feature Generators Candidates for all Triadic Concepts extent in the
         list triadic_concepts.
-        This function is executed using a MapReduce approach
-        based on multithreading.
+        This function is executed in parallel by an Executor, one task per
+        Triadic Concept.
 
         Args:
-            concept (TriadicConcept): an object of the class TriadicConcept
-            links_dict (dict): a dict where an extent is the key, and the
-            values are the successors' extent
+            concept_id (int): the ID of a TriadicConcept
+            links (Links): the links between Triadic Concepts, which give
+            the IDs of the successors of the concept
             triadic_concepts (list): list of all Triadic Concepts
         """
 
-        def compute_face_kth_successor(target_intent, target_modus):
-            """Takes the intent and modus part of a Triadic Concept that is a
-            successor, and removes the shared features (by removing incidences
-            from the context) from the current concept.
-
-            Args:
-                target_intent (list): list of intents associated with a
-                Triadic Concept
-                target_modus (list): list of modus associated with a
-                Triadic Concept
-
-            Returns:
-                context (pandas Dataframe): returns the context after removing
-                the features from its successor
-            """
-
-            for intent_item, modus_item in zip(target_intent, target_modus):
-                for x in intent_item:
-                    for y in modus_item:
-                        try:
-                            if str(y) in context.columns and str(x) in context.index:
-                                context.loc[x, y] = False
-                        except:
-                            raise
-            return context
-
         G = []
         G1 = []
-        U3 = []
         F = []
         feature_generator = {}
         t_generator = {}
         dic_G = {}
 
-        successors_concepts = links_dict[concept]
+        current_concept = triadic_concepts.get_by_id(concept_id)
+        source = frozenset(current_concept.extent)
 
-        for successor in successors_concepts:
-            target = frozenset(successor)
-            source = frozenset(concept)
-            current_concept = triadic_concepts[triadic_concepts.index(set(source))]
-            successor_concept = triadic_concepts[triadic_concepts.index(set(target))]
-            current_concept_extent = triadic_concepts[
-                triadic_concepts.index(set(source))
-            ].extent
+        for successor_id in links.get_successors(concept_id).tolist():
+            successor_concept = triadic_concepts.get_by_id(successor_id)
+            current_concept_extent = current_concept.extent
 
             if source not in feature_generator:
                 source_intent = current_concept.intent
                 source_modus = current_concept.modus
                 target_intent = successor_concept.intent
                 target_modus = successor_concept.modus
-                context = TriadicConcept.getContext_K1K2(source_intent, source_modus)
-
-                context = compute_face_kth_successor(target_intent, target_modus)
+                context = DyadicContext(source_intent, source_modus)
+                context.remove_face(target_intent, target_modus)
 
-                for i, row in context.iterrows():
-                    for j, column in row.items():
-                        _intent = "".join([i for i in i])
-                        _modus = "".join([j for j in j])
-                        try:
-                            if column:
-                                if [_intent, _modus] not in G:
-                                    G.append([_intent, _modus])
-                        except:
-                            raise
+                for incidence in context.get_incidences():
+                    if incidence not in G:
+                        G.append(incidence)
 
                 dic_G.update({source: G})
                 t_generator.update({source: G})
@@ -350,27 +352,16 @@ class TriadicConcept:
             else:
                 source_intent = current_concept.intent
                 source_modus = current_concept.modus
-                context = TriadicConcept.getContext_K1K2(source_intent, source_modus)
+                context = DyadicContext(source_intent, source_modus)
                 target_intent = successor_concept.intent
                 target_modus = successor_concept.modus
                 G = t_generator[source]
 
-                context = compute_face_kth_successor(target_intent, target_modus)
-
-                for i, row in context.iterrows():
-                    for j, column in row.items():
-                        _intent = "".join([i for i in i])
-                        _modus = "".join([j for j in j])
-                        try:
-                            if column:
-                                if _modus not in U3:
-                                    U3.append(_modus)
-                        except:
-                            raise
+                context.remove_face(target_intent, target_modus)
+
+                for _intent, U3 in context.get_row_incidences():
                     if [_intent, U3] not in F and U3 != []:
-                        if [_intent, U3] not in F:
-                            F.append([_intent, U3])
-                    U3 = []
+                        F.append([_intent, U3])
 
                 G1 = list(G)
                 p = len(F)
@@ -425,20 +416,18 @@ class TriadicConcept:
                             G1.remove(g)
                 t_generator.update({source: G1})
             feature_generator.update({source: context})
-            context = pd.DataFrame()
             G = []
             G1 = []
             F = []
-            U3 = []
 
-        updated_triadic_concept = triadic_concepts[
-            triadic_concepts.index(current_concept_extent)
-        ].feature_generator_candidates = t_generator
+        updated_triadic_concept = triadic_concepts.get(
+            current_concept_extent
+        ).feature_generator_candidates = t_generator
 
         return updated_triadic_concept
 
     def compute_f_generators_candidates(
-        triadic_concepts, links, compute_feature_generators_for_infimum
+        triadic_concepts, links, compute_feature_generators_for_infimum, executor=None
     ):
         """Takes triadic_concepts, links and the parameter from the user
         compute_feature_generators_for_infimum to call the function
@@ -450,9 +439,11 @@ class TriadicConcept:
 
         Args:
             triadic_concepts (list): list of TriadicConcept objects
-            links (list): list with the links between Triadic Concepts
+            links (Links): the links between Triadic Concepts
             compute_feature_generators_for_infimum (boolean): parameter that
             the user can set in the input file (configs.json)
+            executor (Executor): backend that runs the tasks, a ThreadPool
+            based one is used when it is not given
 
         Returns:
             triadic_concepts (list): updated list of TriadicConcept objects
@@ -475,50 +466,37 @@ class TriadicConcept:
                 objects annotated with the Feature Generator Candidates
             """
 
-            triadic_concepts = sorted(
-                triadic_concepts, key=lambda x: x.extent_size, reverse=False
-            )
             G = []
-            supremum = triadic_concepts[-1].extent
-            current_concept = triadic_concepts[triadic_concepts.index(set(supremum))]
+            current_concept = triadic_concepts[-1]
             target_intent = current_concept.intent
             target_modus = current_concept.modus
-            context = TriadicConcept.getContext_K1K2(target_intent, target_modus)
-            for i, row in context.iterrows():
-                for j, column in row.items():
-                    if i != "ø" and j != "ø":
-                        _intent = "".join([i for i in i])
-                        _modus = "".join([j for j in j])
-                        try:
-                            if column:
-                                if [_intent, _modus] not in G:
-                                    G.append([_intent, _modus])
-                        except:
-                            raise
-            updated_triadic_concept = triadic_concepts[
-                triadic_concepts.index(supremum)
-            ].feature_generator_candidates = G
+            context = DyadicContext(target_intent, target_modus)
+            for incidence in context.get_incidences():
+                if "ø" not in incidence and incidence not in G:
+                    G.append(incidence)
+            updated_triadic_concept = current_concept.feature_generator_candidates = G
             return updated_triadic_concept
 
-        updated_triadic_concepts = []
-        links_dict = TriadicConcept.list_of_links_to_dict(links)
-        ext_uniques = list(links_dict.keys())
+        concept_ids = links.get_sources()
         if not compute_feature_generators_for_infimum:
-            ext_uniques = list(links_dict.keys())
-            if EMPTY_SET in ext_uniques:
-                ext_uniques.remove(EMPTY_SET)
-
-        pool = ThreadPool(PROCESSES)
-        for result in pool.starmap(
+            concept_ids = [
+                concept_id
+                for concept_id in concept_ids
+                if triadic_concepts[concept_id].extent != EMPTY_SET
+            ]
+
+        if executor is None:
+            executor = Executor()
+        updated_triadic_concepts = executor.map(
             TriadicConcept.f_generator,
-            zip(ext_uniques, repeat(links_dict), repeat(triadic_concepts)),
-        ):
-            updated_triadic_concepts.append(result)
-        pool.close()
+            concept_ids,
+            links,
+            executor.share_concepts(triadic_concepts),
+        )
         for concept in updated_triadic_concepts:
-            triadic_concepts[
-                triadic_concepts.index(set([x for x in concept.keys()][0]))
-            ].feature_generator_candidates = [*concept.values()][0]
+            triadic_concepts.get(
+                [x for x in concept.keys()][0]
+            ).feature_generator_candidates = [*concept.values()][0]
 
         compute_f_generators_supremum(triadic_concepts)
 
@@ -532,32 +510,50 @@ class TriadicConcept:
             triadic_concepts (list): list of TriadicConcept objects
 
         Returns:
-            formal_context (concepts Context): returns the Formal Context
+            formal_context (FormalContext): returns the Formal Context
             representing all the Triadic Concepts
         """
 
-        formal_context = Definition()
+        symbols = triadic_concepts.symbols
+        empty_attribute = symbols.attributes.ids.get("ø")
+        empty_condition = symbols.conditions.ids.get("ø")
+
+        # Each (attribute, condition) pair is encoded as a single integer,
+        # then as a dense property ID, and each object keeps the bitmask of
+        # the properties it is incident with
+        number_conditions = len(symbols.conditions)
+        property_ids = {}
+        rows = {}
         for concept in tqdm(triadic_concepts):
-            extent = [x for x in concept.extent]
-            intent = [x for x in concept.intent]
-            modus = [x for x in concept.modus]
-            permutation = [(x, y) for x, y in zip(intent, modus)]
-            if extent != []:
-                for combination in permutation:
-                    adds = [
-                        (e, i, m)
-                        for e in extent
-                        for i in combination[0]
-                        for m in combination[1]
-                    ]
-                    for to_add in adds:
-                        _extent, _intent, _modus = to_add
-                        if _intent != "ø" and _modus != "ø":
-                            formal_context.add_object(
-                                str(_extent), [str(_intent) + " " + str(_modus)]
+            if concept.extent_bits == 0:
+                continue
+            properties_bits = 0
+            for intent_bits, modus_bits in zip(concept.intent_bits, concept.modus_bits):
+                for _intent in SymbolTable.iter_bits(intent_bits):
+                    if _intent == empty_attribute:
+                        continue
+                    for _modus in SymbolTable.iter_bits(modus_bits):
+                        if _modus != empty_condition:
+                            feature = _intent * number_conditions + _modus
+                            property_id = property_ids.setdefault(
+                                feature, len(property_ids)
                             )
+                            properties_bits |= 1 << property_id
+            if properties_bits:
+                for _extent in SymbolTable.iter_bits(concept.extent_bits):
+                    rows[_extent] = rows.get(_extent, 0) | properties_bits
+
+        properties = []
+        for feature in property_ids:
+            _intent, _modus = divmod(feature, number_conditions)
+            properties.append(
+                symbols.attributes.names[_intent]
+                + " "
+                + symbols.conditions.names[_modus]
+            )
+        objects = [symbols.objects.names[_extent] for _extent in rows]
 
-        return Context(*formal_context)
+        return FormalContext(objects, properties, rows.values())
 
     def validate_feature_generator_candidates(
         concept_extent, triadic_concepts, formal_context
@@ -567,12 +563,12 @@ class TriadicConcept:
         associated with an extent. This is done by derivating a
         Feature Generator and checking if the result is the same as
         the extent in 'concept_extent'.
-        This function is executed in parallel using a multithreading approach.
+        This function is executed in parallel by an Executor.
 
         Args:
             concept_extent (set): extent of a TriadicConcept object
             triadic_concepts (list): list of TriadicConcept objects
-            formal_context (concepts Context): the Formal Context representing
+            formal_context (FormalContext): the Formal Context representing
             all the Triadic Concepts
 
         Returns:
@@ -581,9 +577,7 @@ class TriadicConcept:
         """
 
         final_t_generator = []
-        f_gens = triadic_concepts[
-            triadic_concepts.index(set(concept_extent))
-        ].feature_generator_candidates
+        f_gens = triadic_concepts.get(concept_extent).feature_generator_candidates
 
         def attributes_in_properties(attributes, formal_context):
             """Takes the attributes (intent x modus) and the formal_context
@@ -593,7 +587,7 @@ class TriadicConcept:
             Args:
                 attributes (str): string representing the
                 attribute (intent x modus)
-                formal_context (concepts Context): the Formal Context
+                formal_context (FormalContext): the Formal Context
                 representing all the Triadic Concepts
 
             Returns:
@@ -602,7 +596,7 @@ class TriadicConcept:
             """
 
             for attribute in attributes:
-                if attribute not in formal_context.properties:
+                if attribute not in formal_context.property_index:
                     return False
             return True
 
@@ -613,7 +607,7 @@ class TriadicConcept:
                 extent (set): the extent of a TriadicConcept
                 generator (list): the pair of intent and modus of a
                 Feature Generator
-                formal_context (concepts Context): the Formal Context
+                formal_context (FormalContext): the Formal Context
                 representing all the Triadic Concepts
 
             Returns:
@@ -654,12 +648,29 @@ class TriadicConcept:
                 ):
                     final_t_generator.extend([generator])
 
-        updated_triadic_concept = triadic_concepts[
-            triadic_concepts.index(concept_extent)
-        ].feature_generator = final_t_generator
+        updated_triadic_concept = triadic_concepts.get(
+            concept_extent
+        ).feature_generator = final_t_generator
 
         return concept_extent, updated_triadic_concept
 
+    def get_generator_key(generator):
+        """Takes a Feature Generator (intent, modus), whose parts are names or
+        lists of names, and returns the sorted names of its parts, used to
+        sort the generators in an order that does not depend on the hash
+        seed of the run.
+
+        Args:
+            generator (list): the intent and the modus of the generator
+
+        Returns:
+            tuple: the sorted names of the intent and of the modus
+        """
+
+        return tuple(
+            [part] if isinstance(part, str) else sorted(part) for part in generator
+        )
+
     def compute_minimality_feature_generators(concept_extent, triadic_concepts):
         """Takes the concept_extent and triadic_concepts to compute
         the minimality test on Feature Generators.
@@ -674,13 +685,11 @@ class TriadicConcept:
 
         Returns:
             concept_extent (set): the extent of a TriadicConcept object
-            updated_triadic_concept (list): updated list of
-            TriadicConcept objects
+            updated_triadic_concept (list): the Minimal Feature Generators,
+            sorted by the names of their intent and modus
         """
 
-        f_gens = triadic_concepts[
-            triadic_concepts.index(set(concept_extent))
-        ].feature_generator
+        f_gens = triadic_concepts.get(concept_extent).feature_generator
         f_gens_to_check = f_gens[::-1].copy()
         f_gens_final = f_gens.copy()
 
@@ -710,22 +719,27 @@ class TriadicConcept:
                     ).issubset(set(modus_gen)):
                         if generator in f_gens_final:
                             f_gens_final.remove(generator)
+        f_gens_final.sort(key=TriadicConcept.get_generator_key)
 
-        updated_triadic_concept = triadic_concepts[
-            triadic_concepts.index(concept_extent)
-        ].feature_generator_minimal = f_gens_final
+        updated_triadic_concept = triadic_concepts.get(
+            concept_extent
+        ).feature_generator_minimal = f_gens_final
 
         return concept_extent, updated_triadic_concept
 
-    def compute_feature_generator_validation(triadic_concepts, formal_context):
+    def compute_feature_generator_validation(
+        triadic_concepts, formal_context, executor=None
+    ):
         """Takes the triadic_concepts and formal_context to call the function
-        the will validate the Feature Generator Candidates using a
-        multithreading approach.
+        the will validate the Feature Generator Candidates in parallel, using
+        an Executor.
 
         Args:
             triadic_concepts (list): list of TriadicConcept objects
-            formal_context (concepts Context): the Formal Context representing
+            formal_context (FormalContext): the Formal Context representing
             all the Triadic Concepts
+            executor (Executor): backend that runs the tasks, a ThreadPool
+            based one is used when it is not given
 
         Returns:
             triadic_concepts (list): updated list of TriadicConcept objects
@@ -734,147 +748,384 @@ class TriadicConcept:
 
         ext_uniques = [concept.extent for concept in triadic_concepts]
 
-        pool = ThreadPool(PROCESSES)
-        for result in pool.starmap(
+        if executor is None:
+            executor = Executor()
+        for result in executor.map(
             TriadicConcept.validate_feature_generator_candidates,
-            zip(ext_uniques, repeat(triadic_concepts), repeat(formal_context)),
+            ext_uniques,
+            executor.share_concepts(triadic_concepts, ["feature_generator_candidates"]),
+            formal_context,
         ):
-            triadic_concepts[
-                triadic_concepts.index(set(result[0]))
-            ].feature_generator = result[1]
-        pool.close()
+            triadic_concepts.get(result[0]).feature_generator = result[1]
 
-        pool = ThreadPool(PROCESSES)
-        for result in pool.starmap(
+        for result in executor.map(
             TriadicConcept.compute_minimality_feature_generators,
-            zip(ext_uniques, repeat(triadic_concepts)),
+            ext_uniques,
+            executor.share_concepts(triadic_concepts, ["feature_generator"]),
         ):
-            triadic_concepts[
-                triadic_concepts.index(set(result[0]))
-            ].feature_generator_minimal = result[1]
-        pool.close()
+            triadic_concepts.get(result[0]).feature_generator_minimal = result[1]
 
         return triadic_concepts
 
-    def concept_stability_calculation(concept, triadic_concepts, formal_context):
-        """Takes the concept, triadic_concepts and formal_context and computes
-        the Concept Stability for each Triadic Concept. This is done by
-        computing the powerset(extent). This function is executed in parallel
-        using a multithreading approach.
+    def index_formal_context_features(formal_context):
+        """Takes the formal_context and indexes its properties ('attribute
+        condition') by attribute and by condition.
 
-        NOTE: since the powerset of the elements in the extent of all Triadic
-        Concepts is computed, it has a great impact on the execution time when
-        the input file gets bigger (large number of Triadic Concepts).
+        Args:
+            formal_context (FormalContext): the Formal Context representing
+            all the Triadic Concepts
+
+        Returns:
+            features (tuple): two dicts, attribute -> {condition: property ID}
+            and condition -> {attribute: property ID}
+        """
+
+        attributes = {}
+        conditions = {}
+        for property_id, _property in enumerate(formal_context.properties):
+            _intent, _modus = _property.split()
+            attributes.setdefault(_intent, {})[_modus] = property_id
+            conditions.setdefault(_modus, {})[_intent] = property_id
+        return attributes, conditions
+
+    def concept_stability_calculation(
+        concept,
+        triadic_concepts,
+        formal_context,
+        features=None,
+        sampling=None,
+        fallback=(STABILITY_SAMPLES, 0),
+        max_family=STABILITY_MAX_FAMILY,
+    ):
+        """Takes the concept, triadic_concepts and formal_context and computes
+        the Concept Stability for each Triadic Concept. This function is
+        executed in parallel by an Executor.
+
+        The stability of a pair (intent, modus) of a concept with extent E is
+        the fraction of the subsets S of E for which (intent, modus) is still
+        a concept of the dyadic context (attributes x conditions) shared by
+        all the objects in S. Instead of building this context for each
+        subset of the powerset(E), the subsets where the pair is not a
+        concept are counted exactly: the pair stops being a concept when S
+        is contained in the set O_x of objects that also have an extra
+        attribute (or condition) x, so the subsets covered by the union of
+        the powersets of the O_x are counted over the family of their
+        intersections, from the smallest to the largest.
+
+        This count is not polynomial: the family closed by intersection can
+        have up to 2^k sets for k sets O_x (and k grows with the number of
+        attributes and conditions), and each set is compared with all the
+        smaller ones, so the cost is O(|family|^2) per pair. When the family
+        grows past max_family sets, the pair is estimated as with
+        'sampling' below (with the samples and seed of 'fallback'), and its
+        score gets the bounds of the confidence interval.
+
+        When 'sampling' is given, the stability is estimated instead on
+        random subsets S of E (with the same check as above), and each pair
+        also gets the bounds of the Hoeffding confidence interval of the
+        estimate. The subsets are sampled as bitsets packed in 64-bit words,
+        so the check runs over all the samples at once.
 
         Args:
             concept (TriadicConcept): an object of the class TriadicConcept
             triadic_concepts (list): list of TriadicConcept objects
-            formal_context (concepts Context): the Formal Context representing
+            formal_context (FormalContext): the Formal Context representing
             all the Triadic Concepts
+            features (tuple): the properties of the formal_context indexed by
+            'index_formal_context_features', computed when not given
+            sampling (tuple): number of samples and seed used to estimate
+            the stability, it is computed exactly when not given
+            fallback (tuple): number of samples and seed used to estimate
+            the pairs whose family of covers is too large to be counted
+            max_family (int): largest family of covers counted exactly
 
         Returns:
             list_concept_stability (list): returns the Concept Stability for
             each Triadic Concept object
         """
 
-        def powerset(iterable):
-            "list(powerset([1,2,3])) --> [(), (1,), (2,), (3,), (1,2), (1,3), (2,3), (1,2,3)]"
-            s = list(iterable)
-            return chain.from_iterable(combinations(s, r) for r in range(len(s) + 1))
+        def count_covered_subsets(covers):
+            """Takes bitmasks O_x and returns the number of non empty sets S
+            such that S is a subset of at least one of them, or None when
+            their family closed by intersection has more than max_family
+            sets.
+
+            Args:
+                covers (set): bitmasks of the sets O_x
+
+            Returns:
+                int: number of non empty sets covered
+            """
+
+            # Every covered S has a smallest set containing it in the
+            # family closed by intersection, so the subsets of each set of
+            # the family are counted once, discounting the ones already
+            # counted for the smaller sets inside it
+            family = set(covers)
+            frontier = list(family)
+            while frontier:
+                new_sets = []
+                for x in frontier:
+                    for y in covers:
+                        z = x & y
+                        if z and z not in family:
+                            family.add(z)
+                            new_sets.append(z)
+                if len(family) > max_family:
+                    return None
+                frontier = new_sets
+
+            family = sorted(family, key=lambda x: x.bit_count())
+            counts = []
+            total = 0
+            for i, x in enumerate(family):
+                count = (1 << x.bit_count()) - 1
+                for j in range(i):
+                    y = family[j]
+                    if y != x and y & ~x == 0:
+                        count -= counts[j]
+                counts.append(count)
+                total += count
+            return total
+
+        def estimate_stability(objects, covers, number_objects, rng, samples):
+            """Takes the bitmasks 'objects' and O_x (covers) and estimates
+            the fraction of the subsets S of the extent such that S is a
+            subset of 'objects' and of none of the O_x.
+
+            Args:
+                objects (int): bitmask of the objects that have the pair
+                covers (set): bitmasks of the sets O_x
+                number_objects (int): size of the extent
+                rng (numpy Generator): random number generator
+                samples (int): number of subsets sampled
+
+            Returns:
+                float: the fraction of the samples where the pair is a concept
+            """
+
+            words = (number_objects + 63) // 64
+
+            def to_words(bits):
+                return np.frombuffer(bits.to_bytes(words * 8, "little"), dtype="<u8")
+
+            subsets = rng.integers(
+                0, np.iinfo(np.uint64).max, (samples, words), np.uint64, True
+            )
+            subsets &= to_words((1 << number_objects) - 1)
+
+            full = (1 << number_objects) - 1
+            stable = subsets.any(axis=1)
+            stable &= ~(subsets & to_words(full & ~objects)).any(axis=1)
+            for cover in covers:
+                stable &= (subsets & to_words(full & ~cover)).any(axis=1)
+            return float(stable.mean())
+
+        if features is None:
+            features = TriadicConcept.index_formal_context_features(formal_context)
+        attributes, conditions = features
 
-        context = Definition()
         list_concept_stability = []
-        count_concept_stability = 0
-        extent = triadic_concepts[triadic_concepts.index(concept)].extent
-        intent = triadic_concepts[triadic_concepts.index(concept)].intent
-        modus = triadic_concepts[triadic_concepts.index(concept)].modus
-        extent = [x for x in extent]
-
-        if extent != []:
-            for item in zip(intent, modus):
-                intent_item, modus_item = item
-                if len(extent) == 1:
+        current_concept = triadic_concepts.get(concept)
+        extent = [x for x in current_concept.extent]
+        if extent == []:
+            return list_concept_stability
+
+        # The exact count falls back to the estimate for the pairs whose
+        # family of covers is too large
+        samples, seed = fallback if sampling is None else sampling
+        rng = np.random.default_rng([seed, current_concept.concept_id])
+        error = TriadicConcept.get_stability_error(samples)
+
+        # The objects are derived by the formal_context (a DerivationCache in
+        # the pipeline), so the sets of properties shared by several pairs
+        # are derived once, and the result is restricted to the extent
+        def objects_with(properties):
+            return formal_context.extension_bits(properties) & extent_bits
+
+        def properties_of(pairs):
+            properties = []
+            for _intent, _modus in pairs:
+                property_id = attributes.get(_intent, {}).get(_modus)
+                if property_id is None:
+                    return None
+                properties.append(formal_context.properties[property_id])
+            return properties
+
+        def to_extent_bits(objects_bits):
+            # The estimate samples the subsets of the extent, where the bit i
+            # is the i-th object of the extent
+            bits = 0
+            for i, object_id in enumerate(object_ids):
+                if objects_bits >> object_id & 1:
+                    bits |= 1 << i
+            return bits
+
+        object_ids = []
+        extent_bits = 0
+        if len(extent) > 1:
+            object_ids = [formal_context.object_index[x] for x in extent]
+            for object_id in object_ids:
+                extent_bits |= 1 << object_id
+
+        for intent_item, modus_item in zip(
+            current_concept.intent, current_concept.modus
+        ):
+            if len(extent) == 1:
+                if sampling is None:
                     list_concept_stability.append(
                         [list(extent), intent_item, modus_item, 0.5]
                     )
                 else:
-                    powerset_ext = powerset(extent)
-                    for ext in powerset_ext:
-                        if list(ext) != []:
-                            if len(ext) == 1:
-                                intention = formal_context.intension(ext)
-                                for element in list(intention):
-                                    intent_part, modus_part = element.split()
-                                    context.add_object(
-                                        str(intent_part),
-                                        [
-                                            str(modus_part),
-                                        ],
-                                    )
-                            else:
-                                intention = formal_context.intension(
-                                    ext,
-                                )
-
-                                # When the powerset of some EXTENT is computed,
-                                # is it possible to create some combination of
-                                # extents that does not have any shared
-                                # feature.
-                                # In this sense, this IF test will just skip
-                                # these extents that doesn't share any feature.
-                                if list(intention) == []:
-                                    continue
-                                for element in list(intention):
-                                    intent_part, modus_part = element.split()
-                                    context.add_object(
-                                        str(intent_part),
-                                        [
-                                            str(modus_part),
-                                        ],
-                                    )
-                            _context = Context(*context)
-                            lattice = _context.lattice
-                            for intent_subset, modus_subset in lattice:
-                                if set(list(intent_item)) == set(
-                                    list(intent_subset)
-                                ) and set(list(modus_item)) == set(list(modus_subset)):
-                                    count_concept_stability += 1
-                            context = Definition()
-                    if list(ext) != []:
-                        list_concept_stability.append(
-                            [
-                                list(extent),
-                                intent_item,
-                                modus_item,
-                                round(count_concept_stability / 2 ** len(extent), 3),
-                            ]
-                        )
-                    count_concept_stability = 0
+                    list_concept_stability.append(
+                        [list(extent), intent_item, modus_item, 0.5, 0.5, 0.5]
+                    )
+                continue
+
+            # The pair is a concept of the context of S only if every object
+            # of S has intent x modus (S is a subset of 'objects')
+            properties = properties_of((x, y) for x in intent_item for y in modus_item)
+            objects = 0 if properties is None else objects_with(properties)
+
+            covers = set()
+            if objects:
+                for _intent, _conditions in attributes.items():
+                    if _intent not in intent_item:
+                        extra = properties_of((_intent, y) for y in modus_item)
+                        if extra is not None:
+                            covers.add(objects_with(extra) & objects)
+                for _modus, _attributes in conditions.items():
+                    if _modus not in modus_item:
+                        extra = properties_of((x, _modus) for x in intent_item)
+                        if extra is not None:
+                            covers.add(objects_with(extra) & objects)
+                covers.discard(0)
+
+            covered = None if sampling is not None else count_covered_subsets(covers)
+            if covered is None:
+                estimate = estimate_stability(
+                    to_extent_bits(objects),
+                    {to_extent_bits(cover) for cover in covers},
+                    len(extent),
+                    rng,
+                    samples,
+                )
+                list_concept_stability.append(
+                    [
+                        list(extent),
+                        intent_item,
+                        modus_item,
+                        round(estimate, 3),
+                        round(max(0.0, estimate - error), 3),
+                        round(min(1.0, estimate + error), 3),
+                    ]
+                )
+                continue
+
+            count_concept_stability = (1 << objects.bit_count()) - 1
+            count_concept_stability -= covered
+            list_concept_stability.append(
+                [
+                    list(extent),
+                    intent_item,
+                    modus_item,
+                    round(count_concept_stability / 2 ** len(extent), 3),
+                ]
+            )
 
         return list_concept_stability
 
-    def compute_concept_stability(triadic_concepts, formal_context):
+    def get_stability_samples(target_error):
+        """Takes the target error of the Monte Carlo estimate of the Concept
+        Stability and returns the number of samples needed so that, by the
+        Hoeffding inequality, the error is below it with probability
+        STABILITY_CONFIDENCE.
+
+        Args:
+            target_error (float): maximum error of the estimate
+
+        Returns:
+            int: number of samples
+        """
+
+        return math.ceil(
+            math.log(2 / (1 - STABILITY_CONFIDENCE)) / (2 * target_error**2)
+        )
+
+    def get_stability_error(samples):
+        """Takes the number of samples of the Monte Carlo estimate of the
+        Concept Stability and returns the half width of its Hoeffding
+        confidence interval (with probability STABILITY_CONFIDENCE).
+
+        Args:
+            samples (int): number of samples
+
+        Returns:
+            float: the maximum error of the estimate
+        """
+
+        return math.sqrt(math.log(2 / (1 - STABILITY_CONFIDENCE)) / (2 * samples))
+
+    def compute_concept_stability(
+        triadic_concepts,
+        formal_context,
+        executor=None,
+        method="exact",
+        samples=STABILITY_SAMPLES,
+        seed=0,
+        target_error=0,
+        max_family=STABILITY_MAX_FAMILY,
+    ):
         """Takes triadic_concepts and formal_context to call the function
         'concept_stability_calculation' that will be executed in parallel.
 
         Args:
             triadic_concepts (list): list of TriadicConcept objects
-            formal_context (concepts Context): the Formal Context representing
+            formal_context (FormalContext): the Formal Context representing
             all the Triadic Concepts
+            executor (Executor): backend that runs the tasks, a ThreadPool
+            based one is used when it is not given
+            method (str): 'exact' or 'monte_carlo'
+            samples (int): number of subsets sampled per pair (intent, modus)
+            with the 'monte_carlo' method
+            seed (int): seed of the 'monte_carlo' method
+            target_error (float): when greater than zero, the number of
+            samples is chosen so that the error of the 'monte_carlo' method
+            is below it
+            max_family (int): with the 'exact' method, the pairs whose
+            family of covers has more sets are estimated as with the
+            'monte_carlo' method (see concept_stability_calculation)
 
         Returns:
             triadic_concepts (list): list of TriadicConcept objects updated
             with Concept Stability
         """
 
+        if method not in ("exact", "monte_carlo"):
+            raise ValueError(
+                f"Unknown concept stability method '{method}', "
+                "expected 'exact' or 'monte_carlo'"
+            )
+        sampling = None
+        if target_error > 0:
+            samples = TriadicConcept.get_stability_samples(target_error)
+        if method == "monte_carlo":
+            sampling = (samples, seed)
+
         ext_uniques = [concept.extent for concept in triadic_concepts]
 
-        pool = ThreadPool(PROCESSES)
-        list_concept_stability_final = pool.starmap(
+        if executor is None:
+            executor = Executor()
+        list_concept_stability_final = executor.map(
             TriadicConcept.concept_stability_calculation,
-            zip(ext_uniques, repeat(triadic_concepts), repeat(formal_context)),
+            ext_uniques,
+            executor.share_concepts(triadic_concepts),
+            formal_context,
+            TriadicConcept.index_formal_context_features(formal_context),
+            sampling,
+            (samples, seed),
+            max_family,
         )
-        pool.close()
 
         for result in list_concept_stability_final:
             _extent = EMPTY_SET
@@ -885,9 +1136,8 @@ class TriadicConcept:
                     _extent = extent.copy()
                     intent = list(concept[1])
                     modus = list(concept[2])
-                    concept_stability = concept[3]
-                    scores.append([intent, modus, concept_stability])
-            triadic_concepts[triadic_concepts.index(_extent)].concept_stability = scores
+                    scores.append([intent, modus, *concept[3:]])
+            triadic_concepts.get(_extent).concept_stability = scores
 
         return triadic_concepts
 
@@ -895,6 +1145,14 @@ class TriadicConcept:
         """Takes the triadic_concepts and computes the Separation Index for
         all the Triadic Concepts in the list.
 
+        The Separation Index of a pair (intent, modus) of a concept with
+        extent A1 is |A1| * |A2| * |A3| divided by the number of incidences
+        of the Formal Context that touch the objects of A1 or the features
+        A2 x A3 (minus the incidences of the concept itself). The number of
+        incidences of each object and feature is counted once, from the
+        bitsets of the Formal Context, and all the pairs are then scored at
+        once with numpy.
+
         Args:
             triadic_concepts (list): list of TriadicConcept objects
 
@@ -903,151 +1161,63 @@ class TriadicConcept:
             updated with Separation Index
         """
 
-        sum_intent_modus = 0
-        sum_intent_all_modus = 0
-        sum_all_extent = 0
-        size_A1 = 0
-        size_A2 = 0
-        size_A3 = 0
-        list_separation_index = []
-        list_appear_A2_A3 = []
-        dic_count_extent = {}
-        dic_count_intent_modus = {}
-        list_appear_extent_intent_modus = []
-
-        for concept in tqdm(triadic_concepts):
-            extent = [x for x in concept.extent]
-            intent, modus = concept.intent, concept.modus
-            if extent != []:
-                for element_extent in extent:
-                    for item in zip(intent, modus):
-                        intent_item, modus_item = item
-                        for element_intent in intent_item:
-                            for element_modus in modus_item:
-                                if element_intent != "ø" and element_modus != "ø":
-
-                                    if str(element_extent) not in dic_count_extent:
-                                        dic_count_extent.update(
-                                            {str(element_extent): 1}
-                                        )
-
-                                    elif [
-                                        [str(element_extent)],
-                                        [
-                                            str(element_intent)
-                                            + " "
-                                            + str(element_modus)
-                                        ],
-                                    ] not in list_appear_extent_intent_modus:
-                                        count = dic_count_extent[str(element_extent)]
-                                        count += 1
-                                        dic_count_extent.update(
-                                            {str(element_extent): count}
-                                        )
-
-                                    if (
-                                        str(element_intent + " " + element_modus)
-                                        not in dic_count_intent_modus
-                                    ):
-                                        dic_count_intent_modus.update(
-                                            {
-                                                str(
-                                                    element_intent + " " + element_modus
-                                                ): 1
-                                            }
-                                        )
-
-                                    elif [
-                                        [str(element_extent)],
-                                        [
-                                            str(element_intent)
-                                            + " "
-                                            + str(element_modus)
-                                        ],
-                                    ] not in list_appear_extent_intent_modus:
-                                        count = dic_count_intent_modus[
-                                            str(element_intent + " " + element_modus)
-                                        ]
-                                        count += 1
-                                        dic_count_intent_modus.update(
-                                            {
-                                                str(
-                                                    element_intent + " " + element_modus
-                                                ): count
-                                            }
-                                        )
-
-                                    list_appear_extent_intent_modus.append(
-                                        [
-                                            [str(element_extent)],
-                                            [
-                                                str(element_intent)
-                                                + " "
-                                                + str(element_modus)
-                                            ],
-                                        ]
-                                    )
+        formal_context = TriadicConcept.compute_formal_context(triadic_concepts)
+        object_degree = {
+            _object: row.bit_count()
+            for _object, row in zip(formal_context.objects, formal_context.rows)
+        }
+        property_degree = np.array(
+            [column.bit_count() for column in formal_context.columns], dtype=np.int64
+        )
 
+        # Every pair (intent, modus) without 'ø' is scored: its cells are the
+        # property IDs of intent x modus, grouped by the index of the pair
+        pairs = []
+        sizes = []
+        sum_all_extent = []
+        cells_pair = []
+        cells_property = []
         for concept in tqdm(triadic_concepts):
             extent = [x for x in concept.extent]
-            intent, modus = concept.intent, concept.modus
-            if extent != []:
-                for element_extent in extent:
-                    size_A1 += 1
-                    sum_all_extent += dic_count_extent[element_extent]
-                for item in zip(intent, modus):
-                    intent_item, modus_item = item
-
-                    if (
-                        str(extent) + " " + str(intent_item) + " " + str(modus_item)
-                        not in list_appear_A2_A3
-                    ):
-                        size_A2 += len(intent_item)
-                        size_A3 += len(modus_item)
-                        list_appear_A2_A3.append(
-                            str(extent) + " " + str(intent_item) + " " + str(modus_item)
-                        )
-
-                    for element_intent in intent_item:
-                        for element_modus in modus_item:
-                            if element_intent != "ø" and element_modus != "ø":
-
-                                sum_intent_all_modus += dic_count_intent_modus[
-                                    str(element_intent + " " + element_modus)
-                                ]
-
-                        sum_intent_modus += sum_intent_all_modus
-                        sum_intent_all_modus = 0
-
-                    if element_intent != "ø" and element_modus != "ø":
-                        try:
-                            separation_value = (size_A1 * size_A2 * size_A3) / (
-                                (sum_all_extent + sum_intent_modus)
-                                - (size_A1 * size_A2 * size_A3)
-                            )
-                        except ZeroDivisionError:
-                            separation_value = 0
-                        list_separation_index.append(
-                            [(extent), (intent_item), (modus_item), separation_value]
+            if extent == []:
+                continue
+            sum_extent = sum(object_degree.get(x, 0) for x in extent)
+            for intent_item, modus_item in zip(concept.intent, concept.modus):
+                if "ø" in intent_item or "ø" in modus_item:
+                    continue
+                for element_intent in intent_item:
+                    for element_modus in modus_item:
+                        cells_pair.append(len(pairs))
+                        cells_property.append(
+                            formal_context.property_index[
+                                element_intent + " " + element_modus
+                            ]
                         )
-
-                    separation_value = 0
-                    sum_intent_modus = 0
-                    size_A2 = 0
-                    size_A3 = 0
-
-                sum_all_extent = 0
-                size_A1 = 0
-
-        for result in list_separation_index:
-            if result != []:
-                extent = frozenset(result[0])
-                intent = list(result[1])
-                modus = list(result[2])
-                separation_index = result[3]
-                triadic_concepts[
-                    triadic_concepts.index(extent)
-                ].separation_index.append([intent, modus, round(separation_index, 3)])
+                pairs.append((concept, intent_item, modus_item))
+                sizes.append(len(extent) * len(intent_item) * len(modus_item))
+                sum_all_extent.append(sum_extent)
+
+        sum_intent_modus = np.bincount(
+            np.array(cells_pair, dtype=np.int64),
+            weights=property_degree[np.array(cells_property, dtype=np.int64)],
+            minlength=len(pairs),
+        ).astype(np.int64)
+        sizes = np.array(sizes, dtype=np.int64)
+        denominators = np.array(sum_all_extent, dtype=np.int64) + sum_intent_modus
+        denominators -= sizes
+        separation_values = np.zeros(len(pairs))
+        nonzero = denominators != 0
+        separation_values[nonzero] = sizes[nonzero] / denominators[nonzero]
+
+        for (concept, intent_item, modus_item), separation_index, valid in zip(
+            pairs, separation_values.tolist(), nonzero.tolist()
+        ):
+            if not valid:
+                # An empty denominator gives a Separation Index of 0
+                separation_index = 0
+            concept.separation_index.append(
+                [list(intent_item), list(modus_item), round(separation_index, 3)]
+            )
 
         return triadic_concepts
 
@@ -1058,7 +1228,7 @@ class TriadicConcept:
 
         Args:
             triadic_concepts (list): list of TriadicConcept objects
-            links (list): list with the links between Triadic Concepts
+            links (Links): the links between Triadic Concepts
 
         Returns:
             triadic_concepts (list): list of TriadicConcept objects
@@ -1074,74 +1244,57 @@ class TriadicConcept:
                 triadic_concepts (list): list of TriadicConcept objects
             """
 
-            all_extents = [x.extent for x in triadic_concepts]
             to_remove = EMPTY_SET
 
-            for extent in all_extents:
-                triadic_concepts[
-                    triadic_concepts.index(extent)
-                ].extensional_generator_minimal = triadic_concepts[
-                    triadic_concepts.index(extent)
-                ].extensional_generator_candidates
+            for concept in triadic_concepts:
+                concept.extensional_generator_minimal = (
+                    concept.extensional_generator_candidates
+                )
 
             for concept in reversed(triadic_concepts):
-                extensional_generators = triadic_concepts[
-                    triadic_concepts.index(concept.extent)
-                ].extensional_generator_minimal
+                extensional_generators = concept.extensional_generator_minimal
 
                 for element in extensional_generators:
-                    if set(element) in all_extents:
+                    if set(element) in triadic_concepts:
                         if len(element) > 1:
                             to_remove = frozenset({element})
                         else:
                             to_remove = set(element)
                         new_gen = extensional_generators - to_remove
-                        triadic_concepts[
-                            triadic_concepts.index(concept.extent)
-                        ].extensional_generator_minimal = new_gen
+                        concept.extensional_generator_minimal = new_gen
                         to_remove = EMPTY_SET
 
                 for element in extensional_generators:
-                    check = triadic_concepts[
-                        triadic_concepts.index(concept.extent)
-                    ].extensional_generator_minimal
+                    check = concept.extensional_generator_minimal
                     check = check - frozenset({element})
                     for gen in check:
                         if frozenset(element).issubset(frozenset(gen)):
                             to_remove = frozenset({gen})
                             new_gen = extensional_generators - to_remove
-                            triadic_concepts[
-                                triadic_concepts.index(concept.extent)
-                            ].extensional_generator_minimal = new_gen
+                            concept.extensional_generator_minimal = new_gen
                         to_remove = EMPTY_SET
 
             for concept in reversed(triadic_concepts):
                 if concept.extensional_generator_minimal == EMPTY_SET:
-                    triadic_concepts[
-                        triadic_concepts.index(concept.extent)
-                    ].extensional_generator_minimal = concept.extent
+                    concept.extensional_generator_minimal = concept.extent
 
-        for link in reversed(links):
-            current_node = link[0]
-            successor_node = link[1]
-            extensional_generators = triadic_concepts[
-                triadic_concepts.index(current_node)
-            ].extensional_generator_candidates
+        extents = links.extents
+        for current_id, successor_id in zip(
+            links.targets[::-1].tolist(), links.sources[::-1].tolist()
+        ):
+            current_node = extents[current_id]
+            successor_node = extents[successor_id]
+            current_concept = triadic_concepts.get_by_id(current_id)
+            extensional_generators = current_concept.extensional_generator_candidates
 
             if extensional_generators == []:
                 face_current_node = current_node - successor_node
                 E_gen = set(face_current_node)
-                triadic_concepts[
-                    triadic_concepts.index(current_node)
-                ].extensional_generator_candidates = E_gen
+                current_concept.extensional_generator_candidates = E_gen
             else:
                 face_current_node = current_node - successor_node
-                E_gen = triadic_concepts[
-                    triadic_concepts.index(current_node)
-                ].extensional_generator_candidates
-                for generator in triadic_concepts[
-                    triadic_concepts.index(current_node)
-                ].extensional_generator_candidates:
+                E_gen = current_concept.extensional_generator_candidates
+                for generator in current_concept.extensional_generator_candidates:
                     if set(generator) & face_current_node == EMPTY_SET:
 
                         if isinstance(generator, str):
@@ -1162,9 +1315,7 @@ class TriadicConcept:
                             (frozenset(new_E_gen) | frozenset(E_gen))
                             - frozenset({generator})
                         )
-                    triadic_concepts[
-                        triadic_concepts.index(current_node)
-                    ].extensional_generator_candidates = E_gen
+                    current_concept.extensional_generator_candidates = E_gen
 
         find_minimal_extensional_generators(triadic_concepts)
 
@@ -1181,14 +1332,14 @@ class TriadicConcept:
 
         Args:
             triadic_concepts (list): List of TriadicConcept objects.
-            links (list): List of tuple links between Triadic Concepts.
+            links (Links): The links between Triadic Concepts.
             hasse_diagram_file_path (str): Output path for the .graphml file.
             hasse_diagram_html_file_path (str): Output path for the HTML interactive visualization.
         """
 
         # ---------- Part 1: Create GraphML using PyYed ----------
         hasse = pyyed.Graph()
-        nodes = []
+        nodes = set()
 
         def format_generators(generators):
             if not generators:
@@ -1203,12 +1354,12 @@ class TriadicConcept:
                     formatted.append(f"({v[0]} - {v[1]})")
             return "\n".join(formatted)
 
-        def check_concept(concept, concept_original, nodes_list):
+        def check_concept(concept, concept_id, nodes_list):
             if concept not in nodes_list:
-                idx = triadic_concepts.index(concept_original)
-                concept_intent = triadic_concepts[idx].intent
-                concept_modus = triadic_concepts[idx].modus
-                concept_generators = triadic_concepts[idx].feature_generator_minimal
+                current_concept = triadic_concepts.get_by_id(concept_id)
+                concept_intent = current_concept.intent
+                concept_modus = current_concept.modus
+                concept_generators = current_concept.feature_generator_minimal
 
                 # Create main node
                 hasse.add_node(
@@ -1249,19 +1400,21 @@ class TriadicConcept:
                     concept + "gen", concept, line_type="dotted", arrowhead="none"
                 )
 
-                nodes_list.append(concept)
+                nodes_list.add(concept)
 
-        for link in tqdm(links, desc="Building GraphML"):
-            concept, successor = link[0], link[1]
-            concept_original, successor_original = concept.copy(), successor.copy()
+        extents = links.extents
+        for concept_id, successor_id in tqdm(
+            links.iter_edges(), total=len(links), desc="Building GraphML"
+        ):
+            concept, successor = extents[concept_id], extents[successor_id]
 
             concept_str = "ø" if concept == EMPTY_SET else ", ".join(sorted(concept))
             successor_str = (
                 "ø" if successor == EMPTY_SET else ", ".join(sorted(successor))
             )
 
-            check_concept(concept_str, concept_original, nodes)
-            check_concept(successor_str, successor_original, nodes)
+            check_concept(concept_str, concept_id, nodes)
+            check_concept(successor_str, successor_id, nodes)
             hasse.add_edge(concept_str, successor_str, arrowhead="t_shape")
 
         hasse.write_graph(hasse_diagram_file_path, pretty_print=True)
@@ -1270,59 +1423,46 @@ class TriadicConcept:
         G = nx.DiGraph()
         node_labels = {}
 
-        for link in links:
-            concept, successor = link[0], link[1]
+        for concept_id, successor_id in links.iter_edges():
+            concept, successor = extents[concept_id], extents[successor_id]
             concept_str = "ø" if concept == EMPTY_SET else ", ".join(sorted(concept))
             successor_str = (
                 "ø" if successor == EMPTY_SET else ", ".join(sorted(successor))
             )
 
-            for node_str, node_original in [
-                (concept_str, concept),
-                (successor_str, successor),
+            for node_str, node_id in [
+                (concept_str, concept_id),
+                (successor_str, successor_id),
             ]:
                 if node_str not in node_labels:
-                    if node_original != []:
-                        try:
-                            idx = triadic_concepts.index(node_original.copy())
-                            concept_intent = triadic_concepts[idx].intent
-                            concept_modus = triadic_concepts[idx].modus
-                            concept_generators = triadic_concepts[
-                                idx
-                            ].feature_generator_minimal
-
-                            # Build Features part
-                            attributes = []
-                            for attr_int, attr_mod in zip(
-                                concept_intent, concept_modus
-                            ):
-                                _int = ", ".join(sorted(attr_int))
-                                _mod = ", ".join(sorted(attr_mod))
-                                attributes.append(f"({_int} - {_mod})")
-                            features_text = "Features:\n" + "\n".join(attributes)
-
-                            # Build Generators part
-                            if not concept_generators:
-                                generators_text = "Generators:\nø"
-                            else:
-                                generators_list = []
-                                for gen in concept_generators:
-                                    if isinstance(gen[0], list):
-                                        intent = ", ".join(sorted(gen[0]))
-                                        modus = ", ".join(sorted(gen[1]))
-                                        generators_list.append(f"({intent} - {modus})")
-                                    else:
-                                        generators_list.append(f"({gen[0]} - {gen[1]})")
-                                generators_text = "Generators:\n" + "\n".join(
-                                    generators_list
-                                )
-
-                            tooltip = features_text + "\n\n" + generators_text
-
-                        except ValueError:
-                            tooltip = "Concept not found"
+                    current_concept = triadic_concepts.get_by_id(node_id)
+                    concept_intent = current_concept.intent
+                    concept_modus = current_concept.modus
+                    concept_generators = current_concept.feature_generator_minimal
+
+                    # Build Features part
+                    attributes = []
+                    for attr_int, attr_mod in zip(concept_intent, concept_modus):
+                        _int = ", ".join(sorted(attr_int))
+                        _mod = ", ".join(sorted(attr_mod))
+                        attributes.append(f"({_int} - {_mod})")
+                    features_text = "Features:\n" + "\n".join(attributes)
+
+                    # Build Generators part
+                    if not concept_generators:
+                        generators_text = "Generators:\nø"
                     else:
-                        tooltip = "Empty concept"
+                        generators_list = []
+                        for gen in concept_generators:
+                            if isinstance(gen[0], list):
+                                intent = ", ".join(sorted(gen[0]))
+                                modus = ", ".join(sorted(gen[1]))
+                                generators_list.append(f"({intent} - {modus})")
+                            else:
+                                generators_list.append(f"({gen[0]} - {gen[1]})")
+                        generators_text = "Generators:\n" + "\n".join(generators_list)
+
+                    tooltip = features_text + "\n\n" + generators_text
 
                     G.add_node(node_str, label=node_str, title=tooltip)
                     node_labels[node_str] = True